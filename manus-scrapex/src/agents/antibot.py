@@ -3,13 +3,26 @@ Anti-Bot Agent - Detection and evasion of bot protection
 """
 import logging
 import asyncio
-from typing import Optional, Dict
+import time
+from typing import Optional, Dict, List
 import aiohttp
 
 from ..models.scraping import BlockAnalysis, EvasionResult, ScrapingStrategy
-from ..models.base import BlockType
+from ..models.base import BlockType, ScrapingEngine
 from ..services.proxy_service import proxy_pool
 from ..services.llm_service import llm_service, LLMProvider
+from ..services.decision_cache import decision_cache
+from ..services.tactic_bandit import tactic_bandit
+from ..services.domain_backoff import domain_backoff
+from ..utils.request_context import remaining_time, time_budget, DeadlineExceeded
+from ..utils.urls import get_domain
+from ..utils.block_detection import (
+    CLOUDFLARE_INDICATORS,
+    CAPTCHA_INDICATORS,
+    RATE_LIMIT_INDICATORS,
+    detect_block
+)
+from ..prompts.registry import prompt_registry
 from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -24,30 +37,12 @@ class AntiBotAgent:
     - Managing IP rotation
     """
 
-    CLOUDFLARE_INDICATORS = [
-        "Checking your browser",
-        "cf-browser-verification",
-        "cf_clearance",
-        "Just a moment",
-        "ray ID",
-        "cloudflare"
-    ]
-
-    CAPTCHA_INDICATORS = [
-        "recaptcha",
-        "hcaptcha",
-        "funcaptcha",
-        "I'm not a robot",
-        "g-recaptcha",
-        "h-captcha"
-    ]
-
-    RATE_LIMIT_INDICATORS = [
-        "Too many requests",
-        "Rate limit exceeded",
-        "429",
-        "slow down"
-    ]
+    CLOUDFLARE_INDICATORS = CLOUDFLARE_INDICATORS
+    CAPTCHA_INDICATORS = CAPTCHA_INDICATORS
+    RATE_LIMIT_INDICATORS = RATE_LIMIT_INDICATORS
+
+    # Tactics that cost browser time, solver fees or long waits; hedged runs delay them
+    EXPENSIVE_TACTICS = {"stealth_browser", "solve_captcha", "wait"}
 
     def __init__(self):
         pass
@@ -56,7 +51,9 @@ class AntiBotAgent:
         self,
         html: str,
         status_code: int,
-        headers: Dict[str, str]
+        headers: Dict[str, str],
+        url: Optional[str] = None,
+        engine: Optional[ScrapingEngine] = None
     ) -> BlockAnalysis:
         """
         Analyze if response indicates blocking
@@ -65,6 +62,8 @@ class AntiBotAgent:
             html: HTML content
             status_code: HTTP status code
             headers: Response headers
+            url: Page URL, to reuse tactics decided for the same domain
+            engine: Engine that fetched the page
 
         Returns:
             BlockAnalysis: Analysis results
@@ -85,8 +84,17 @@ class AntiBotAgent:
                 suggested_tactics=[]
             )
 
-        # Get suggested tactics
-        tactics = await self._suggest_tactics(block_type, html, headers)
+        # Get suggested tactics, reused across pages of a domain blocked the same way
+        key = self._decision_key(url, block_type, engine)
+        tactics = decision_cache.get(key) if key else None
+        if tactics is None:
+            tactics = await self._suggest_tactics(block_type, html, headers)
+            if key:
+                decision_cache.put(key, {tactic.get("tactic", ""): tactic for tactic in tactics})
+
+        # Order by what has worked on this domain (Thompson sampling)
+        if url and settings.tactic_bandit_enabled:
+            tactics = await tactic_bandit.rank(get_domain(url), tactics, block_type)
 
         return BlockAnalysis(
             is_blocked=True,
@@ -96,6 +104,19 @@ class AntiBotAgent:
             suggested_tactics=tactics
         )
 
+    def _decision_key(
+        self,
+        url: Optional[str],
+        block_type: BlockType,
+        engine: Optional[ScrapingEngine]
+    ) -> Optional[str]:
+        """Decision cache key for a blocked domain"""
+        if not url or not settings.decision_cache_enabled:
+            return None
+        return decision_cache.key(
+            get_domain(url), f"block:{block_type.value}", engine.value if engine else "any"
+        )
+
     async def _detect_block(
         self,
         html: str,
@@ -103,68 +124,7 @@ class AntiBotAgent:
         headers: Dict[str, str]
     ) -> tuple[BlockType, float, list]:
         """Detect type of block"""
-        html_lower = html.lower() if html else ""
-        indicators = []
-
-        # Status code checks
-        if status_code == 403:
-            indicators.append("HTTP 403 Forbidden")
-            return BlockType.IP_BLOCK, 0.9, indicators
-
-        if status_code == 429:
-            indicators.append("HTTP 429 Too Many Requests")
-            return BlockType.RATE_LIMIT, 0.95, indicators
-
-        # Cloudflare detection
-        if any(ind.lower() in html_lower for ind in self.CLOUDFLARE_INDICATORS):
-            indicators.extend([
-                ind for ind in self.CLOUDFLARE_INDICATORS
-                if ind.lower() in html_lower
-            ])
-            return BlockType.CLOUDFLARE, 0.9, indicators
-
-        if 'cf-ray' in headers or 'cloudflare' in headers.get('server', '').lower():
-            indicators.append("Cloudflare headers detected")
-            return BlockType.CLOUDFLARE, 0.85, indicators
-
-        # CAPTCHA detection
-        if any(ind in html_lower for ind in self.CAPTCHA_INDICATORS):
-            captcha_indicators = [
-                ind for ind in self.CAPTCHA_INDICATORS
-                if ind in html_lower
-            ]
-            indicators.extend(captcha_indicators)
-
-            # Determine CAPTCHA type
-            if 'recaptcha' in html_lower:
-                return BlockType.RECAPTCHA, 0.95, indicators
-            elif 'hcaptcha' in html_lower:
-                return BlockType.HCAPTCHA, 0.95, indicators
-            elif 'funcaptcha' in html_lower:
-                return BlockType.FUNCAPTCHA, 0.90, indicators
-            else:
-                return BlockType.CAPTCHA_UNKNOWN, 0.80, indicators
-
-        # DataDome
-        if 'datadome' in html_lower:
-            indicators.append("DataDome detected")
-            return BlockType.DATADOME, 0.9, indicators
-
-        # PerimeterX
-        if '_px' in html_lower or 'perimeterx' in html_lower:
-            indicators.append("PerimeterX detected")
-            return BlockType.PERIMETER_X, 0.9, indicators
-
-        # Rate limiting
-        if any(ind.lower() in html_lower for ind in self.RATE_LIMIT_INDICATORS):
-            indicators.extend([
-                ind for ind in self.RATE_LIMIT_INDICATORS
-                if ind.lower() in html_lower
-            ])
-            return BlockType.RATE_LIMIT, 0.85, indicators
-
-        # No block detected
-        return BlockType.NONE, 0.0, []
+        return detect_block(html, status_code, headers)
 
     async def _suggest_tactics(
         self,
@@ -174,37 +134,16 @@ class AntiBotAgent:
     ) -> list:
         """Suggest evasion tactics using LLM"""
         try:
-            prompt = f"""You are an anti-bot evasion expert.
-
-Block Type Detected: {block_type.value}
-
-HTTP Headers:
-```json
-{dict(list(headers.items())[:10])}
-```
-
-HTML Sample:
-```html
-{html[:2000] if html else 'N/A'}
-```
-
-Task: Suggest the top 3 evasion tactics for this block type, ordered by priority.
-
-Output (JSON):
-{{
-  "tactics": [
-    {{
-      "tactic": "rotate_proxy|wait|stealth_browser|solve_captcha|change_headers",
-      "priority": 1,
-      "reasoning": "why this tactic would work",
-      "wait_time": 0
-    }}
-  ]
-}}
-"""
+            prompt = prompt_registry.render(
+                "evasion_tactics",
+                block_type=block_type.value,
+                headers=dict(list(headers.items())[:10]),
+                html=html[:2000] if html else 'N/A'
+            )
 
             response = await llm_service.complete(
-                prompt=prompt,
+                prompt=prompt.user,
+                system_message=prompt.system,
                 model=LLMProvider.DEEPSEEK_V3,
                 temperature=0.1,
                 response_format={"type": "json_object"}
@@ -299,6 +238,8 @@ Output (JSON):
         """
         if not tactic:
             tactics = self._get_default_tactics(block_type)
+            if settings.tactic_bandit_enabled:
+                tactics = await tactic_bandit.rank(get_domain(url), tactics, block_type)
             if not tactics:
                 return EvasionResult(
                     success=False,
@@ -306,15 +247,156 @@ Output (JSON):
                 )
             tactic = tactics[0]
 
+        logger.info(f"Executing evasion tactic: {tactic.get('tactic', '')}")
+        return await self._run_tactic(url, block_type, current_strategy, tactic)
+
+    async def evade_hedged(
+        self,
+        url: str,
+        block_type: BlockType,
+        current_strategy: ScrapingStrategy,
+        tactics: List[Dict]
+    ) -> EvasionResult:
+        """
+        Run the top tactics concurrently and return the first unblocked response
+
+        Up to evasion_hedge_max_parallel tactics run at once. Expensive
+        tactics (browser, CAPTCHA, long waits) start only after
+        evasion_expensive_delay, or as soon as no cheap tactic is running
+        or left to try; cheap tactics ranked below them are started first.
+        The remaining tactics are cancelled once one succeeds.
+
+        Args:
+            url: URL to access
+            block_type: Type of block
+            current_strategy: Current strategy
+            tactics: Tactics in preference order
+
+        Returns:
+            EvasionResult: First successful result, or a failure listing every attempt
+        """
+        pending = list(tactics[:settings.evasion_hedge_max_tactics])
+        if not pending:
+            return EvasionResult(
+                success=False,
+                message=f"No tactics available for {block_type.value}"
+            )
+
+        running: Dict[asyncio.Task, str] = {}
+        failures: List[str] = []
+        started = time.monotonic()
+        expensive_at = started + settings.evasion_expensive_delay
+
+        def deferred(tactic: Dict) -> bool:
+            # Expensive tactics wait for the delay while a cheap one runs or is queued
+            return (
+                tactic.get("tactic") in self.EXPENSIVE_TACTICS
+                and time.monotonic() < expensive_at
+                and (
+                    bool(running)
+                    or any(t.get("tactic") not in self.EXPENSIVE_TACTICS for t in pending)
+                )
+            )
+
+        def launch():
+            for tactic in list(pending):
+                if len(running) >= settings.evasion_hedge_max_parallel:
+                    return
+                if deferred(tactic):
+                    continue
+                pending.remove(tactic)
+                name = tactic.get("tactic", "")
+                logger.info(f"Hedged evasion: starting {name}")
+                task = asyncio.create_task(
+                    self._run_tactic(url, block_type, current_strategy, tactic)
+                )
+                running[task] = name
+
+        try:
+            launch()
+            while running:
+                timeout = None
+                if any(deferred(tactic) for tactic in pending):
+                    timeout = max(expensive_at - time.monotonic(), 0.0)
+
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    name = running.pop(task)
+                    result = task.result()
+                    if result.success:
+                        logger.info(
+                            f"Hedged evasion won by {name} after {time.monotonic() - started:.1f}s"
+                        )
+                        return result
+                    failures.append(f"{name}: {result.message}")
+
+                launch()
+
+            return EvasionResult(
+                success=False,
+                message="All evasion tactics failed - " + "; ".join(failures)
+            )
+
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    async def _run_tactic(
+        self,
+        url: str,
+        block_type: BlockType,
+        current_strategy: ScrapingStrategy,
+        tactic: Dict
+    ) -> EvasionResult:
+        """Run a tactic, confirm the page is unblocked and record the outcome"""
+        tactic_name = tactic.get("tactic", "")
+        started = time.monotonic()
+
+        result = await self._execute_tactic(url, block_type, current_strategy, tactic)
+
+        if result.success and result.html:
+            # A 200 response can still be a challenge page
+            still_blocked, _, _ = await self._detect_block(result.html, 200, {})
+            if still_blocked != BlockType.NONE:
+                result = EvasionResult(
+                    success=False,
+                    message=f"Still blocked after {tactic_name}: {still_blocked.value}"
+                )
+
+        key = self._decision_key(url, block_type, current_strategy.engine)
+        if key:
+            decision_cache.record(key, tactic_name, result.success)
+        if settings.tactic_bandit_enabled:
+            await tactic_bandit.record(
+                get_domain(url), tactic_name, result.success, time.monotonic() - started
+            )
+
+        return result
+
+    async def _execute_tactic(
+        self,
+        url: str,
+        block_type: BlockType,
+        current_strategy: ScrapingStrategy,
+        tactic: Dict
+    ) -> EvasionResult:
+        """Run one evasion tactic"""
         tactic_name = tactic.get("tactic", "")
-        logger.info(f"Executing evasion tactic: {tactic_name}")
 
         try:
             if tactic_name == "rotate_proxy":
                 return await self._rotate_proxy(url, current_strategy)
 
             elif tactic_name == "wait":
-                wait_time = tactic.get("wait_time", 60)
+                # Wait as long as the site asked, if it said
+                wait_time = (
+                    await domain_backoff.delay(get_domain(url)) or tactic.get("wait_time", 60)
+                )
                 return await self._wait_and_retry(url, wait_time)
 
             elif tactic_name == "stealth_browser":
@@ -332,6 +414,10 @@ Output (JSON):
                     message=f"Unknown tactic: {tactic_name}"
                 )
 
+        except DeadlineExceeded:
+            # Out of time, not a failed tactic: don't record it against the tactic
+            raise
+
         except Exception as e:
             logger.error(f"Evasion failed: {e}")
             return EvasionResult(
@@ -357,14 +443,19 @@ Output (JSON):
             )
 
         # Try request with new proxy
+        domain = get_domain(url)
         try:
+            await domain_backoff.wait(domain, new_proxy.host)
             async with aiohttp.ClientSession() as session:
                 async with session.get(
                     url,
                     proxy=new_proxy.url,
                     headers=strategy.headers,
-                    timeout=aiohttp.ClientTimeout(total=30)
+                    timeout=aiohttp.ClientTimeout(total=time_budget(30, "evasion"))
                 ) as response:
+                    await domain_backoff.note_response(
+                        domain, response.status, response.headers, new_proxy.host
+                    )
                     html = await response.text()
 
                     # Check if still blocked
@@ -391,6 +482,9 @@ Output (JSON):
                             message=f"Still blocked after proxy rotation: {block_type.value}"
                         )
 
+        except DeadlineExceeded:
+            raise
+
         except Exception as e:
             if new_proxy:
                 await proxy_pool.report_failure(new_proxy, str(e))
@@ -401,12 +495,25 @@ Output (JSON):
 
     async def _wait_and_retry(self, url: str, wait_time: int) -> EvasionResult:
         """Wait and retry"""
+        remaining = remaining_time()
+        if remaining is not None and wait_time >= remaining:
+            return EvasionResult(
+                success=False,
+                message=f"Wait of {wait_time}s exceeds remaining time budget ({remaining:.0f}s)"
+            )
+
         logger.info(f"Waiting {wait_time} seconds before retry...")
         await asyncio.sleep(wait_time)
 
         try:
+            await domain_backoff.wait(get_domain(url))
             async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                async with session.get(
+                    url, timeout=aiohttp.ClientTimeout(total=time_budget(30, "evasion"))
+                ) as response:
+                    await domain_backoff.note_response(
+                        get_domain(url), response.status, response.headers
+                    )
                     html = await response.text()
 
                     return EvasionResult(
@@ -415,6 +522,9 @@ Output (JSON):
                         message=f"Retry after {wait_time}s - Status: {response.status}"
                     )
 
+        except DeadlineExceeded:
+            raise
+
         except Exception as e:
             return EvasionResult(
                 success=False,
@@ -443,10 +553,17 @@ Output (JSON):
                 page = await context.new_page()
 
                 # Navigate
-                await page.goto(url, wait_until='networkidle', timeout=30000)
+                await domain_backoff.wait(get_domain(url))
+                response = await page.goto(
+                    url, wait_until='networkidle', timeout=time_budget(30, "evasion") * 1000
+                )
+                if response:
+                    await domain_backoff.note_response(
+                        get_domain(url), response.status, await response.all_headers()
+                    )
 
                 # Wait for potential challenges
-                await asyncio.sleep(5)
+                await asyncio.sleep(time_budget(5, "evasion"))
 
                 # Get content
                 html = await page.content()
@@ -461,6 +578,9 @@ Output (JSON):
                     message="Successfully accessed with stealth browser"
                 )
 
+        except DeadlineExceeded:
+            raise
+
         except Exception as e:
             logger.error(f"Stealth browser failed: {e}")
             return EvasionResult(
@@ -498,12 +618,16 @@ Output (JSON):
         new_headers["User-Agent"] = random.choice(new_user_agents)
 
         try:
+            await domain_backoff.wait(get_domain(url))
             async with aiohttp.ClientSession() as session:
                 async with session.get(
                     url,
                     headers=new_headers,
-                    timeout=aiohttp.ClientTimeout(total=30)
+                    timeout=aiohttp.ClientTimeout(total=time_budget(30, "evasion"))
                 ) as response:
+                    await domain_backoff.note_response(
+                        get_domain(url), response.status, response.headers
+                    )
                     html = await response.text()
 
                     return EvasionResult(
@@ -512,6 +636,9 @@ Output (JSON):
                         message=f"Headers changed - Status: {response.status}"
                     )
 
+        except DeadlineExceeded:
+            raise
+
         except Exception as e:
             return EvasionResult(
                 success=False,
@@ -11,6 +11,10 @@ from ..models.scraping import (
 )
 from ..models.base import ScrapingEngine
 from ..services.proxy_service import proxy_pool
+from ..services.singleflight import SingleFlight
+from ..services.domain_backoff import domain_backoff
+from ..utils.urls import normalize_url, get_domain
+from ..utils.request_context import time_budget, DeadlineExceeded
 from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -32,6 +36,9 @@ class DispatcherAgent:
             "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15",
         ]
 
+        # Concurrent probes of the same URL share one request
+        self.probe_singleflight = SingleFlight("probe")
+
     async def dispatch(self, request: ScrapeRequest) -> ScrapingStrategy:
         """
         Main dispatch method
@@ -45,7 +52,10 @@ class DispatcherAgent:
         logger.info(f"Dispatching request for URL: {request.url}")
 
         # Step 1: Analyze URL
-        analysis = await self._analyze_url(str(request.url))
+        url = str(request.url)
+        analysis = await self.probe_singleflight.do(
+            normalize_url(url), lambda: self._analyze_url(url)
+        )
 
         # Step 2: Select engine based on analysis
         engine = self._select_engine(analysis)
@@ -91,20 +101,31 @@ class DispatcherAgent:
         """
         logger.debug(f"Analyzing URL: {url}")
 
+        domain = get_domain(url)
+
         try:
+            await domain_backoff.wait(domain)
             async with aiohttp.ClientSession() as session:
                 # Try HEAD first (faster)
                 try:
-                    async with session.head(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                    async with session.head(
+                        url, timeout=aiohttp.ClientTimeout(total=time_budget(10, "probe"))
+                    ) as resp:
                         status_code = resp.status
                         headers = dict(resp.headers)
                         html_sample = ""
-                except:
+                    await domain_backoff.note_response(domain, status_code, headers)
+                except DeadlineExceeded:
+                    raise
+                except Exception:
                     # Fallback to GET
-                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as resp:
+                    async with session.get(
+                        url, timeout=aiohttp.ClientTimeout(total=time_budget(15, "probe"))
+                    ) as resp:
                         status_code = resp.status
                         headers = dict(resp.headers)
                         html_sample = await resp.text()
+                    await domain_backoff.note_response(domain, status_code, headers)
 
             # Analyze
             has_javascript = self._detect_javascript(html_sample)
@@ -123,6 +144,10 @@ class DispatcherAgent:
                 is_spa=is_spa
             )
 
+        except DeadlineExceeded:
+            # Out of time: stop the request rather than guess a strategy
+            raise
+
         except Exception as e:
             logger.error(f"URL analysis failed: {e}")
             # Return safe defaults
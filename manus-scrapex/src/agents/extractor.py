@@ -1,17 +1,29 @@
 """
 Extractor Agent - Semantic data extraction using LLM
 """
+import asyncio
 import json
 import logging
-from typing import Dict, Any, Optional
+import math
+import re
+from typing import Dict, Any, AsyncIterator, List, Optional, Set, Tuple
 from bs4 import BeautifulSoup, Comment
 
-from ..models.scraping import FieldDefinition
+from ..models.scraping import FieldDefinition, ExtractionResult
 from ..services.llm_service import llm_service, LLMProvider
+from ..services.extraction_cache import extraction_cache
+from ..utils.request_context import check_deadline, DeadlineExceeded
+from ..utils.json_stream import IncrementalJSONParser, parse_json_object
+from ..utils.schema_compiler import CompiledSchema, infer_value, schema_compiler
+from ..prompts.base import RenderedPrompt
+from ..prompts.registry import prompt_registry
 from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Rough chars-per-token ratio used to size prompts without a tokenizer
+CHARS_PER_TOKEN = 4
+
 
 class ExtractorAgent:
     """
@@ -22,7 +34,7 @@ class ExtractorAgent:
     """
 
     def __init__(self):
-        self.cache = {}  # Simple in-memory cache
+        self.cache = extraction_cache
 
     async def extract(
         self,
@@ -39,24 +51,89 @@ class ExtractorAgent:
         Returns:
             Dict: Extracted data
         """
+        result = await self.extract_result(html, schema, scored=False)
+        return result.data
+
+    async def extract_result(
+        self,
+        html: str,
+        schema: Dict[str, FieldDefinition],
+        scored: Optional[bool] = None,
+        strict: bool = False
+    ) -> ExtractionResult:
+        """
+        Extract data from HTML, optionally with per-field confidence and evidence
+
+        In scored mode one LLM call returns each value with a confidence and
+        a verbatim evidence snippet, which ValidatorAgent.validate uses
+        instead of a second validation call.
+
+        Args:
+            html: HTML content
+            schema: Data extraction schema
+            scored: Request confidence/evidence (defaults to settings.extraction_scoring)
+            strict: Go straight to the strict prompt (unscored, unchunked pages),
+                e.g. when retrying after type errors
+
+        Returns:
+            ExtractionResult: Extracted data (scored=True if confidence came with it)
+        """
+        if scored is None:
+            scored = settings.extraction_scoring
+
         logger.info(f"Extracting {len(schema)} fields from HTML")
 
+        fingerprint = None
+        if settings.extraction_cache_enabled:
+            fingerprint = self.cache.fingerprint(html)
+            cached = await self.cache.get(fingerprint, schema)
+            if cached is not None:
+                return ExtractionResult(data=cached)
+
+        if scored:
+            result = await self._extract_scored(html, schema)
+        else:
+            result = ExtractionResult(data=await self._extract_uncached(html, schema, strict))
+
+        if fingerprint and any(value is not None for value in result.data.values()):
+            await self.cache.set(fingerprint, schema, result.data)
+
+        return result
+
+    async def invalidate_cache(self, html: str, schema: Dict[str, FieldDefinition]):
+        """Drop the cached extraction for a page (e.g. after it failed validation)"""
+        if settings.extraction_cache_enabled:
+            await self.cache.delete(self.cache.fingerprint(html), schema)
+
+    async def _extract_uncached(
+        self,
+        html: str,
+        schema: Dict[str, FieldDefinition],
+        strict: bool = False
+    ) -> Dict[str, Any]:
+        """Run the extraction pipeline without consulting the cache"""
         # Clean HTML first
         cleaned_html = self._clean_html(html)
 
-        # Try LLM extraction (primary method)
-        try:
-            result = await self._extract_with_llm(cleaned_html, schema)
+        # Large pages: map-reduce over chunks instead of truncating
+        if self._estimate_tokens(cleaned_html) > settings.extraction_chunk_tokens:
+            result = await self.extract_chunked(cleaned_html, schema)
+            return result.data
 
-            # Validate result has expected fields
-            if self._validate_basic_structure(result, schema):
-                logger.info("LLM extraction successful")
-                return result
-            else:
-                logger.warning("LLM extraction incomplete, retrying...")
+        # Try LLM extraction (primary method), unless the strict prompt was asked for
+        if not strict:
+            try:
+                result = await self._extract_with_llm(cleaned_html, schema)
 
-        except Exception as e:
-            logger.error(f"LLM extraction failed: {e}")
+                # Validate result has expected fields
+                if self._validate_basic_structure(result, schema):
+                    logger.info("LLM extraction successful")
+                    return result
+                else:
+                    logger.warning("LLM extraction incomplete, retrying...")
+
+            except Exception as e:
+                logger.error(f"LLM extraction failed: {e}")
 
         # Fallback: Try with stricter prompt
         try:
@@ -71,6 +148,79 @@ class ExtractorAgent:
         logger.warning("All extraction methods failed, returning empty result")
         return {field: None for field in schema.keys()}
 
+    async def _extract_scored(
+        self,
+        html: str,
+        schema: Dict[str, FieldDefinition]
+    ) -> ExtractionResult:
+        """Single-call extraction with confidence and evidence per field"""
+        cleaned_html = self._clean_html(html)
+
+        # Chunked pages are merged by vote; fall back to the plain pipeline
+        if self._estimate_tokens(cleaned_html) <= settings.extraction_chunk_tokens:
+            try:
+                result = await self._extract_scored_with_llm(cleaned_html, schema)
+                if self._validate_basic_structure(result.data, schema):
+                    logger.info("Scored LLM extraction successful")
+                    return result
+                logger.warning("Scored LLM extraction incomplete, falling back")
+            except Exception as e:
+                logger.error(f"Scored LLM extraction failed: {e}")
+
+        return ExtractionResult(data=await self._extract_uncached(html, schema))
+
+    async def _extract_scored_with_llm(
+        self,
+        html: str,
+        schema: Dict[str, FieldDefinition]
+    ) -> ExtractionResult:
+        """
+        Extract values, confidence and evidence in one LLM call
+
+        Args:
+            html: Cleaned HTML
+            schema: Extraction schema
+
+        Returns:
+            ExtractionResult: Scored extraction
+        """
+        prompt = prompt_registry.render("extraction_scored", schema=schema, html=html)
+        model, fallback_model = self._extraction_models()
+
+        response = await llm_service.complete_with_fallback(
+            prompt=prompt.user,
+            system_message=prompt.system,
+            primary_model=model,
+            fallback_model=fallback_model,
+            temperature=0,
+            max_tokens=3000,
+            response_format={"type": "json_object"}
+        )
+
+        raw = parse_json_object(response)
+        result = ExtractionResult(scored=True)
+
+        for field in schema.keys():
+            entry = raw.get(field)
+            if not isinstance(entry, dict):
+                # Bare value without a score
+                result.data[field] = entry
+                result.confidence_scores[field] = 0.5
+                result.evidence[field] = None
+                continue
+
+            result.data[field] = entry.get("value")
+            try:
+                confidence = float(entry.get("confidence", 0.5))
+            except (TypeError, ValueError):
+                confidence = 0.5
+            result.confidence_scores[field] = min(max(confidence, 0.0), 1.0)
+
+            evidence = entry.get("evidence")
+            result.evidence[field] = str(evidence) if evidence not in (None, "") else None
+
+        return result
+
     def _clean_html(self, html: str) -> str:
         """
         Clean HTML to reduce token count and improve extraction
@@ -100,15 +250,12 @@ class ExtractorAgent:
             # Get simplified HTML
             cleaned = str(soup)
 
-            # Limit length to avoid token limits (keep most relevant part)
-            max_length = 10000
+            # Oversized pages are chunked later; drop the <head> at least
+            max_length = settings.extraction_chunk_tokens * CHARS_PER_TOKEN
             if len(cleaned) > max_length:
-                # Try to keep the main content area
                 body = soup.find('body')
                 if body:
-                    cleaned = str(body)[:max_length]
-                else:
-                    cleaned = cleaned[:max_length]
+                    cleaned = str(body)
 
             logger.debug(f"HTML cleaned: {len(html)} -> {len(cleaned)} chars")
             return cleaned
@@ -117,10 +264,381 @@ class ExtractorAgent:
             logger.error(f"HTML cleaning failed: {e}")
             return html[:10000]  # Return truncated original
 
-    async def _extract_with_llm(
+    async def reextract_fields(
+        self,
+        html: str,
+        schema: Dict[str, FieldDefinition],
+        data: Dict[str, Any],
+        fields: List[str],
+        issues: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Re-extract only the given fields and merge them into existing data
+
+        Instead of re-running the whole pipeline, one small LLM call is made
+        with a focused context: the page fragments that mention the fields.
+
+        Args:
+            html: Original HTML
+            schema: Full extraction schema
+            data: Previously extracted data
+            fields: Fields to re-extract
+            issues: Optional field -> reason it failed validation
+
+        Returns:
+            Dict: data with the re-extracted fields replaced
+        """
+        sub_schema = {field: schema[field] for field in fields if field in schema}
+        if not sub_schema:
+            return data
+
+        logger.info(f"Re-extracting fields: {', '.join(sub_schema)}")
+
+        cleaned_html = self._clean_html(html)
+        context = self._build_focused_context(
+            cleaned_html, sub_schema, settings.reextraction_context_chars
+        )
+
+        prompt = self._build_reextraction_prompt(context, sub_schema, data, issues or {})
+
+        model, fallback_model = self._extraction_models()
+
+        merged = dict(data)
+        try:
+            response = await llm_service.complete_with_fallback(
+                prompt=prompt.user,
+                system_message=prompt.system,
+                primary_model=model,
+                fallback_model=fallback_model,
+                temperature=0,
+                max_tokens=500,
+                response_format={"type": "json_object"}
+            )
+
+            try:
+                result = json.loads(response)
+            except json.JSONDecodeError:
+                result = self._extract_json_from_text(response)
+
+            for field in sub_schema:
+                if field in result:
+                    merged[field] = result[field]
+
+        except Exception as e:
+            logger.error(f"Field re-extraction failed: {e}")
+
+        return merged
+
+    def _build_focused_context(
+        self,
+        html: str,
+        schema: Dict[str, FieldDefinition],
+        max_chars: int
+    ) -> str:
+        """
+        Collect the page fragments that mention the given fields
+
+        Elements whose id/class/itemprop or own text contains a field
+        keyword are collected (with their parent for short elements) in
+        document order until max_chars is reached. Falls back to the start
+        of the page when nothing matches.
+
+        Args:
+            html: Cleaned HTML
+            schema: Fields to locate
+            max_chars: Context budget
+
+        Returns:
+            str: Focused HTML context
+        """
+        keywords = set()
+        for field, defn in schema.items():
+            keywords.update(self._field_keywords(field, defn))
+
+        if not keywords:
+            return html[:max_chars]
+
+        soup = BeautifulSoup(html, 'lxml')
+        snippets: List[str] = []
+        seen = set()
+        total = 0
+
+        for element in soup.find_all(True):
+            if element.name in ('html', 'body'):
+                continue
+
+            attributes = " ".join([
+                element.get('id', ''),
+                " ".join(element.get('class', [])),
+                element.get('itemprop', ''),
+                element.get('name', ''),
+            ]).lower()
+            own_text = " ".join(element.find_all(string=True, recursive=False)).lower()
+
+            if not any(k in attributes or k in own_text for k in keywords):
+                continue
+
+            # Short elements are usually labels; include the value next to them
+            target = element
+            if len(str(element)) < 300 and element.parent and element.parent.name != 'body':
+                target = element.parent
+
+            if id(target) in seen:
+                continue
+            seen.add(id(target))
+
+            snippet = str(target)[:max_chars // 2]
+            if total + len(snippet) > max_chars:
+                break
+
+            snippets.append(snippet)
+            total += len(snippet)
+
+        if not snippets:
+            return html[:max_chars]
+
+        return "\n...\n".join(snippets)
+
+    def _field_keywords(self, field: str, defn: FieldDefinition) -> List[str]:
+        """Keywords used to locate a field in the page"""
+        generic = {"value", "field", "number", "string", "product", "page", "item", "which"}
+
+        keywords = [
+            token for token in re.split(r'[_\-\s]+', field.lower())
+            if len(token) >= 3 and token not in generic
+        ]
+        keywords.extend(
+            word for word in re.findall(r'[a-z]{5,}', defn.description.lower())
+            if word not in generic
+        )
+
+        return keywords
+
+    def _build_reextraction_prompt(
+        self,
+        html: str,
+        schema: Dict[str, FieldDefinition],
+        data: Dict[str, Any],
+        issues: Dict[str, str]
+    ) -> RenderedPrompt:
+        """Build focused prompt for re-extracting failed fields"""
+        previous_lines = []
+        for field in schema.keys():
+            line = f"- `{field}`: {json.dumps(data.get(field), default=str)}"
+            if field in issues:
+                line += f" - rejected: {issues[field]}"
+            previous_lines.append(line)
+
+        return prompt_registry.render(
+            "reextraction",
+            schema=schema,
+            previous="\n".join(previous_lines),
+            html=html
+        )
+
+    def _estimate_tokens(self, text: str) -> int:
+        """Estimate token count of text"""
+        return len(text) // CHARS_PER_TOKEN
+
+    async def extract_chunked(
+        self,
+        html: str,
+        schema: Dict[str, FieldDefinition]
+    ) -> ExtractionResult:
+        """
+        Map-reduce extraction for pages exceeding the context budget
+
+        The page is split into overlapping chunks which are extracted
+        concurrently (bounded by settings.extraction_max_parallel_chunks).
+        Partial results are merged per field by majority vote. Once all
+        required fields are filled, pending chunks are cancelled.
+
+        Args:
+            html: Cleaned HTML
+            schema: Extraction schema
+
+        Returns:
+            ExtractionResult: Merged data with per-field confidence
+        """
+        chunks = self._split_into_chunks(
+            html,
+            settings.extraction_chunk_tokens,
+            settings.extraction_chunk_overlap_tokens
+        )
+
+        if len(chunks) > settings.extraction_max_chunks:
+            logger.warning(
+                f"Page split into {len(chunks)} chunks, "
+                f"only the first {settings.extraction_max_chunks} will be extracted"
+            )
+            chunks = chunks[:settings.extraction_max_chunks]
+
+        logger.info(f"Chunked extraction: {len(chunks)} chunks")
+
+        semaphore = asyncio.Semaphore(settings.extraction_max_parallel_chunks)
+
+        async def run_chunk(index: int, chunk: str) -> Tuple[int, Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    check_deadline("chunk extraction")
+                    partial = await self._extract_with_llm(
+                        chunk, schema, part=(index + 1, len(chunks))
+                    )
+                    return index, partial if isinstance(partial, dict) else {}
+                except DeadlineExceeded:
+                    # Don't merge a silently incomplete record: abort the request
+                    raise
+                except Exception as e:
+                    logger.error(f"Chunk {index + 1}/{len(chunks)} extraction failed: {e}")
+                    return index, {}
+
+        tasks = [
+            asyncio.create_task(run_chunk(index, chunk))
+            for index, chunk in enumerate(chunks)
+        ]
+
+        partials: Dict[int, Dict[str, Any]] = {}
+        result = ExtractionResult(
+            data={field: None for field in schema.keys()},
+            chunks_total=len(chunks),
+            chunks_processed=0
+        )
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, partial = await next_done
+                partials[index] = partial
+
+                result = self._merge_chunk_results(
+                    [partials[i] for i in sorted(partials)], schema
+                )
+                result.chunks_total = len(chunks)
+                result.chunks_processed = len(partials)
+
+                if self._required_fields_filled(result.data, schema):
+                    if len(partials) < len(chunks):
+                        logger.info(
+                            f"All required fields filled after "
+                            f"{len(partials)}/{len(chunks)} chunks, stopping early"
+                        )
+                    break
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        return result
+
+    def _split_into_chunks(
         self,
         html: str,
+        chunk_tokens: int,
+        overlap_tokens: int
+    ) -> List[str]:
+        """
+        Split HTML into overlapping, token-bounded chunks
+
+        Chunk boundaries are snapped to tag boundaries where possible so
+        elements are not cut in the middle of a tag.
+
+        Args:
+            html: Cleaned HTML
+            chunk_tokens: Maximum tokens per chunk
+            overlap_tokens: Tokens shared between consecutive chunks
+
+        Returns:
+            List[str]: Chunks in document order
+        """
+        chunk_chars = max(chunk_tokens * CHARS_PER_TOKEN, 1)
+        overlap_chars = min(overlap_tokens * CHARS_PER_TOKEN, chunk_chars // 4)
+
+        chunks = []
+        start = 0
+
+        while start < len(html):
+            end = min(start + chunk_chars, len(html))
+
+            # End the chunk after a closing '>' if one is reasonably near
+            if end < len(html):
+                boundary = html.rfind('>', start + chunk_chars // 2, end)
+                if boundary != -1:
+                    end = boundary + 1
+
+            chunks.append(html[start:end])
+
+            if end >= len(html):
+                break
+
+            # Start the next chunk at a tag opening inside the overlap window
+            next_start = end - overlap_chars
+            tag_start = html.find('<', next_start, end)
+            start = tag_start if tag_start != -1 else next_start
+
+        return chunks
+
+    def _merge_chunk_results(
+        self,
+        partials: List[Dict[str, Any]],
         schema: Dict[str, FieldDefinition]
+    ) -> ExtractionResult:
+        """
+        Merge per-chunk extraction results
+
+        Each field takes the value most chunks agree on (earliest chunk
+        wins ties). Confidence is the share of chunks that returned a
+        value for the field and agree with the chosen one.
+
+        Args:
+            partials: Per-chunk results in document order
+            schema: Extraction schema
+
+        Returns:
+            ExtractionResult: Merged data and confidence scores
+        """
+        data: Dict[str, Any] = {}
+        confidence_scores: Dict[str, float] = {}
+
+        for field in schema.keys():
+            candidates = [
+                partial.get(field) for partial in partials
+                if partial.get(field) not in (None, "", [], {})
+            ]
+
+            if not candidates:
+                data[field] = None
+                continue
+
+            votes: Dict[str, int] = {}
+            first_seen: Dict[str, Any] = {}
+            for value in candidates:
+                key = json.dumps(value, sort_keys=True, default=str)
+                votes[key] = votes.get(key, 0) + 1
+                first_seen.setdefault(key, value)
+
+            # dicts keep insertion order, so max() prefers earlier chunks on ties
+            best_key = max(votes, key=lambda k: votes[k])
+            data[field] = first_seen[best_key]
+            confidence_scores[field] = votes[best_key] / len(candidates)
+
+        return ExtractionResult(data=data, confidence_scores=confidence_scores)
+
+    def _required_fields_filled(
+        self,
+        data: Dict[str, Any],
+        schema: Dict[str, FieldDefinition]
+    ) -> bool:
+        """Check whether every required field (or every field, if none are required) has a value"""
+        targets = [field for field, defn in schema.items() if defn.required]
+        if not targets:
+            targets = list(schema.keys())
+
+        return all(data.get(field) is not None for field in targets)
+
+    async def _extract_with_llm(
+        self,
+        html: str,
+        schema: Dict[str, FieldDefinition],
+        part: Optional[Tuple[int, int]] = None
     ) -> Dict[str, Any]:
         """
         Extract data using LLM (DeepSeek)
@@ -128,23 +646,36 @@ class ExtractorAgent:
         Args:
             html: Cleaned HTML
             schema: Extraction schema
+            part: Optional (index, total) when html is one chunk of a larger page
 
         Returns:
             Dict: Extracted data
         """
+        # Stream fields and stop generating once every schema field is parsed
+        if settings.extraction_streaming:
+            try:
+                data = {
+                    field: value
+                    async for field, value in self.stream_fields(html, schema, part)
+                }
+                if data:
+                    return data
+            except Exception as e:
+                logger.warning(
+                    f"Streaming extraction failed, falling back to a full completion: {e}"
+                )
+
         # Build prompt
-        prompt = self._build_extraction_prompt(html, schema)
+        prompt = self._build_extraction_prompt(html, schema, part=part)
 
-        # Call LLM
-        model = LLMProvider.DEEPSEEK_V3
-        if settings.feature_deepseek_primary:
-            model = LLMProvider.DEEPSEEK_V3
-        else:
-            model = LLMProvider.GPT4
+        # Call LLM (hedged to the other provider when the primary is slow)
+        model, fallback_model = self._extraction_models()
 
-        response = await llm_service.complete(
-            prompt=prompt,
-            model=model,
+        response = await llm_service.complete_with_fallback(
+            prompt=prompt.user,
+            system_message=prompt.system,
+            primary_model=model,
+            fallback_model=fallback_model,
             temperature=0,
             max_tokens=2000,
             response_format={"type": "json_object"}
@@ -158,6 +689,63 @@ class ExtractorAgent:
             # Try to extract JSON from response
             return self._extract_json_from_text(response)
 
+    async def stream_fields(
+        self,
+        html: str,
+        schema: Dict[str, FieldDefinition],
+        part: Optional[Tuple[int, int]] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Extract data with a streamed completion, yielding fields as they complete
+
+        Callers can validate or use each field while the rest is still
+        being generated. Generation is stopped as soon as every schema
+        field has been parsed.
+
+        Args:
+            html: Cleaned HTML
+            schema: Extraction schema
+            part: Optional (index, total) when html is one chunk of a larger page
+
+        Yields:
+            Tuple[str, Any]: (field name, value) for each schema field
+        """
+        prompt = self._build_extraction_prompt(html, schema, part=part)
+        model, _ = self._extraction_models()
+        parser = IncrementalJSONParser()
+
+        stream = llm_service.complete_stream(
+            prompt=prompt.user,
+            system_message=prompt.system,
+            model=model,
+            temperature=0,
+            max_tokens=2000,
+            response_format={"type": "json_object"}
+        )
+
+        try:
+            async for delta in stream:
+                for field, value in parser.feed(delta).items():
+                    if field in schema:
+                        yield field, value
+
+                if all(field in parser.fields for field in schema):
+                    if not parser.done:
+                        logger.debug("All schema fields parsed, stopping generation")
+                    return
+
+            for field, value in parser.close().items():
+                if field in schema:
+                    yield field, value
+        finally:
+            await stream.aclose()
+
+    def _extraction_models(self) -> Tuple[LLMProvider, LLMProvider]:
+        """Primary and fallback model for extraction"""
+        if settings.feature_deepseek_primary:
+            return LLMProvider.DEEPSEEK_V3, LLMProvider.GPT4
+        return LLMProvider.GPT4, LLMProvider.DEEPSEEK_V3
+
     async def _extract_with_llm_strict(
         self,
         html: str,
@@ -176,7 +764,8 @@ class ExtractorAgent:
         prompt = self._build_strict_extraction_prompt(html, schema)
 
         response = await llm_service.complete(
-            prompt=prompt,
+            prompt=prompt.user,
+            system_message=prompt.system,
             model=LLMProvider.DEEPSEEK_V3,
             temperature=0,
             max_tokens=2000,
@@ -188,106 +777,30 @@ class ExtractorAgent:
     def _build_extraction_prompt(
         self,
         html: str,
-        schema: Dict[str, FieldDefinition]
-    ) -> str:
+        schema: Dict[str, FieldDefinition],
+        part: Optional[Tuple[int, int]] = None
+    ) -> RenderedPrompt:
         """Build extraction prompt for LLM"""
-        # Format schema
-        schema_lines = []
-        for field, defn in schema.items():
-            line = f"- `{field}`: {defn.description}"
-            if defn.type:
-                line += f" (type: {defn.type})"
-            if defn.required:
-                line += " **[REQUIRED]**"
-            schema_lines.append(line)
-
-        schema_text = "\n".join(schema_lines)
-
-        prompt = f"""You are a precise data extraction assistant. Extract the following fields from the HTML below.
-
-**Schema:**
-{schema_text}
-
-**Instructions:**
-1. Return ONLY valid JSON (no explanations, no markdown)
-2. Use `null` for missing fields
-3. Follow the exact field names specified
-4. Convert values to correct types:
-   - Prices: Remove currency symbols, convert to float (e.g., "$29.99" → 29.99)
-   - Numbers: Convert to int or float as appropriate
-   - Booleans: true/false
-   - Dates: Keep as strings in consistent format
-5. Extract clean, trimmed values without extra whitespace
-6. If multiple matches exist, use the most prominent/relevant one
-
-**HTML:**
-```html
-{html}
-```
-
-**JSON Output (only JSON, nothing else):**
-"""
-        return prompt
+        part_note = ""
+        if part:
+            part_note = f"Note: the HTML is part {part[0]} of {part[1]} of a larger page.\n\n"
+
+        return prompt_registry.render("extraction", schema=schema, part_note=part_note, html=html)
 
     def _build_strict_extraction_prompt(
         self,
         html: str,
         schema: Dict[str, FieldDefinition]
-    ) -> str:
+    ) -> RenderedPrompt:
         """Build stricter prompt with examples"""
-        # Format schema with examples
-        schema_lines = []
-        for field, defn in schema.items():
-            line = f"- `{field}`: {defn.description} (type: {defn.type})"
-            if defn.required:
-                line += " **[REQUIRED]**"
-
-            # Add example based on type
-            if defn.type == "float" and "price" in field.lower():
-                line += "\n  Example: If HTML has \"$29.99\", extract 29.99"
-            elif defn.type == "int" and "rating" in field.lower():
-                line += "\n  Example: If HTML has \"4.5 stars\", extract 4.5"
-
-            schema_lines.append(line)
-
-        schema_text = "\n".join(schema_lines)
-
-        prompt = f"""You are a precise data extraction system. Your task is to extract structured data from HTML.
-
-**CRITICAL RULES:**
-1. Output MUST be valid JSON only
-2. Use exact field names from schema
-3. Convert types correctly
-4. Use null for missing data
-5. No explanations, no markdown formatting
-
-**Schema to extract:**
-{schema_text}
-
-**HTML Content:**
-```html
-{html}
-```
-
-**Your JSON output (start with {{ immediately):**
-"""
-        return prompt
+        return prompt_registry.render("extraction_strict", schema=schema, html=html)
 
     def _extract_json_from_text(self, text: str) -> Dict[str, Any]:
         """Extract JSON from text that might have extra content"""
-        try:
-            # Try to find JSON in text
-            import re
-            json_match = re.search(r'\{.*\}', text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-
-            # If that fails, try to parse the whole thing
-            return json.loads(text)
-
-        except Exception as e:
-            logger.error(f"Failed to extract JSON from text: {e}")
-            return {}
+        data = parse_json_object(text or "")
+        if not data:
+            logger.error(f"Failed to extract JSON from text: {(text or '')[:200]}")
+        return data
 
     def _validate_basic_structure(
         self,
@@ -321,6 +834,230 @@ class ExtractorAgent:
 
         return True
 
+    async def extract_list(
+        self,
+        html: str,
+        schema: Dict[str, FieldDefinition],
+        item_selector: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract every repeated item from a listing page
+
+        Args:
+            html: HTML content
+            schema: Schema of a single item
+            item_selector: Optional CSS selector for the items
+
+        Returns:
+            List[Dict]: One record per item
+        """
+        return [item async for item in self.iter_list_items(html, schema, item_selector)]
+
+    async def iter_list_items(
+        self,
+        html: str,
+        schema: Dict[str, FieldDefinition],
+        item_selector: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream repeated items from a listing page as they are extracted
+
+        The repeating items are identified once (explicit selector or
+        structural repetition detection). Selectors are generated from the
+        first item with a single LLM call and applied to every item. If
+        they do not fill the required fields, items are sent to the LLM in
+        token-bounded groups instead.
+
+        Args:
+            html: HTML content
+            schema: Schema of a single item
+            item_selector: Optional CSS selector for the items
+
+        Yields:
+            Dict: Extracted item
+        """
+        soup = BeautifulSoup(html, 'lxml')
+        for tag in soup(['script', 'style', 'noscript']):
+            tag.decompose()
+
+        if item_selector:
+            items = soup.select(item_selector)
+        else:
+            items = self._detect_repeated_items(soup)
+
+        if not items:
+            logger.warning("No repeated items detected, extracting list with LLM")
+            groups = self._split_into_chunks(
+                self._clean_html(html),
+                settings.extraction_chunk_tokens,
+                settings.extraction_chunk_overlap_tokens
+            )
+            async for record in self._extract_items_with_llm(groups, schema, overlapping=True):
+                yield record
+            return
+
+        logger.info(f"List extraction: {len(items)} repeated items")
+
+        selectors = await self.generate_selectors(str(items[0]), schema, relative=True)
+        plan = schema_compiler.compile(schema)
+        first = self._apply_selectors(items[0], selectors, plan) if selectors else {}
+
+        if selectors and self._required_fields_filled(first, schema):
+            for item in items:
+                record = self._apply_selectors(item, selectors, plan)
+                if any(value is not None for value in record.values()):
+                    yield record
+            return
+
+        logger.warning("Item selectors incomplete, extracting items with LLM")
+        groups = self._group_items([str(item) for item in items])
+        async for record in self._extract_items_with_llm(groups, schema):
+            yield record
+
+    def _detect_repeated_items(self, soup: BeautifulSoup) -> List[Any]:
+        """
+        Find the dominant group of structurally similar sibling elements
+
+        Siblings are grouped by (tag, classes). Groups are scored by size,
+        structural richness and text content, so product cards beat
+        navigation links.
+
+        Args:
+            soup: Parsed page
+
+        Returns:
+            List: Item elements (empty if no repetition found)
+        """
+        best_items: List[Any] = []
+        best_score = 0.0
+
+        for parent in soup.find_all(True):
+            groups: Dict[Tuple[str, Tuple[str, ...]], List[Any]] = {}
+            for child in parent.find_all(True, recursive=False):
+                signature = (child.name, tuple(sorted(child.get('class', []))))
+                groups.setdefault(signature, []).append(child)
+
+            for members in groups.values():
+                if len(members) < settings.list_min_repeats:
+                    continue
+
+                avg_text = sum(len(m.get_text(strip=True)) for m in members) / len(members)
+                if avg_text == 0:
+                    continue
+
+                avg_descendants = sum(len(m.find_all(True)) for m in members) / len(members)
+                score = len(members) * min(avg_descendants + 1, 20) * math.log1p(avg_text)
+
+                if score > best_score:
+                    best_score = score
+                    best_items = members
+
+        return best_items
+
+    def _group_items(self, item_htmls: List[str]) -> List[str]:
+        """Pack item HTML into groups that fit the chunk token budget"""
+        max_chars = settings.extraction_chunk_tokens * CHARS_PER_TOKEN
+        groups = []
+        current = ""
+
+        for item_html in item_htmls:
+            if current and len(current) + len(item_html) > max_chars:
+                groups.append(current)
+                current = ""
+            current += item_html + "\n"
+
+        if current:
+            groups.append(current)
+
+        return groups
+
+    async def _extract_items_with_llm(
+        self,
+        groups: List[str],
+        schema: Dict[str, FieldDefinition],
+        overlapping: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Extract items from HTML groups concurrently, yielding in document order
+
+        Identical records are legitimate on listing pages (e.g. two variants
+        with the same visible fields), so only records repeated from the
+        previous group are dropped, and only when consecutive groups overlap.
+
+        Args:
+            groups: HTML fragments, each holding one or more items
+            schema: Schema of a single item
+            overlapping: Whether consecutive groups share HTML
+
+        Yields:
+            Dict: Extracted item
+        """
+        semaphore = asyncio.Semaphore(settings.extraction_max_parallel_chunks)
+
+        async def run_group(group: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await self._extract_item_group(group, schema)
+                except Exception as e:
+                    logger.error(f"Item group extraction failed: {e}")
+                    return []
+
+        tasks = [asyncio.create_task(run_group(group)) for group in groups]
+        previous: Set[str] = set()
+
+        try:
+            for task in tasks:
+                current = set()
+                for record in await task:
+                    key = json.dumps(record, sort_keys=True, default=str)
+                    current.add(key)
+                    if overlapping and key in previous:
+                        continue
+                    yield record
+                previous = current
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _extract_item_group(
+        self,
+        html: str,
+        schema: Dict[str, FieldDefinition]
+    ) -> List[Dict[str, Any]]:
+        """Extract all items contained in one HTML fragment"""
+        prompt = self._build_list_extraction_prompt(html, schema)
+
+        response = await llm_service.complete_with_fallback(
+            prompt=prompt.user,
+            system_message=prompt.system,
+            primary_model=LLMProvider.DEEPSEEK_V3,
+            fallback_model=LLMProvider.GPT4,
+            temperature=0,
+            max_tokens=4000,
+            response_format={"type": "json_object"}
+        )
+
+        try:
+            data = json.loads(response)
+        except json.JSONDecodeError:
+            data = self._extract_json_from_text(response)
+
+        records = []
+        for item in data.get("items", []):
+            if isinstance(item, dict):
+                records.append({field: item.get(field) for field in schema.keys()})
+
+        return records
+
+    def _build_list_extraction_prompt(
+        self,
+        html: str,
+        schema: Dict[str, FieldDefinition]
+    ) -> RenderedPrompt:
+        """Build prompt for extracting a list of repeated items"""
+        return prompt_registry.render("list_extraction", schema=schema, html=html)
+
     async def extract_with_selectors(
         self,
         html: str,
@@ -339,21 +1076,52 @@ class ExtractorAgent:
         logger.info(f"Extracting with selectors: {len(selectors)} fields")
 
         soup = BeautifulSoup(html, 'lxml')
+        return self._apply_selectors(soup, selectors)
+
+    def _apply_selectors(
+        self,
+        root: Any,
+        selectors: Dict[str, str],
+        plan: Optional[CompiledSchema] = None
+    ) -> Dict[str, Any]:
+        """
+        Apply CSS selectors within a root element
+
+        Selectors may end with Scrapy-style `::text` or `::attr(name)`.
+        An empty CSS part targets the root element itself.
+
+        Args:
+            root: BeautifulSoup document or element
+            selectors: Dict of field -> selector
+            plan: Compiled schema to convert values to their declared types
+                (types are inferred from the text without one)
+
+        Returns:
+            Dict: Extracted data
+        """
         result = {}
 
         for field, selector in selectors.items():
             try:
-                # Try CSS selector first
-                element = soup.select_one(selector)
+                css, attribute = self._parse_selector(selector)
+                element = root.select_one(css) if css else root
 
-                if element:
-                    # Extract text content
-                    text = element.get_text(strip=True)
+                if element is None:
+                    result[field] = None
+                    continue
 
-                    # Try to infer type and convert
-                    result[field] = self._infer_and_convert(text)
+                if attribute:
+                    value = element.get(attribute)
+                    if isinstance(value, list):
+                        value = " ".join(value)
                 else:
-                    result[field] = None
+                    value = element.get_text(strip=True)
+
+                if plan is not None:
+                    result[field] = plan.coerce(field, value)
+                else:
+                    # Try to infer type and convert
+                    result[field] = infer_value(value) if value else None
 
             except Exception as e:
                 logger.error(f"Selector extraction failed for {field}: {e}")
@@ -361,40 +1129,18 @@ class ExtractorAgent:
 
         return result
 
-    def _infer_and_convert(self, value: str) -> Any:
-        """Infer type and convert value"""
-        if not value:
-            return None
-
-        value = value.strip()
-
-        # Try int
-        try:
-            return int(value)
-        except ValueError:
-            pass
-
-        # Try float (including prices)
-        try:
-            # Remove currency symbols and commas
-            cleaned = value.replace('$', '').replace('€', '').replace(',', '')
-            return float(cleaned)
-        except ValueError:
-            pass
-
-        # Try boolean
-        if value.lower() in ['true', 'yes', 'on']:
-            return True
-        if value.lower() in ['false', 'no', 'off']:
-            return False
-
-        # Return as string
-        return value
+    def _parse_selector(self, selector: str) -> Tuple[str, Optional[str]]:
+        """Split 'css::attr(name)' / 'css::text' into (css, attribute)"""
+        match = re.match(r'^(.*?)::(?:attr\(([\w:-]+)\)|text)\s*$', selector.strip())
+        if match:
+            return match.group(1).strip(), match.group(2)
+        return selector.strip(), None
 
     async def generate_selectors(
         self,
         html: str,
-        schema: Dict[str, FieldDefinition]
+        schema: Dict[str, FieldDefinition],
+        relative: bool = False
     ) -> Dict[str, str]:
         """
         Generate CSS selectors for schema using DeepSeek-Coder
@@ -402,46 +1148,31 @@ class ExtractorAgent:
         Args:
             html: HTML content
             schema: Extraction schema
+            relative: HTML is one repeated item; selectors are applied inside each item
 
         Returns:
             Dict: field -> CSS selector
         """
         logger.info("Generating CSS selectors with DeepSeek-Coder")
 
-        # Build prompt for selector generation
-        schema_json = {
-            field: defn.description
-            for field, defn in schema.items()
-        }
-
-        prompt = f"""You are an expert at analyzing HTML and generating CSS selectors.
-
-**Task:** Generate CSS selectors for each field in the schema below.
-
-**Schema:**
-```json
-{json.dumps(schema_json, indent=2)}
-```
-
-**HTML:**
-```html
-{html[:5000]}
-```
-
-**Instructions:**
-- For each field, provide a CSS selector that uniquely identifies the element
-- Prefer class/id selectors over complex paths
-- Ensure selectors are robust to minor HTML changes
+        scope_note = ""
+        if relative:
+            scope_note = (
+                "\n- The HTML is ONE repeated item; selectors are applied inside every item, "
+                "so they must be relative to it (do not include the item element itself)"
+            )
 
-**Output Format (JSON only):**
-{{
-  "field_name": "css-selector"
-}}
-"""
+        prompt = prompt_registry.render(
+            "selector_generation",
+            schema=schema,
+            options={"scope_note": scope_note},
+            html=html[:5000]
+        )
 
         try:
             response = await llm_service.complete(
-                prompt=prompt,
+                prompt=prompt.user,
+                system_message=prompt.system,
                 model=LLMProvider.DEEPSEEK_CODER,
                 temperature=0,
                 response_format={"type": "json_object"}
@@ -4,15 +4,26 @@ Validator Agent - Data quality validation and verification
 import json
 import logging
 import re
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+
+from bs4 import BeautifulSoup
 
 from ..models.scraping import (
-    FieldDefinition, ValidationResult, ValidationError, RetryStrategy, ScrapingStrategy
+    FieldDefinition, ExtractionResult, ValidationResult, ValidationError,
+    RetryStrategy, ScrapingStrategy
 )
 from ..models.base import ScrapingEngine
 from ..services.llm_service import llm_service, LLMProvider
+from ..services.field_stats import field_stats
+from ..services.decision_cache import decision_cache
+from ..utils.request_context import DeadlineExceeded
+from ..utils.schema_compiler import schema_compiler
+from ..prompts.registry import prompt_registry
 from ..config.settings import settings
 
+if TYPE_CHECKING:
+    from ..utils.batch_validation import BatchValidationResult
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,13 +37,23 @@ class ValidatorAgent:
     """
 
     def __init__(self):
-        pass
+        self.stats = {
+            "pages": 0,
+            "llm_pages": 0,
+            "fields_deterministic": 0,
+            "fields_evidence": 0,
+            "fields_statistics": 0,
+            "fields_llm": 0,
+            "fields_scored": 0,
+        }
 
     async def validate(
         self,
         data: Dict[str, Any],
         schema: Dict[str, FieldDefinition],
-        html: Optional[str] = None
+        html: Optional[str] = None,
+        extraction: Optional[ExtractionResult] = None,
+        domain: Optional[str] = None
     ) -> ValidationResult:
         """
         Comprehensive validation of extracted data
@@ -41,6 +62,9 @@ class ValidatorAgent:
             data: Extracted data
             schema: Expected schema
             html: Original HTML (optional, for consistency checking)
+            extraction: Scored extraction; its confidences and evidence
+                replace the LLM consistency check
+            domain: Source domain, for checks against its field statistics
 
         Returns:
             ValidationResult: Validation results
@@ -51,39 +75,34 @@ class ValidatorAgent:
         warnings = []
         confidence_scores = {}
 
-        # 1. Schema validation
-        schema_errors, schema_warnings = self._validate_schema(data, schema)
-        errors.extend(schema_errors)
-        warnings.extend(schema_warnings)
-
-        # 2. Business logic validation
-        logic_errors, logic_warnings = self._validate_business_logic(data, schema)
-        errors.extend(logic_errors)
-        warnings.extend(logic_warnings)
-
-        # 3. Consistency check with LLM (if HTML provided)
-        if html and settings.feature_deepseek_primary:
-            try:
-                llm_result = await self._validate_with_llm(data, html, schema)
-                confidence_scores = llm_result.get("confidence_scores", {})
-
-                # Add any issues found by LLM
-                for field, result in llm_result.get("fields", {}).items():
-                    if not result.get("appears_in_html", True):
-                        errors.append(ValidationError(
-                            field=field,
-                            error_type="consistency",
-                            message=f"Value not found in HTML: {data.get(field)}",
-                            value=data.get(field)
-                        ))
-
-                    for issue in result.get("issues", []):
-                        warnings.append(f"{field}: {issue}")
-
-            except Exception as e:
-                logger.error(f"LLM validation failed: {e}")
-                # Assign default confidence
-                confidence_scores = {field: 0.5 for field in data.keys()}
+        # 1-2. Schema and business logic validation (plan compiled once per schema)
+        check_errors, check_warnings = schema_compiler.compile(schema).validate(data)
+        errors.extend(check_errors)
+        warnings.extend(check_warnings)
+
+        # 3. Consistency check: scored extraction, else tiered / LLM (if HTML provided)
+        self.stats["pages"] += 1
+        if extraction is not None and extraction.scored:
+            evidence_errors, confidence_scores = self._validate_evidence(data, html, extraction)
+            errors.extend(evidence_errors)
+            self.stats["fields_scored"] += len(confidence_scores)
+
+        elif html and settings.feature_deepseek_primary and settings.validation_tiered:
+            tier_errors, tier_warnings, confidence_scores = await self._validate_tiered(
+                data, html, schema, errors, domain
+            )
+            errors.extend(tier_errors)
+            warnings.extend(tier_warnings)
+
+        elif html and settings.feature_deepseek_primary:
+            llm_errors, llm_warnings, confidence_scores = await self._validate_consistency_with_llm(
+                data, html, schema
+            )
+            errors.extend(llm_errors)
+            warnings.extend(llm_warnings)
+            self.stats["llm_pages"] += 1
+            self.stats["fields_llm"] += len(data)
+
         else:
             # Assign default confidence if no LLM check
             confidence_scores = {field: 0.7 for field in data.keys() if data.get(field) is not None}
@@ -97,6 +116,9 @@ class ValidatorAgent:
         # Determine if valid
         is_valid = len(errors) == 0
 
+        if is_valid and domain and settings.field_stats_enabled:
+            field_stats.update(domain, data)
+
         return ValidationResult(
             valid=is_valid,
             errors=errors,
@@ -105,167 +127,307 @@ class ValidatorAgent:
             overall_confidence=overall_confidence
         )
 
-    def _validate_schema(
+    async def validate_items(
         self,
-        data: Dict[str, Any],
+        items: List[Dict[str, Any]],
         schema: Dict[str, FieldDefinition]
-    ) -> tuple[List[ValidationError], List[str]]:
+    ) -> ValidationResult:
         """
-        Validate data against schema
+        Validate records extracted in list mode
+
+        Items get the deterministic schema and business checks only; the
+        per-record LLM consistency check would cost one call per item.
+
+        Args:
+            items: Extracted items
+            schema: Schema of a single item
 
         Returns:
-            Tuple of (errors, warnings)
+            ValidationResult: Aggregated result, confidence = share of valid items
         """
+        logger.info(f"Validating {len(items)} items")
+
         errors = []
         warnings = []
+        valid_items = 0
 
-        # Check all schema fields
-        for field, defn in schema.items():
-            # Required field check
-            if defn.required and field not in data:
-                errors.append(ValidationError(
-                    field=field,
-                    error_type="missing_required",
-                    message=f"Required field '{field}' is missing",
-                    value=None
-                ))
-                continue
+        plan = schema_compiler.compile(schema)
 
-            # Field not in data
-            if field not in data:
-                continue
+        for index, item in enumerate(items):
+            item_errors, item_warnings = plan.validate(item)
+            if not item_errors:
+                valid_items += 1
 
-            value = data[field]
+            errors.extend(
+                error.model_copy(update={"field": f"items[{index}].{error.field}"})
+                for error in item_errors
+            )
+            warnings.extend(f"items[{index}].{w}" for w in item_warnings)
 
-            # Null check for required fields
-            if defn.required and value is None:
-                errors.append(ValidationError(
-                    field=field,
-                    error_type="required_null",
-                    message=f"Required field '{field}' is null",
-                    value=None
-                ))
-                continue
+        valid_ratio = valid_items / len(items) if items else 0.0
 
-            # Skip further validation for null optional fields
-            if value is None:
-                continue
+        return ValidationResult(
+            valid=bool(items) and valid_ratio >= settings.list_min_valid_ratio,
+            errors=errors,
+            warnings=warnings,
+            overall_confidence=valid_ratio
+        )
 
-            # Type validation
-            if not self._validate_type(value, defn.type):
-                errors.append(ValidationError(
-                    field=field,
-                    error_type="type_mismatch",
-                    message=f"Expected type {defn.type}, got {type(value).__name__}",
-                    value=value
-                ))
+    def validate_batch(
+        self,
+        columns: Dict[str, Any],
+        schema: Dict[str, FieldDefinition]
+    ) -> "BatchValidationResult":
+        """
+        Validate a columnar batch of records with vectorised checks
 
-            # Range validation (for numeric fields)
-            if defn.range and isinstance(value, (int, float)):
-                min_val, max_val = defn.range
-                if not (min_val <= value <= max_val):
-                    warnings.append(
-                        f"{field}: Value {value} out of range [{min_val}, {max_val}]"
-                    )
-
-            # Pattern validation (for strings)
-            if defn.pattern and isinstance(value, str):
-                if not re.match(defn.pattern, value):
-                    warnings.append(
-                        f"{field}: Value doesn't match pattern {defn.pattern}"
-                    )
-
-        return errors, warnings
-
-    def _validate_type(self, value: Any, expected_type: str) -> bool:
-        """Check if value matches expected type"""
-        type_map = {
-            "string": str,
-            "str": str,
-            "int": int,
-            "integer": int,
-            "float": (int, float),  # Allow int for float
-            "number": (int, float),
-            "bool": bool,
-            "boolean": bool,
-            "list": list,
-            "array": list,
-            "dict": dict,
-            "object": dict,
-        }
+        Runs the same schema and business checks as validate() without
+        building per-record error objects, e.g. to re-validate archived
+        results after a schema change. No LLM check is made.
+
+        Args:
+            columns: field -> NumPy/Arrow array or sequence (see columns_from_records)
+            schema: Schema of a single record
+
+        Returns:
+            BatchValidationResult: Per-row error and warning masks
+        """
+        from ..utils.batch_validation import validate_columns
+
+        return validate_columns(schema_compiler.compile(schema), columns)
+
+    async def _validate_tiered(
+        self,
+        data: Dict[str, Any],
+        html: str,
+        schema: Dict[str, FieldDefinition],
+        errors: List[ValidationError],
+        domain: Optional[str] = None
+    ) -> tuple[List[ValidationError], List[str], Dict[str, float]]:
+        """
+        Consistency check that escalates only uncertain fields to the LLM
+
+        Tier 1: null values and fields already failing deterministic checks
+        are settled without further checks.
+        Tier 2: values found literally in the page text are accepted, unless
+        they are outliers for the domain.
+        Tier 3: values typical of the domain's field statistics are accepted.
+        Tier 4: remaining fields and outliers are sent to the LLM validator.
+
+        Args:
+            data: Extracted data
+            html: Original HTML
+            schema: Schema
+            errors: Errors from the deterministic checks
+            domain: Source domain
+
+        Returns:
+            Tuple of (errors, warnings, confidence_scores)
+        """
+        failed = {error.field for error in errors}
+        page_text = self._normalize_text(self._page_text(html))
+        statistics = (
+            field_stats.check(domain, data) if domain and settings.field_stats_enabled else {}
+        )
 
-        expected = type_map.get(expected_type.lower())
-        if expected is None:
-            # Unknown type, skip validation
-            return True
+        warnings = []
+        confidence_scores = {}
+        uncertain = {}
+
+        for field, value in data.items():
+            anomaly = statistics.get(field)
+            if anomaly:
+                warnings.append(f"{field}: {anomaly}")
+
+            if value is None or field in failed:
+                if field in failed:
+                    confidence_scores[field] = 0.3
+                self.stats["fields_deterministic"] += 1
+            elif anomaly:
+                uncertain[field] = value
+            elif self._value_in_text(value, page_text):
+                confidence_scores[field] = settings.validation_evidence_confidence
+                self.stats["fields_evidence"] += 1
+            elif field in statistics:
+                confidence_scores[field] = settings.field_stats_confidence
+                self.stats["fields_statistics"] += 1
+            else:
+                uncertain[field] = value
+
+        if not uncertain:
+            return [], warnings, confidence_scores
+
+        logger.info(f"Escalating {len(uncertain)} uncertain fields to LLM validation")
+        self.stats["llm_pages"] += 1
+        self.stats["fields_llm"] += len(uncertain)
+
+        llm_errors, llm_warnings, llm_scores = await self._validate_consistency_with_llm(
+            uncertain, html, {field: schema[field] for field in uncertain if field in schema}
+        )
+        confidence_scores.update(
+            {field: score for field, score in llm_scores.items() if field in uncertain}
+        )
 
-        return isinstance(value, expected)
+        return llm_errors, warnings + llm_warnings, confidence_scores
 
-    def _validate_business_logic(
+    async def _validate_consistency_with_llm(
         self,
         data: Dict[str, Any],
+        html: str,
         schema: Dict[str, FieldDefinition]
-    ) -> tuple[List[ValidationError], List[str]]:
+    ) -> tuple[List[ValidationError], List[str], Dict[str, float]]:
         """
-        Validate business logic rules
+        Run the LLM consistency check and convert its findings
 
         Returns:
-            Tuple of (errors, warnings)
+            Tuple of (errors, warnings, confidence_scores)
         """
         errors = []
         warnings = []
 
-        # Price validation
-        if "price" in data and data["price"] is not None:
-            price = data["price"]
-            if isinstance(price, (int, float)):
-                if price <= 0:
+        try:
+            llm_result = await self._validate_with_llm(data, html, schema)
+            confidence_scores = llm_result.get("confidence_scores", {})
+
+            # Add any issues found by LLM
+            for field, result in llm_result.get("fields", {}).items():
+                if not result.get("appears_in_html", True):
                     errors.append(ValidationError(
-                        field="price",
-                        error_type="invalid_value",
-                        message=f"Price must be positive, got {price}",
-                        value=price
+                        field=field,
+                        error_type="consistency",
+                        message=f"Value not found in HTML: {data.get(field)}",
+                        value=data.get(field)
                     ))
-                elif price > 1000000:
-                    warnings.append(f"Unusually high price: {price}")
-
-        # Discount price vs regular price
-        if "price" in data and "discount_price" in data:
-            price = data.get("price")
-            discount_price = data.get("discount_price")
-
-            if price and discount_price:
-                if isinstance(price, (int, float)) and isinstance(discount_price, (int, float)):
-                    if discount_price >= price:
-                        warnings.append(
-                            f"Discount price ({discount_price}) should be less than "
-                            f"regular price ({price})"
-                        )
-
-        # Rating validation
-        if "rating" in data and data["rating"] is not None:
-            rating = data["rating"]
-            if isinstance(rating, (int, float)):
-                if not (0 <= rating <= 5):
-                    warnings.append(f"Rating out of typical range [0-5]: {rating}")
-
-        # URL validation
-        for field in data:
-            if "url" in field.lower() and data[field]:
-                url = data[field]
-                if isinstance(url, str):
-                    if not (url.startswith("http://") or url.startswith("https://")):
-                        warnings.append(f"{field}: URL doesn't start with http(s): {url}")
-
-        # Email validation (basic)
-        for field in data:
-            if "email" in field.lower() and data[field]:
-                email = data[field]
-                if isinstance(email, str):
-                    if not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
-                        warnings.append(f"{field}: Invalid email format: {email}")
-
-        return errors, warnings
+
+                for issue in result.get("issues", []):
+                    warnings.append(f"{field}: {issue}")
+
+        except DeadlineExceeded:
+            # Out of time: keep the deterministic result, as without an LLM check
+            logger.warning("Skipping LLM validation, request deadline reached")
+            confidence_scores = {field: 0.7 for field in data.keys() if data.get(field) is not None}
+
+        except Exception as e:
+            logger.error(f"LLM validation failed: {e}")
+            # Assign default confidence
+            confidence_scores = {field: 0.5 for field in data.keys()}
+
+        return errors, warnings, confidence_scores
+
+    def _value_in_text(self, value: Any, page_text: str) -> bool:
+        """
+        Whether a value literally appears in normalized page text
+
+        Numbers match common renderings (1299.5 → "1299.50", "1,299.50",
+        "1.299,50") but not as part of a longer number. Booleans and
+        objects are never conclusive.
+        """
+        if isinstance(value, bool) or isinstance(value, dict):
+            return False
+
+        if isinstance(value, list):
+            return bool(value) and all(self._value_in_text(item, page_text) for item in value)
+
+        if isinstance(value, (int, float)):
+            for rendering in self._number_renderings(value):
+                pattern = rf"(?<![\d.,]){re.escape(rendering)}(?![\d]|[.,]\d)"
+                if re.search(pattern, page_text):
+                    return True
+            return False
+
+        text = self._normalize_text(str(value))
+        return bool(text) and text in page_text
+
+    def _number_renderings(self, value: float) -> List[str]:
+        """Common textual renderings of a number"""
+        renderings = set()
+        if float(value).is_integer():
+            renderings.add(str(int(value)))
+            renderings.add(f"{int(value):,}")
+        else:
+            renderings.add(repr(float(value)))
+
+        two_decimals = f"{value:,.2f}"
+        renderings.add(two_decimals)
+        renderings.add(two_decimals.replace(",", ""))
+        # European format: 1.299,50
+        renderings.add(two_decimals.replace(",", " ").replace(".", ",").replace(" ", "."))
+
+        return sorted(renderings)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Validation tier statistics"""
+        fields_total = (
+            self.stats["fields_deterministic"] + self.stats["fields_evidence"]
+            + self.stats["fields_statistics"] + self.stats["fields_llm"]
+            + self.stats["fields_scored"]
+        )
+        return {
+            **self.stats,
+            "llm_page_rate": (
+                self.stats["llm_pages"] / self.stats["pages"] if self.stats["pages"] else 0.0
+            ),
+            "tier_hit_rates": {
+                tier: (self.stats[f"fields_{tier}"] / fields_total if fields_total else 0.0)
+                for tier in ("deterministic", "evidence", "statistics", "llm", "scored")
+            },
+        }
+
+    def _validate_evidence(
+        self,
+        data: Dict[str, Any],
+        html: Optional[str],
+        extraction: ExtractionResult
+    ) -> tuple[List[ValidationError], Dict[str, float]]:
+        """
+        Check a scored extraction's evidence against the page text
+
+        A value whose evidence snippet does not occur in the page is treated
+        like a value the LLM validator could not find in the HTML. Values
+        without evidence keep at most a neutral confidence.
+
+        Returns:
+            Tuple of (errors, confidence_scores)
+        """
+        errors = []
+        confidence_scores = {}
+        page_text = self._normalize_text(self._page_text(html)) if html else None
+
+        for field, value in data.items():
+            confidence = extraction.confidence_scores.get(field, 0.5)
+            if value is None:
+                confidence_scores[field] = confidence
+                continue
+
+            evidence = extraction.evidence.get(field)
+            if not evidence:
+                confidence = min(confidence, 0.5)
+            elif page_text is not None and self._normalize_text(evidence) not in page_text:
+                confidence = min(confidence, 0.3)
+                errors.append(ValidationError(
+                    field=field,
+                    error_type="consistency",
+                    message=f"Evidence not found in HTML: {evidence[:100]}",
+                    value=value
+                ))
+
+            confidence_scores[field] = confidence
+
+        return errors, confidence_scores
+
+    def _page_text(self, html: str) -> str:
+        """Visible text of a page"""
+        try:
+            soup = BeautifulSoup(html, 'lxml')
+            for tag in soup(['script', 'style']):
+                tag.decompose()
+            return soup.get_text(" ")
+        except Exception:
+            return html
+
+    def _normalize_text(self, text: str) -> str:
+        """Lowercase and collapse whitespace for substring matching"""
+        return re.sub(r'\s+', ' ', text).strip().lower()
 
     async def _validate_with_llm(
         self,
@@ -285,7 +447,6 @@ class ValidatorAgent:
             Dict: Validation results from LLM
         """
         # Clean HTML
-        from bs4 import BeautifulSoup
         try:
             soup = BeautifulSoup(html, 'lxml')
             # Remove scripts and styles
@@ -295,39 +456,16 @@ class ValidatorAgent:
         except:
             html_cleaned = html[:3000]
 
-        prompt = f"""You are a data validation expert.
-
-**Extracted Data:**
-```json
-{json.dumps(data, indent=2)}
-```
-
-**HTML Source (truncated):**
-```html
-{html_cleaned}
-```
-
-**Task:**
-Validate the extracted data against the HTML:
-1. Check if each value appears in the HTML
-2. Assign confidence score (0-1) for each field
-3. Flag any suspicious or incorrect values
-
-**Output (JSON only):**
-{{
-  "fields": {{
-    "field_name": {{
-      "confidence": 0.95,
-      "appears_in_html": true,
-      "issues": []
-    }}
-  }}
-}}
-"""
+        prompt = prompt_registry.render(
+            "validation",
+            data=json.dumps(data, indent=2, default=str),
+            html=html_cleaned
+        )
 
         try:
             response = await llm_service.complete(
-                prompt=prompt,
+                prompt=prompt.user,
+                system_message=prompt.system,
                 model=LLMProvider.DEEPSEEK_V3,
                 temperature=0,
                 response_format={"type": "json_object"}
@@ -351,10 +489,40 @@ Validate the extracted data against the HTML:
                 "confidence_scores": {field: 0.5 for field in data.keys()}
             }
 
+    def get_failed_fields(
+        self,
+        validation_result: ValidationResult,
+        schema: Dict[str, FieldDefinition],
+        min_confidence: float = 0.6
+    ) -> Dict[str, str]:
+        """
+        Fields that failed validation or scored low confidence
+
+        Args:
+            validation_result: Validation results
+            schema: Extraction schema
+            min_confidence: Fields scored below this are considered failed
+
+        Returns:
+            Dict: field -> reason, in schema order
+        """
+        reasons: Dict[str, str] = {}
+
+        for error in validation_result.errors:
+            if error.field in schema and error.field not in reasons:
+                reasons[error.field] = error.message
+
+        for field, confidence in validation_result.confidence_scores.items():
+            if field in schema and field not in reasons and confidence < min_confidence:
+                reasons[field] = f"Low confidence ({confidence:.2f})"
+
+        return {field: reasons[field] for field in schema if field in reasons}
+
     async def suggest_retry_strategy(
         self,
         validation_result: ValidationResult,
-        current_strategy: ScrapingStrategy
+        current_strategy: ScrapingStrategy,
+        domain: Optional[str] = None
     ) -> Optional[RetryStrategy]:
         """
         Suggest retry strategy based on validation results
@@ -362,6 +530,8 @@ Validate the extracted data against the HTML:
         Args:
             validation_result: Validation results
             current_strategy: Current scraping strategy
+            domain: Source domain; the decision is memoized per domain and
+                failure signature and re-ranked by recorded outcomes
 
         Returns:
             RetryStrategy or None if no retry needed
@@ -370,13 +540,59 @@ Validate the extracted data against the HTML:
             # No retry needed
             return None
 
+        key = None
+        if domain and settings.decision_cache_enabled:
+            key = decision_cache.key(
+                domain,
+                self._failure_signature(validation_result),
+                current_strategy.engine.value
+            )
+            cached = decision_cache.get(key)
+            if cached:
+                return cached[0].model_copy(update={"decision_key": key})
+
+        candidates: Dict[str, RetryStrategy] = {}
+        for strategy in self._candidate_strategies(validation_result, current_strategy):
+            candidates.setdefault(strategy.action, strategy)
+
+        if key:
+            decision_cache.put(key, candidates)
+
+        strategy = next(iter(candidates.values()))
+        return strategy.model_copy(update={"decision_key": key}) if key else strategy
+
+    def record_retry_outcome(self, strategy: RetryStrategy, success: bool):
+        """
+        Record whether a suggested retry strategy fixed the page
+
+        Args:
+            strategy: Strategy returned by suggest_retry_strategy
+            success: Whether validation passed after applying it
+        """
+        if strategy.decision_key:
+            decision_cache.record(strategy.decision_key, strategy.action, success)
+
+    def _failure_signature(self, validation_result: ValidationResult) -> str:
+        """Error types and confidence band identifying how a page failed"""
+        error_types = ",".join(sorted({e.error_type for e in validation_result.errors}))
+        band = "low" if validation_result.overall_confidence < 0.6 else "ok"
+        return f"{error_types or 'none'}:{band}"
+
+    def _candidate_strategies(
+        self,
+        validation_result: ValidationResult,
+        current_strategy: ScrapingStrategy
+    ) -> List[RetryStrategy]:
+        """Applicable retry strategies, most specific first"""
+        candidates = []
+
         # Low confidence → try different extraction method
         if validation_result.overall_confidence < 0.6:
-            return RetryStrategy(
+            candidates.append(RetryStrategy(
                 action="switch_extraction_method",
                 reason=f"Low confidence ({validation_result.overall_confidence:.2f})",
                 modifications={"use_stricter_prompt": True}
-            )
+            ))
 
         # Missing required fields → try different engine
         missing_required = any(
@@ -391,11 +607,11 @@ Validate the extracted data against the HTML:
                 else ScrapingEngine.SCRAPY
             )
 
-            return RetryStrategy(
+            candidates.append(RetryStrategy(
                 action="switch_engine",
                 reason="Missing required fields",
                 new_engine=new_engine
-            )
+            ))
 
         # Type errors → re-extract with stricter prompt
         type_errors = any(
@@ -404,7 +620,7 @@ Validate the extracted data against the HTML:
         )
 
         if type_errors:
-            return RetryStrategy(
+            candidates.append(RetryStrategy(
                 action="re_extract",
                 reason="Type validation failed",
                 modifications={
@@ -412,7 +628,7 @@ Validate the extracted data against the HTML:
                     "stricter_prompt": True,
                     "add_examples": True
                 }
-            )
+            ))
 
         # Consistency issues → retry with delay
         consistency_errors = any(
@@ -421,17 +637,19 @@ Validate the extracted data against the HTML:
         )
 
         if consistency_errors:
-            return RetryStrategy(
+            candidates.append(RetryStrategy(
                 action="retry",
                 reason="Consistency validation failed",
                 modifications={"wait_time": 5}
-            )
+            ))
 
         # General retry
-        return RetryStrategy(
+        candidates.append(RetryStrategy(
             action="retry",
             reason="Validation failed"
-        )
+        ))
+
+        return candidates
 
 
 # Global instance
@@ -143,6 +143,7 @@ async def scrape_endpoint(request: ScrapeRequest):
                 data={
                     "url": result.url,
                     "data": result.data,
+                    "items": result.items,
                     "execution_time": result.execution_time,
                     "retry_count": result.retry_count,
                     "screenshot": result.screenshot_path
@@ -206,6 +207,7 @@ async def batch_scrape_endpoint(requests: list[ScrapeRequest]):
                     "success": result.status.value == "completed",
                     "url": result.url,
                     "data": result.data,
+                    "items": result.items,
                     "execution_time": result.execution_time,
                     "error": result.error
                 })
@@ -281,10 +283,21 @@ async def get_status():
     """
     from ..services.llm_service import llm_service
     from ..services.proxy_service import proxy_pool
+    from ..services.extraction_cache import extraction_cache
+    from ..agents.validator import validator_agent
+    from ..utils.schema_compiler import schema_compiler
+    from ..services.field_stats import field_stats
+    from ..services.decision_cache import decision_cache
+    from ..services.tactic_bandit import tactic_bandit
+    from ..services.domain_breaker import domain_breakers
+    from ..services.domain_backoff import domain_backoff
+    from ..services.content_gate import content_gate
 
     try:
         # Get LLM metrics
         llm_metrics = llm_service.metrics.get_summary()
+        llm_metrics["rate_limits"] = llm_service.get_rate_limit_stats()
+        llm_metrics["routing"] = llm_service.router.get_stats()
 
         # Get proxy stats
         proxy_stats = proxy_pool.get_stats()
@@ -295,6 +308,19 @@ async def get_status():
             "environment": settings.environment,
             "llm_metrics": llm_metrics,
             "proxy_stats": proxy_stats,
+            "extraction_cache": extraction_cache.get_stats(),
+            "validation": validator_agent.get_stats(),
+            "schema_compiler": schema_compiler.get_stats(),
+            "field_stats": field_stats.get_stats(),
+            "decision_cache": decision_cache.get_stats(),
+            "tactic_bandit": tactic_bandit.get_stats(),
+            "domain_breakers": domain_breakers.get_stats(),
+            "domain_backoff": domain_backoff.get_stats(),
+            "content_gate": content_gate.get_stats(),
+            "coalescing": {
+                "llm": llm_service.singleflight.get_stats(),
+                "fetch": scraping_workflow.fetch_singleflight.get_stats(),
+            },
             "features": {
                 "deepseek_primary": settings.feature_deepseek_primary,
                 "gpt4_fallback": settings.feature_gpt4_fallback,
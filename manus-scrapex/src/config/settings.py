@@ -35,6 +35,42 @@ class Settings(BaseSettings):
     openai_api_key: Optional[str] = None
     anthropic_api_key: Optional[str] = None
 
+    # LLM Key Pools (comma-separated, used in addition to the single keys above)
+    deepseek_api_keys: Optional[str] = None
+    openai_api_keys: Optional[str] = None
+    llm_key_rate_limit_quarantine: int = 60
+    llm_key_auth_quarantine: int = 3600
+
+    # LLM Rate Limits (per API key, 0 = unlimited)
+    deepseek_rpm_limit: int = 600
+    deepseek_tpm_limit: int = 2000000
+    openai_rpm_limit: int = 500
+    openai_tpm_limit: int = 300000
+    llm_max_concurrency: int = 32
+
+    # LLM Retries (only rate limits, timeouts, connection errors and 5xx)
+    llm_retry_attempts: int = 3
+    llm_retry_base_delay: float = 2.0
+    llm_retry_max_delay: float = 10.0
+    llm_request_timeout: int = 60
+
+    # LLM Routing (hedge to the fallback model after the primary's p95 latency)
+    llm_hedge_enabled: bool = True
+    llm_hedge_percentile: float = 0.95
+    llm_hedge_min_samples: int = 20
+    llm_hedge_default_delay: float = 8.0
+    llm_hedge_min_delay: float = 1.0
+    llm_latency_window: int = 200
+    llm_circuit_failure_threshold: int = 5
+    llm_circuit_recovery_timeout: int = 30
+
+    # LLM Response Cache
+    llm_cache_enabled: bool = True
+    llm_cache_backend: str = "memory"  # memory, disk, redis
+    llm_cache_max_entries: int = 5000
+    llm_cache_ttl: int = 86400
+    llm_cache_max_temperature: float = 0.0
+
     # PostgreSQL
     postgres_host: str = "localhost"
     postgres_port: int = 5432
@@ -118,8 +154,86 @@ class Settings(BaseSettings):
     # Performance
     max_concurrent_requests: int = 100
     request_timeout: int = 30
+    request_deadline: int = 120
+    retry_min_remaining: float = 5.0
     browser_pool_size: int = 10
     cache_ttl: int = 3600
+    cache_path: str = "./cache/scrapex.sqlite3"
+
+    # Extraction
+    extraction_streaming: bool = False
+    extraction_scoring: bool = False
+    extraction_chunk_tokens: int = 2500
+    extraction_chunk_overlap_tokens: int = 200
+    extraction_max_parallel_chunks: int = 4
+    extraction_max_chunks: int = 20
+    list_min_repeats: int = 3
+    list_min_valid_ratio: float = 0.8
+    reextraction_context_chars: int = 4000
+
+    # Extraction Cache
+    extraction_cache_enabled: bool = True
+    extraction_cache_backend: str = "memory"  # memory, disk, redis
+    extraction_cache_max_entries: int = 10000
+    extraction_cache_ttl: int = 604800
+    extraction_cache_simhash_distance: int = 3
+
+    # Validation (tiered: deterministic → value in page text → LLM)
+    validation_tiered: bool = True
+    validation_evidence_confidence: float = 0.9
+
+    # Field Statistics (per-domain outlier detection for extracted values)
+    field_stats_enabled: bool = True
+    field_stats_min_samples: int = 30
+    field_stats_iqr_multiplier: float = 3.0
+    field_stats_max_categories: int = 50
+    field_stats_max_domains: int = 10000
+    field_stats_confidence: float = 0.8
+
+    # Decision Cache (retry / evasion decisions per domain and failure signature)
+    decision_cache_enabled: bool = True
+    decision_cache_ttl: int = 900
+    decision_cache_max_entries: int = 10000
+
+    # Evasion Tactic Bandit (per-domain Thompson sampling)
+    tactic_bandit_enabled: bool = True
+    tactic_bandit_backend: str = "memory"  # memory, disk, redis (disk/redis survive restarts)
+    tactic_bandit_ttl: int = 2592000
+    tactic_bandit_proxy_cost: float = 5.0  # Seconds-equivalent cost of a residential proxy request
+
+    # Hedged Evasion (run the top tactics concurrently, first unblocked response wins)
+    evasion_hedging_enabled: bool = True
+    evasion_hedge_max_tactics: int = 3
+    evasion_hedge_max_parallel: int = 2
+    evasion_expensive_delay: float = 5.0
+
+    # Early Block Detection (decide from headers and the head of the body, abort the download)
+    early_block_detection_enabled: bool = True
+    early_block_sniff_bytes: int = 16384
+    early_block_min_confidence: float = 0.9
+
+    # Domain Circuit Breaker (stop sending requests to domains that stay blocked)
+    domain_breaker_enabled: bool = True
+    domain_breaker_block_rate: float = 0.8  # Share of unevaded blocks that opens the circuit
+    domain_breaker_window: int = 20
+    domain_breaker_min_requests: int = 5
+    domain_breaker_recovery_timeout: float = 120.0  # Seconds before a half-open probe
+    domain_breaker_max_park: float = 30.0  # Wait up to this long for the circuit instead of failing
+    domain_breaker_max_domains: int = 10000
+
+    # Domain Backoff (honour Retry-After / X-RateLimit-* before every request to a domain)
+    backoff_enabled: bool = True
+    backoff_backend: str = "memory"  # memory, disk, redis (use redis to share across workers)
+    backoff_default_delay: float = 30.0  # 429 without usable headers
+    backoff_max_delay: float = 600.0
+
+    # Content Gate (skip extraction for empty shells, soft 404s, consent walls, odd pages)
+    content_gate_enabled: bool = True
+    content_gate_min_text: int = 200  # Visible characters below which a page is an empty shell
+    content_gate_min_samples: int = 20  # Accepted pages before the domain baseline is used
+    content_gate_iqr_multiplier: float = 3.0
+    content_gate_template_distance: int = 12  # SimHash bits between distinct templates
+    content_gate_max_domains: int = 10000
 
     # Scraping Limits
     max_retries: int = 3
@@ -3,11 +3,16 @@ Playwright Engine - Dynamic content scraping with headless browser
 """
 import logging
 import asyncio
-from typing import Optional
+from typing import Optional, Dict
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 
 from ..models.scraping import ScrapingStrategy, ScrapeResult
 from ..models.base import TaskStatus
+from ..utils.request_context import time_budget, DeadlineExceeded
+from ..utils.block_detection import BlockVerdict, StreamingBlockDetector
+from ..utils.urls import get_domain
+from ..services.domain_backoff import domain_backoff
+from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -59,8 +64,11 @@ class PlaywrightEngine:
 
         context: Optional[BrowserContext] = None
         page: Optional[Page] = None
+        domain = get_domain(url)
+        via = strategy.proxy.host if strategy.proxy else None
 
         try:
+            await domain_backoff.wait(domain, via)
             browser = await self._get_browser()
 
             # Create context with realistic settings
@@ -96,16 +104,25 @@ class PlaywrightEngine:
             # Set extra headers
             await page.set_extra_http_headers(strategy.headers)
 
-            # Navigate to URL
+            # Navigate to URL; returns as soon as the response headers arrive
+            response = None
+            headers = {}
+            time_to_first_byte = None
             try:
                 response = await page.goto(
                     url,
-                    wait_until='networkidle' if strategy.javascript_enabled else 'domcontentloaded',
-                    timeout=strategy.timeout * 1000  # Convert to milliseconds
+                    wait_until='commit',
+                    # Convert to milliseconds
+                    timeout=time_budget(strategy.timeout, "page load") * 1000
                 )
 
                 if response:
                     status_code = response.status
+                    headers = await response.all_headers()
+                    await domain_backoff.note_response(domain, status_code, headers, via)
+                    timing = response.request.timing
+                    if timing.get("responseStart", -1) >= 0:
+                        time_to_first_byte = timing["responseStart"] / 1000
                 else:
                     status_code = 0
 
@@ -113,16 +130,7 @@ class PlaywrightEngine:
                 logger.error(f"Navigation failed: {e}")
                 status_code = 0
 
-            # Wait for additional time if specified
-            if strategy.wait_time > 0:
-                logger.debug(f"Waiting {strategy.wait_time}s for content to load")
-                await asyncio.sleep(strategy.wait_time)
-
-            # Wait for body to be present
-            try:
-                await page.wait_for_selector('body', timeout=10000)
-            except:
-                logger.warning("Body element not found")
+            block = await self._load_content(page, strategy, status_code, headers)
 
             # Get HTML content
             html = await page.content()
@@ -137,15 +145,19 @@ class PlaywrightEngine:
                 except Exception as e:
                     logger.error(f"Screenshot failed: {e}")
 
-            # Get title
-            title = await page.title()
-
             execution_time = time.time() - start_time
+            bytes_received = len(html.encode("utf-8"))
 
-            logger.info(
-                f"Playwright: Successfully scraped {url} in {execution_time:.2f}s "
-                f"(HTML size: {len(html)} bytes)"
-            )
+            if block:
+                logger.warning(
+                    f"Playwright: {block[0].value} detected for {url}, "
+                    f"skipped waiting for the page to load"
+                )
+            else:
+                logger.info(
+                    f"Playwright: Successfully scraped {url} in {execution_time:.2f}s "
+                    f"(HTML size: {bytes_received} bytes)"
+                )
 
             return ScrapeResult(
                 url=url,
@@ -156,9 +168,18 @@ class PlaywrightEngine:
                 error=None,
                 strategy_used=strategy,
                 execution_time=execution_time,
-                retry_count=0
+                retry_count=0,
+                status_code=status_code or None,
+                response_headers=headers,
+                time_to_first_byte=time_to_first_byte,
+                bytes_received=bytes_received,
+                aborted_early=block is not None
             )
 
+        except DeadlineExceeded:
+            # The backoff outlasts the request: not a fetch failure to retry
+            raise
+
         except asyncio.TimeoutError:
             execution_time = time.time() - start_time
             logger.error(f"Playwright: Timeout for {url}")
@@ -196,6 +217,64 @@ class PlaywrightEngine:
             if context:
                 await context.close()
 
+    async def _load_content(
+        self,
+        page: Page,
+        strategy: ScrapingStrategy,
+        status_code: int,
+        headers: Dict[str, str]
+    ) -> Optional[BlockVerdict]:
+        """
+        Wait for the page to load, unless it is already recognisable as a block page
+
+        The headers are checked on commit and the DOM once it is parsed, so
+        challenge pages skip network-idle and content waits.
+
+        Returns:
+            Block verdict if the load was cut short, else None
+        """
+        detector = None
+        if settings.early_block_detection_enabled and status_code:
+            detector = StreamingBlockDetector(
+                status_code,
+                headers,
+                sniff_bytes=settings.early_block_sniff_bytes,
+                min_confidence=settings.early_block_min_confidence
+            )
+            block = detector.check_headers()
+            if block:
+                return block
+
+        try:
+            await page.wait_for_load_state(
+                'domcontentloaded', timeout=time_budget(strategy.timeout, "page load") * 1000
+            )
+            if detector:
+                # A DOM of sniff_bytes or more is decided by feed itself
+                block = detector.feed((await page.content()).encode("utf-8")) or detector.finish()
+                if block:
+                    return block
+
+            if strategy.javascript_enabled:
+                await page.wait_for_load_state(
+                    'networkidle', timeout=time_budget(strategy.timeout, "page load") * 1000
+                )
+        except Exception as e:
+            logger.error(f"Navigation failed: {e}")
+
+        # Wait for additional time if specified
+        if strategy.wait_time > 0:
+            logger.debug(f"Waiting {strategy.wait_time}s for content to load")
+            await asyncio.sleep(time_budget(strategy.wait_time, "content wait"))
+
+        # Wait for body to be present
+        try:
+            await page.wait_for_selector('body', timeout=time_budget(10, "content wait") * 1000)
+        except:
+            logger.warning("Body element not found")
+
+        return None
+
     async def _apply_stealth(self, context: BrowserContext):
         """Apply stealth techniques to avoid detection"""
         # Add init scripts to hide automation
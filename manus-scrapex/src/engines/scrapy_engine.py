@@ -3,15 +3,46 @@ Scrapy Engine - Fast scraping for static sites
 """
 import logging
 import asyncio
-from typing import Optional, Dict, Any
+import codecs
+import re
+from typing import Optional, Tuple
 import aiohttp
-from bs4 import BeautifulSoup
 
 from ..models.scraping import ScrapingStrategy, ScrapeResult
 from ..models.base import TaskStatus
+from ..utils.request_context import time_budget, DeadlineExceeded
+from ..utils.block_detection import BlockVerdict, StreamingBlockDetector
+from ..utils.urls import get_domain
+from ..services.domain_backoff import domain_backoff
+from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.I)
+
+
+def decode_body(body: bytes, declared: Optional[str] = None) -> str:
+    """
+    Decode an HTML body, picking its encoding as a browser would
+
+    The charset from Content-Type, else a <meta> charset in the head of
+    the document, else UTF-8 if the body is valid UTF-8, else windows-1252
+    (what browsers assume for undeclared legacy pages).
+    """
+    match = META_CHARSET.search(body[:4096])
+    for encoding in (declared, match.group(1).decode("ascii") if match else None):
+        if not encoding:
+            continue
+        try:
+            return body.decode(codecs.lookup(encoding).name, errors="replace")
+        except LookupError:
+            continue
+
+    try:
+        return body.decode("utf-8")
+    except UnicodeDecodeError:
+        return body.decode("cp1252", errors="replace")
+
 
 class ScrapyEngine:
     """
@@ -48,13 +79,19 @@ class ScrapyEngine:
 
         logger.info(f"Scrapy: Scraping {url}")
 
+        domain = get_domain(url)
+        via = strategy.proxy.host if strategy.proxy else None
+
         try:
+            await domain_backoff.wait(domain, via)
+            # Time to first byte counts from the request, not the backoff wait
+            request_started = time.time()
             session = await self._get_session()
 
             # Build request kwargs
             kwargs = {
                 "headers": strategy.headers,
-                "timeout": aiohttp.ClientTimeout(total=strategy.timeout)
+                "timeout": aiohttp.ClientTimeout(total=time_budget(strategy.timeout, "fetch"))
             }
 
             # Add proxy if available
@@ -65,21 +102,25 @@ class ScrapyEngine:
             # Make request
             async with session.get(url, **kwargs) as response:
                 status_code = response.status
-                html = await response.text()
+                headers = dict(response.headers)
+                time_to_first_byte = time.time() - request_started
+                await domain_backoff.note_response(domain, status_code, headers, via)
 
                 # Check if successful
                 if status_code != 200:
                     logger.warning(f"Non-200 status code: {status_code}")
 
-                # Parse HTML
-                soup = BeautifulSoup(html, 'lxml')
-
-                # Extract basic info
-                title = soup.title.string if soup.title else ""
+                html, bytes_received, block = await self._read_body(response)
 
                 execution_time = time.time() - start_time
 
-                logger.info(f"Scrapy: Successfully scraped {url} in {execution_time:.2f}s")
+                if block:
+                    logger.warning(
+                        f"Scrapy: {block[0].value} detected for {url} after "
+                        f"{bytes_received} bytes, download aborted"
+                    )
+                else:
+                    logger.info(f"Scrapy: Successfully scraped {url} in {execution_time:.2f}s")
 
                 return ScrapeResult(
                     url=url,
@@ -90,9 +131,18 @@ class ScrapyEngine:
                     error=None,
                     strategy_used=strategy,
                     execution_time=execution_time,
-                    retry_count=0
+                    retry_count=0,
+                    status_code=status_code,
+                    response_headers=headers,
+                    time_to_first_byte=time_to_first_byte,
+                    bytes_received=bytes_received,
+                    aborted_early=block is not None
                 )
 
+        except DeadlineExceeded:
+            # The backoff outlasts the request: not a fetch failure to retry
+            raise
+
         except aiohttp.ClientError as e:
             execution_time = time.time() - start_time
             logger.error(f"Scrapy: HTTP error for {url}: {e}")
@@ -138,6 +188,46 @@ class ScrapyEngine:
                 retry_count=0
             )
 
+    async def _read_body(
+        self,
+        response: aiohttp.ClientResponse
+    ) -> Tuple[str, int, Optional[BlockVerdict]]:
+        """
+        Read the response body, stopping early if it is a block page
+
+        Returns:
+            Tuple of (html, bytes read, block verdict or None)
+        """
+        if not settings.early_block_detection_enabled:
+            body = await response.read()
+            return await response.text(), len(body), None
+
+        detector = StreamingBlockDetector(
+            response.status,
+            response.headers,
+            sniff_bytes=settings.early_block_sniff_bytes,
+            min_confidence=settings.early_block_min_confidence,
+            encoding=response.charset or "utf-8"
+        )
+
+        block = detector.check_headers()
+        if block:
+            # Challenge or rate-limit status: the body is not worth downloading
+            response.close()
+            return "", 0, block
+
+        chunks = []
+        received = 0
+        async for chunk in response.content.iter_chunked(8192):
+            chunks.append(chunk)
+            received += len(chunk)
+            block = detector.feed(chunk)
+            if block:
+                response.close()
+                return detector.prefix_text, received, block
+
+        return decode_body(b"".join(chunks), response.charset), received, None
+
     async def close(self):
         """Close session"""
         if self.session and not self.session.closed:
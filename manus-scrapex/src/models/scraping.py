@@ -20,7 +20,21 @@ class ScrapeRequest(BaseModel):
     """Request model for scraping"""
     url: HttpUrl = Field(..., description="URL to scrape")
     schema: Dict[str, FieldDefinition] = Field(..., description="Data extraction schema")
+    mode: str = Field(
+        default="single",
+        pattern="^(single|list)$",
+        description="'single' extracts one record, 'list' extracts every repeated item"
+    )
+    item_selector: Optional[str] = Field(
+        default=None,
+        description="CSS selector for repeated items in list mode (auto-detected if omitted)"
+    )
     priority: int = Field(default=1, ge=1, le=10, description="Task priority (1-10)")
+    deadline: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Total time budget in seconds (defaults to settings.request_deadline)"
+    )
     retry_count: int = Field(default=0, description="Current retry count")
     metadata: Optional[Dict[str, Any]] = Field(default=None, description="Additional metadata")
     options: Optional[Dict[str, Any]] = Field(
@@ -78,17 +92,30 @@ class URLAnalysis(BaseModel):
     is_spa: bool = False
 
 
-class ScrapeResult(BaseModel, TimestampMixin):
+class ScrapeResult(TimestampMixin):
     """Result of scraping operation"""
     url: str
     status: TaskStatus
     data: Optional[Dict[str, Any]] = None
+    items: Optional[List[Dict[str, Any]]] = None
     html: Optional[str] = None
     screenshot_path: Optional[str] = None
     error: Optional[str] = None
     strategy_used: Optional[ScrapingStrategy] = None
     execution_time: float = 0.0
     retry_count: int = 0
+    # Response metadata from the engine
+    status_code: Optional[int] = None
+    response_headers: Dict[str, str] = Field(default_factory=dict)
+    time_to_first_byte: Optional[float] = None
+    bytes_received: int = 0
+    aborted_early: bool = False  # Download stopped once the response looked like a block page
+
+    @field_validator('url', mode='before')
+    @classmethod
+    def url_as_string(cls, v: Any) -> Any:
+        """Accept the HttpUrl of a ScrapeRequest"""
+        return str(v) if v is not None else v
 
 
 class ValidationError(BaseModel):
@@ -110,6 +137,22 @@ class ValidationResult(BaseModel):
     suggestions: List[str] = Field(default_factory=list)
 
 
+class ExtractionResult(BaseModel):
+    """Result of data extraction with per-field confidence"""
+    data: Dict[str, Any] = Field(default_factory=dict)
+    confidence_scores: Dict[str, float] = Field(default_factory=dict)
+    evidence: Dict[str, Optional[str]] = Field(
+        default_factory=dict,
+        description="Verbatim page snippet supporting each value"
+    )
+    scored: bool = Field(
+        default=False,
+        description="Confidence and evidence were produced by the extraction call itself"
+    )
+    chunks_total: int = 1
+    chunks_processed: int = 1
+
+
 class BlockAnalysis(BaseModel):
     """Analysis of bot detection/blocking"""
     is_blocked: bool
@@ -135,3 +178,8 @@ class RetryStrategy(BaseModel):
     new_engine: Optional[ScrapingEngine] = None
     new_method: Optional[str] = None
     modifications: Optional[Dict[str, Any]] = None
+    decision_key: Optional[str] = Field(
+        default=None,
+        exclude=True,
+        description="Decision cache entry the strategy came from, for recording its outcome"
+    )
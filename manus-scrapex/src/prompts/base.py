@@ -0,0 +1,77 @@
+"""
+Prompt base - Templates split into a stable prefix and a variable suffix
+"""
+import json
+from typing import Any, Dict, NamedTuple
+
+from ..models.scraping import FieldDefinition
+
+
+class RenderedPrompt(NamedTuple):
+    """A prompt ready to send: system message first, user message second"""
+    system: str
+    user: str
+
+
+class PromptTemplate:
+    """
+    Prompt template for provider prompt caching
+
+    Providers cache the longest previously seen request prefix, so the
+    template is split in two:
+    - system: static instructions and the compiled schema. Rendered only
+      from the schema and static options, it is byte-identical for every
+      page extracted with the same schema.
+    - user: per-call values, with the page content last.
+
+    Both parts are str.format templates (literal braces doubled).
+    """
+
+    def __init__(self, name: str, system: str, user: str, schema_style: str = "plain"):
+        self.name = name
+        self.system = system
+        self.user = user
+        self.schema_style = schema_style
+
+    def render_system(self, schema: Dict[str, FieldDefinition], **options: Any) -> str:
+        """Render the static prefix"""
+        return self.system.format(schema=render_schema(schema, self.schema_style), **options)
+
+    def render_user(self, **variables: Any) -> str:
+        """Render the variable suffix"""
+        return self.user.format(**variables)
+
+
+def render_schema(schema: Dict[str, FieldDefinition], style: str = "plain") -> str:
+    """
+    Render a schema as prompt text
+
+    Args:
+        schema: Extraction schema
+        style: "plain" (field list), "examples" (field list with conversion
+            examples) or "json" (field -> description object)
+
+    Returns:
+        str: Deterministic schema text
+    """
+    if not schema:
+        return ""
+
+    if style == "json":
+        return json.dumps({field: defn.description for field, defn in schema.items()}, indent=2)
+
+    lines = []
+    for field, defn in schema.items():
+        line = f"- `{field}`: {defn.description} (type: {defn.type})"
+        if defn.required:
+            line += " **[REQUIRED]**"
+
+        if style == "examples":
+            if defn.type == "float" and "price" in field.lower():
+                line += "\n  Example: If HTML has \"$29.99\", extract 29.99"
+            elif defn.type == "int" and "rating" in field.lower():
+                line += "\n  Example: If HTML has \"4.5 stars\", extract 4.5"
+
+        lines.append(line)
+
+    return "\n".join(lines)
@@ -0,0 +1,98 @@
+"""
+Prompt Registry - Named prompt templates with cached static prefixes
+"""
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from ..models.scraping import FieldDefinition
+from .base import PromptTemplate, RenderedPrompt
+from .templates import TEMPLATES
+
+
+class PromptRegistry:
+    """
+    Registry of prompt templates
+
+    Static prefixes are compiled once per (template, schema, options) and
+    reused, so repeated requests with the same schema send byte-identical
+    system messages and hit the provider's prompt cache.
+    """
+
+    MAX_PREFIXES = 1000
+
+    def __init__(self):
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._prefixes: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+    def register(self, template: PromptTemplate):
+        """Add or replace a template"""
+        self._templates[template.name] = template
+        for key in [key for key in self._prefixes if key[0] == template.name]:
+            del self._prefixes[key]
+
+    def get(self, name: str) -> PromptTemplate:
+        """Get a template by name"""
+        if name not in self._templates:
+            raise KeyError(f"Unknown prompt template: {name}")
+        return self._templates[name]
+
+    def render(
+        self,
+        name: str,
+        schema: Optional[Dict[str, FieldDefinition]] = None,
+        options: Optional[Dict[str, Any]] = None,
+        **variables: Any
+    ) -> RenderedPrompt:
+        """
+        Render a prompt
+
+        Args:
+            name: Template name
+            schema: Schema compiled into the static prefix
+            options: Static template options (e.g. scope notes) for the prefix
+            **variables: Per-call values for the user message
+
+        Returns:
+            RenderedPrompt: (system, user)
+        """
+        template = self.get(name)
+        return RenderedPrompt(
+            system=self.prefix(template, schema or {}, options or {}),
+            user=template.render_user(**variables)
+        )
+
+    def prefix(
+        self,
+        template: PromptTemplate,
+        schema: Dict[str, FieldDefinition],
+        options: Dict[str, Any]
+    ) -> str:
+        """Compiled static prefix of a template for a schema"""
+        payload = json.dumps(
+            {
+                "schema": [[field, defn.model_dump()] for field, defn in schema.items()],
+                "options": options,
+            },
+            sort_keys=True,
+            default=str
+        )
+        key = (template.name, hashlib.sha256(payload.encode("utf-8")).hexdigest())
+
+        system = self._prefixes.get(key)
+        if system is None:
+            system = template.render_system(schema, **options)
+            self._prefixes[key] = system
+            while len(self._prefixes) > self.MAX_PREFIXES:
+                self._prefixes.popitem(last=False)
+        else:
+            self._prefixes.move_to_end(key)
+
+        return system
+
+
+# Global instance
+prompt_registry = PromptRegistry()
+for _template in TEMPLATES:
+    prompt_registry.register(_template)
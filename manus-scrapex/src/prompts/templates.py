@@ -0,0 +1,250 @@
+"""
+Prompt templates - Static instructions first, page content last
+"""
+from .base import PromptTemplate
+
+EXTRACTION = PromptTemplate(
+    name="extraction",
+    system=(
+        "You are a precise data extraction assistant. "
+        "Extract the following fields from the HTML the user sends."
+        """
+
+**Schema:**
+{schema}
+
+**Instructions:**
+1. Return ONLY valid JSON (no explanations, no markdown)
+2. Use `null` for missing fields
+3. Follow the exact field names specified
+4. Convert values to correct types:
+   - Prices: Remove currency symbols, convert to float (e.g., "$29.99" → 29.99)
+   - Numbers: Convert to int or float as appropriate
+   - Booleans: true/false
+   - Dates: Keep as strings in consistent format
+5. Extract clean, trimmed values without extra whitespace
+6. If multiple matches exist, use the most prominent/relevant one
+7. If the HTML is one part of a larger page, use `null` for fields that do not appear in that part
+"""
+    ),
+    user="""{part_note}**HTML:**
+```html
+{html}
+```"""
+)
+
+SCORED_EXTRACTION = PromptTemplate(
+    name="extraction_scored",
+    system=(
+        "You are a precise data extraction assistant. "
+        "Extract the following fields from the HTML the user sends "
+        "and rate how certain each value is."
+        """
+
+**Schema:**
+{schema}
+
+**Instructions:**
+1. Return ONLY valid JSON (no explanations, no markdown)
+2. Follow the exact field names specified, one object per field
+3. Convert values to correct types:
+   - Prices: Remove currency symbols, convert to float (e.g., "$29.99" → 29.99)
+   - Numbers: Convert to int or float as appropriate
+   - Booleans: true/false
+   - Dates: Keep as strings in consistent format
+4. "confidence": 0-1, how certain you are the value is correct for the field
+"""
+        "5. \"evidence\": the shortest verbatim snippet of the page's visible text "
+        "that contains the value (copied exactly, max 200 characters)\n"
+        "6. Use `null` value and evidence for missing fields, "
+        "with the confidence that the field is truly absent\n"
+        """
+**Output (JSON only):**
+{{
+  "field_name": {{"value": "...", "confidence": 0.95, "evidence": "verbatim text from the page"}}
+}}
+"""
+    ),
+    user="""**HTML:**
+```html
+{html}
+```"""
+)
+
+STRICT_EXTRACTION = PromptTemplate(
+    name="extraction_strict",
+    schema_style="examples",
+    system=(
+        "You are a precise data extraction system. "
+        "Your task is to extract structured data from the HTML the user sends."
+        """
+
+**CRITICAL RULES:**
+1. Output MUST be valid JSON only, starting with {{ immediately
+2. Use exact field names from schema
+3. Convert types correctly
+4. Use null for missing data
+5. No explanations, no markdown formatting
+
+**Schema to extract:**
+{schema}
+"""
+    ),
+    user="""**HTML Content:**
+```html
+{html}
+```"""
+)
+
+REEXTRACTION = PromptTemplate(
+    name="reextraction",
+    system=(
+        "You are a precise data extraction assistant. "
+        "A previous extraction of the fields below was rejected by validation. "
+        "Extract them again from the page fragments the user sends."
+        """
+
+**Fields:**
+{schema}
+
+**Instructions:**
+1. Return ONLY valid JSON with exactly these field names
+2. Use `null` if the field is not present
+3. Convert values to the stated types (prices as floats without currency symbols)
+"""
+    ),
+    user="""**Previously extracted values:**
+{previous}
+
+**Page fragments:**
+```html
+{html}
+```"""
+)
+
+LIST_EXTRACTION = PromptTemplate(
+    name="list_extraction",
+    system=(
+        "You are a precise data extraction assistant. "
+        "The HTML the user sends contains a list of repeated items "
+        "(e.g. products in a listing). Extract EVERY item."
+        """
+
+**Item Schema:**
+{schema}
+
+**Instructions:**
+1. Return ONLY valid JSON of the form {{"items": [{{...}}, ...]}}
+2. One object per item, in page order, using the exact field names
+3. Use `null` for fields missing from an item
+4. Convert prices to floats without currency symbols and numbers to int/float
+"""
+    ),
+    user="""**HTML:**
+```html
+{html}
+```"""
+)
+
+SELECTOR_GENERATION = PromptTemplate(
+    name="selector_generation",
+    schema_style="json",
+    system="""You are an expert at analyzing HTML and generating CSS selectors.
+
+**Task:** Generate CSS selectors for each field in the schema below, for the HTML the user sends.
+
+**Schema:**
+```json
+{schema}
+```
+
+**Instructions:**
+- For each field, provide a CSS selector that uniquely identifies the element
+- Prefer class/id selectors over complex paths
+- Ensure selectors are robust to minor HTML changes
+- Append `::attr(name)` to read an attribute (e.g. `a::attr(href)`, `img::attr(src)`){scope_note}
+
+**Output Format (JSON only):**
+{{
+  "field_name": "css-selector"
+}}
+""",
+    user="""**HTML:**
+```html
+{html}
+```"""
+)
+
+VALIDATION = PromptTemplate(
+    name="validation",
+    system="""You are a data validation expert.
+
+**Task:**
+Validate the extracted data the user sends against the HTML source:
+1. Check if each value appears in the HTML
+2. Assign confidence score (0-1) for each field
+3. Flag any suspicious or incorrect values
+
+**Output (JSON only):**
+{{
+  "fields": {{
+    "field_name": {{
+      "confidence": 0.95,
+      "appears_in_html": true,
+      "issues": []
+    }}
+  }}
+}}
+""",
+    user="""**Extracted Data:**
+```json
+{data}
+```
+
+**HTML Source (truncated):**
+```html
+{html}
+```"""
+)
+
+EVASION_TACTICS = PromptTemplate(
+    name="evasion_tactics",
+    system="""You are an anti-bot evasion expert.
+
+Task: Suggest the top 3 evasion tactics for the block type the user reports, ordered by priority.
+
+Output (JSON):
+{{
+  "tactics": [
+    {{
+      "tactic": "rotate_proxy|wait|stealth_browser|solve_captcha|change_headers",
+      "priority": 1,
+      "reasoning": "why this tactic would work",
+      "wait_time": 0
+    }}
+  ]
+}}
+""",
+    user="""Block Type Detected: {block_type}
+
+HTTP Headers:
+```json
+{headers}
+```
+
+HTML Sample:
+```html
+{html}
+```"""
+)
+
+TEMPLATES = [
+    EXTRACTION,
+    SCORED_EXTRACTION,
+    STRICT_EXTRACTION,
+    REEXTRACTION,
+    LIST_EXTRACTION,
+    SELECTOR_GENERATION,
+    VALIDATION,
+    EVASION_TACTICS,
+]
@@ -0,0 +1,305 @@
+"""
+Cache Service - Pluggable key/value cache backends (memory, disk, Redis)
+"""
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """
+    Base class for string key/value caches with TTL
+
+    Backends never raise on lookup failures; errors are logged and
+    treated as misses so a broken cache cannot break scraping.
+    """
+
+    def __init__(self, namespace: str, max_entries: int, ttl: Optional[int]):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        """Get value or None"""
+        raise NotImplementedError
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None):
+        """Store value (ttl overrides the backend default)"""
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        """Remove value"""
+        raise NotImplementedError
+
+    async def clear(self):
+        """Remove all values in this namespace"""
+        raise NotImplementedError
+
+    def _record(self, value: Optional[str]) -> Optional[str]:
+        """Count a lookup as hit or miss"""
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        total = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "namespace": self.namespace,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total > 0 else 0,
+        }
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache with TTL"""
+
+    def __init__(self, namespace: str, max_entries: int, ttl: Optional[int]):
+        super().__init__(namespace, max_entries, ttl)
+        self._entries: "OrderedDict[str, Tuple[Optional[float], str]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return self._record(None)
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._entries[key]
+            return self._record(None)
+
+        self._entries.move_to_end(key)
+        return self._record(value)
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None):
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.time() + ttl if ttl else None
+
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    async def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats["entries"] = len(self._entries)
+        return stats
+
+
+class DiskCacheBackend(CacheBackend):
+    """
+    SQLite-backed cache that survives restarts
+
+    Queries run in a worker thread. Entries beyond max_entries are evicted
+    least-recently-used first.
+    """
+
+    # Check the size cap once every N writes
+    EVICTION_INTERVAL = 100
+
+    def __init__(self, namespace: str, max_entries: int, ttl: Optional[int], path: str):
+        super().__init__(namespace, max_entries, ttl)
+        self.path = path
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "expires_at REAL, accessed_at REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            self._conn.commit()
+
+    def _get_sync(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND key = ?",
+                    (self.namespace, key)
+                )
+                self._conn.commit()
+                return None
+
+            self._conn.execute(
+                "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key)
+            )
+            self._conn.commit()
+            return value
+
+    def _set_sync(self, key: str, value: str, ttl: Optional[int]):
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, value, expires_at, now)
+            )
+
+            self._writes += 1
+            if self._writes % self.EVICTION_INTERVAL == 0:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND expires_at IS NOT NULL "
+                    "AND expires_at <= ?",
+                    (self.namespace, now)
+                )
+                self._conn.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND key IN ("
+                    "SELECT key FROM cache WHERE namespace = ? "
+                    "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.namespace, self.namespace, self.max_entries)
+                )
+
+            self._conn.commit()
+
+    def _delete_sync(self, key: Optional[str]):
+        with self._lock:
+            if key is None:
+                self._conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+            else:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND key = ?",
+                    (self.namespace, key)
+                )
+            self._conn.commit()
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            return self._record(await asyncio.to_thread(self._get_sync, key))
+        except Exception as e:
+            logger.error(f"Disk cache read failed: {e}")
+            return self._record(None)
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None):
+        try:
+            await asyncio.to_thread(
+                self._set_sync, key, value, ttl if ttl is not None else self.ttl
+            )
+        except Exception as e:
+            logger.error(f"Disk cache write failed: {e}")
+
+    async def delete(self, key: str):
+        try:
+            await asyncio.to_thread(self._delete_sync, key)
+        except Exception as e:
+            logger.error(f"Disk cache delete failed: {e}")
+
+    async def clear(self):
+        await asyncio.to_thread(self._delete_sync, None)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Redis-backed cache shared across workers
+
+    Size is bounded by TTL and the server's maxmemory policy.
+    """
+
+    def __init__(self, namespace: str, max_entries: int, ttl: Optional[int], url: str):
+        super().__init__(namespace, max_entries, ttl)
+        import redis.asyncio as aioredis
+
+        self.client = aioredis.from_url(url, decode_responses=True)
+
+    def _key(self, key: str) -> str:
+        return f"{settings.app_name}:{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            return self._record(await self.client.get(self._key(key)))
+        except Exception as e:
+            logger.error(f"Redis cache read failed: {e}")
+            return self._record(None)
+
+    async def set(self, key: str, value: str, ttl: Optional[int] = None):
+        ttl = ttl if ttl is not None else self.ttl
+        try:
+            await self.client.set(self._key(key), value, ex=ttl or None)
+        except Exception as e:
+            logger.error(f"Redis cache write failed: {e}")
+
+    async def delete(self, key: str):
+        try:
+            await self.client.delete(self._key(key))
+        except Exception as e:
+            logger.error(f"Redis cache delete failed: {e}")
+
+    async def clear(self):
+        async for key in self.client.scan_iter(match=self._key("*")):
+            await self.client.delete(key)
+
+
+def create_cache_backend(
+    backend: str,
+    namespace: str,
+    max_entries: int,
+    ttl: Optional[int],
+    path: Optional[str] = None
+) -> CacheBackend:
+    """
+    Create a cache backend by name
+
+    Args:
+        backend: "memory", "disk" or "redis"
+        namespace: Key namespace (keeps caches sharing a store apart)
+        max_entries: Size cap (memory and disk)
+        ttl: Default time-to-live in seconds (None/0 = no expiry)
+        path: SQLite file for the disk backend
+
+    Returns:
+        CacheBackend: Backend instance (memory if the requested one fails)
+    """
+    try:
+        if backend == "disk":
+            return DiskCacheBackend(namespace, max_entries, ttl, path or settings.cache_path)
+        if backend == "redis":
+            return RedisCacheBackend(namespace, max_entries, ttl, settings.redis_url)
+        if backend != "memory":
+            logger.warning(f"Unknown cache backend '{backend}', using memory")
+    except Exception as e:
+        logger.error(f"Failed to create {backend} cache backend: {e}. Using memory")
+
+    return MemoryCacheBackend(namespace, max_entries, ttl)
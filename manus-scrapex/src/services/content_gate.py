@@ -0,0 +1,317 @@
+"""
+Content Gate - Cheap pre-extraction check that a page is a content page
+"""
+import logging
+import math
+import re
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional
+
+import lxml.html
+from lxml import etree
+
+from ..models.scraping import FieldDefinition
+from ..utils.simhash import simhash, hamming_distance, word_shingles
+from ..config.settings import settings
+from .field_stats import QuartileSketch
+
+logger = logging.getLogger(__name__)
+
+SOFT_404_PATTERN = re.compile(
+    r"\b404\b|not found|(?:does not|doesn't|no longer) exist|no longer available|page unavailable",
+    re.I
+)
+CONSENT_PATTERN = re.compile(
+    r"accept (?:all )?cookies|cookie (?:consent|preferences|settings)|"
+    r"we value your privacy|manage (?:your )?consent",
+    re.I
+)
+# Words of consent banners, to tell a consent wall from a page that carries one
+CONSENT_TERMS = re.compile(
+    r"cookie|consent|privacy|partners|personali[sz]|advertis|tracking|preferences", re.I
+)
+CHALLENGE_PATTERN = re.compile(
+    r"verify (?:that )?you are (?:a )?human|enable javascript (?:and cookies )?to continue|"
+    r"access denied|are you a robot",
+    re.I
+)
+# Interstitials (consent walls, challenges) are short; on long pages these phrases are banners
+INTERSTITIAL_MAX_TEXT = 2000
+# Share of the text in consent sentences above which a page is a consent wall
+CONSENT_MIN_SHARE = 0.5
+# A not-found title or heading is a soft 404 only on a thin page or one missing the schema's words
+SOFT_404_MAX_TEXT = 600
+SOFT_404_MAX_HINT_RATE = 0.5
+STRUCTURE_TAGS = 400
+GENERIC_HINTS = {"value", "field", "number", "string", "product", "page", "item", "name", "text"}
+
+
+class PageFeatures(NamedTuple):
+    """Cheap structural features of a fetched page"""
+    text_length: int
+    dom_nodes: int
+    template: int
+    hint_rate: float
+    title: str
+    heading: str
+    text: str
+
+
+class GateVerdict(NamedTuple):
+    """Outcome of the content gate"""
+    passed: bool
+    reason: Optional[str] = None
+    action: str = "retry"  # retry, escalate (switch to a browser) or fail
+    features: Optional[PageFeatures] = None
+
+
+def schema_hints(schema: Dict[str, FieldDefinition]) -> List[List[str]]:
+    """Keywords per schema field, from the field name (e.g. "shipping_cost" -> shipping, cost)"""
+    hints = []
+    for field in schema:
+        tokens = [
+            token for token in re.split(r'[_\-\s]+', field.lower())
+            if len(token) >= 3 and token not in GENERIC_HINTS
+        ]
+        if tokens:
+            hints.append(tokens)
+    return hints
+
+
+def page_features(html: str, hints: List[List[str]]) -> PageFeatures:
+    """
+    Extract gate features with a single lxml parse
+
+    Args:
+        html: Page HTML
+        hints: Keywords per schema field
+
+    Returns:
+        PageFeatures
+    """
+    try:
+        root = lxml.html.document_fromstring(html)
+    except (ValueError, etree.ParserError):
+        return PageFeatures(0, 0, 0, 0.0, "", "", "")
+
+    nodes = 0
+    structure = []
+    for element in root.iter():
+        if not isinstance(element.tag, str):
+            continue
+        nodes += 1
+        if len(structure) < STRUCTURE_TAGS:
+            classes = element.get("class", "").split()
+            structure.append(f"{element.tag}.{classes[0]}" if classes else element.tag)
+
+    title = " ".join(root.findtext(".//title", default="").split())
+    heading_element = root.find(".//h1")
+    heading = (
+        " ".join(heading_element.text_content().split()) if heading_element is not None else ""
+    )
+
+    for element in root.xpath("//script|//style|//noscript|//template"):
+        element.drop_tree()
+    text = " ".join(" ".join(root.itertext()).split())
+
+    lowered = text.lower()
+    hint_rate = (
+        sum(1 for tokens in hints if any(token in lowered for token in tokens)) / len(hints)
+        if hints else 0.0
+    )
+
+    return PageFeatures(
+        text_length=len(text),
+        dom_nodes=nodes,
+        template=simhash(word_shingles(" ".join(structure), 3)),
+        hint_rate=hint_rate,
+        title=title,
+        heading=heading,
+        text=text
+    )
+
+
+def consent_share(text: str) -> float:
+    """Share of the text in sentences that talk about cookies, consent or privacy"""
+    if not text:
+        return 0.0
+    sentences = re.split(r"(?<=[.!?])\s+", text)
+    consent = sum(len(sentence) for sentence in sentences if CONSENT_TERMS.search(sentence))
+    return consent / len(text)
+
+
+class DomainBaseline:
+    """Running page features of accepted pages on one domain"""
+
+    MAX_TEMPLATES = 16
+
+    def __init__(self):
+        self.samples = 0
+        self.text = QuartileSketch()
+        self.nodes = QuartileSketch()
+        self.templates: Deque[int] = deque(maxlen=self.MAX_TEMPLATES)
+        self.hint_total = 0.0
+
+    def learn(self, features: PageFeatures):
+        self.samples += 1
+        self.text.add(math.log1p(features.text_length))
+        self.nodes.add(math.log1p(features.dom_nodes))
+        self.hint_total += features.hint_rate
+        # Keep distinct templates only, so one layout can't crowd out the rest
+        if all(
+            hamming_distance(features.template, known) > settings.content_gate_template_distance
+            for known in self.templates
+        ):
+            self.templates.append(features.template)
+
+    def anomalies(self, features: PageFeatures) -> List[str]:
+        """Ways a page differs from the accepted pages of the domain"""
+        multiplier = settings.content_gate_iqr_multiplier
+        found = []
+
+        text = math.log1p(features.text_length)
+        if self.text.is_outlier(text, multiplier) and text < self.text.q1.value:
+            found.append(f"text length {features.text_length} far below usual")
+
+        nodes = math.log1p(features.dom_nodes)
+        if self.nodes.is_outlier(nodes, multiplier) and nodes < self.nodes.q1.value:
+            found.append(f"DOM of {features.dom_nodes} nodes far below usual")
+
+        if self.templates and min(
+            hamming_distance(features.template, known) for known in self.templates
+        ) > settings.content_gate_template_distance:
+            found.append("unfamiliar page template")
+
+        if self.hint_total / self.samples >= 0.5 and features.hint_rate == 0:
+            found.append("none of the schema's field names appear")
+
+        return found
+
+
+class ContentGate:
+    """
+    Decide whether a fetched page is worth sending to the extractor
+
+    Absolute checks catch empty shells, soft 404s, consent walls and
+    challenge pages the anti-bot detector missed; a not-found title or a
+    consent banner alone is not enough, the page must also be thin or
+    lack the schema's words. Once a domain has
+    content_gate_min_samples accepted pages, a page that differs from
+    them on two or more features (text length, DOM size, template
+    fingerprint, schema keyword presence) is rejected too. A single odd
+    feature is let through, so redesigns and unusual pages are not lost.
+    """
+
+    def __init__(self, max_domains: int = 10000):
+        self.max_domains = max_domains
+        self._baselines: "OrderedDict[str, DomainBaseline]" = OrderedDict()
+        self.checked = 0
+        self.rejected: Dict[str, int] = {}
+
+    def check(
+        self,
+        domain: str,
+        html: str,
+        schema: Dict[str, FieldDefinition],
+        mode: str = "single",
+        status_code: Optional[int] = None
+    ) -> GateVerdict:
+        """
+        Check a page before extraction
+
+        Args:
+            domain: Page domain
+            html: Page HTML
+            schema: Extraction schema
+            mode: Request mode (single and list pages have separate baselines)
+            status_code: HTTP status of the response, if known
+
+        Returns:
+            GateVerdict
+        """
+        self.checked += 1
+        hints = schema_hints(schema)
+        features = page_features(html, hints)
+        verdict = self._judge(f"{domain}|{mode}", features, status_code, bool(hints))
+
+        if not verdict.passed:
+            kind = verdict.reason.split(":")[0]
+            self.rejected[kind] = self.rejected.get(kind, 0) + 1
+            logger.info(f"Content gate rejected page on {domain}: {verdict.reason}")
+        return verdict
+
+    def _judge(
+        self,
+        key: str,
+        features: PageFeatures,
+        status_code: Optional[int] = None,
+        hinted: bool = True
+    ) -> GateVerdict:
+        # hinted: the schema has keywords, so a zero hint rate means they are missing
+        if status_code == 404:
+            return GateVerdict(False, "not found: HTTP 404", "fail", features)
+
+        if features.text_length < settings.content_gate_min_text:
+            return GateVerdict(
+                False, f"empty shell: {features.text_length} characters of text", "escalate",
+                features
+            )
+
+        # "404" or "not found" in a title is also a product name ("Peugeot 404") or a search term
+        not_found = (
+            SOFT_404_PATTERN.search(features.title) or SOFT_404_PATTERN.search(features.heading)
+        )
+        if not_found and (
+            features.text_length < SOFT_404_MAX_TEXT
+            or (hinted and features.hint_rate < SOFT_404_MAX_HINT_RATE)
+        ):
+            return GateVerdict(
+                False, f"soft 404: '{(features.heading or features.title)[:80]}'", "fail", features
+            )
+
+        if features.text_length < INTERSTITIAL_MAX_TEXT:
+            if CHALLENGE_PATTERN.search(features.text):
+                return GateVerdict(False, "challenge page", "escalate", features)
+            # A cookie banner on a short product page is not a consent wall
+            if CONSENT_PATTERN.search(features.text) and (
+                (hinted and features.hint_rate == 0)
+                or consent_share(features.text) >= CONSENT_MIN_SHARE
+            ):
+                return GateVerdict(False, "consent wall", "escalate", features)
+
+        baseline = self._baselines.get(key)
+        if baseline is not None and baseline.samples >= settings.content_gate_min_samples:
+            anomalies = baseline.anomalies(features)
+            if len(anomalies) >= 2:
+                return GateVerdict(
+                    False, "unlike domain baseline: " + "; ".join(anomalies), "retry", features
+                )
+
+        return GateVerdict(True, features=features)
+
+    def learn(self, domain: str, features: PageFeatures, mode: str = "single"):
+        """Add a page whose extraction validated to the domain's baseline"""
+        key = f"{domain}|{mode}"
+        baseline = self._baselines.get(key)
+        if baseline is None:
+            baseline = self._baselines[key] = DomainBaseline()
+            while len(self._baselines) > self.max_domains:
+                self._baselines.popitem(last=False)
+        else:
+            self._baselines.move_to_end(key)
+        baseline.learn(features)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gate statistics"""
+        rejected = sum(self.rejected.values())
+        return {
+            "baselines": len(self._baselines),
+            "checked": self.checked,
+            "rejected": rejected,
+            "rejected_by_reason": dict(self.rejected),
+            "rejection_rate": rejected / self.checked if self.checked else 0.0,
+        }
+
+
+# Global instance
+content_gate = ContentGate(max_domains=settings.content_gate_max_domains)
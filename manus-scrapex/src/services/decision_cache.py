@@ -0,0 +1,136 @@
+"""
+Decision Cache - Memoized retry and evasion decisions keyed by failure signature
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CachedDecision:
+    """Candidate actions for one failure signature, with their outcomes"""
+
+    def __init__(self, options: Dict[str, Any], ttl: float):
+        self.options = options
+        self.successes = {name: 0 for name in options}
+        self.failures = {name: 0 for name in options}
+        self.expires_at = time.monotonic() + ttl
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    @property
+    def exhausted(self) -> bool:
+        """Every option has failed more often than it succeeded"""
+        return all(self.failures[name] > self.successes[name] for name in self.options)
+
+    def ranked(self) -> List[Any]:
+        """Options by observed success rate (Laplace-smoothed), ties in original order"""
+        order = {name: index for index, name in enumerate(self.options)}
+
+        def score(name: str) -> tuple:
+            successes, failures = self.successes[name], self.failures[name]
+            return (-(successes + 1) / (successes + failures + 2), order[name])
+
+        return [self.options[name] for name in sorted(self.options, key=score)]
+
+
+class DecisionCache:
+    """
+    TTL cache of decisions keyed by (domain, failure signature, engine)
+
+    The first page of a domain that fails a given way computes the
+    decision (possibly with an LLM call); later pages reuse it. Outcomes
+    of the chosen action re-rank the options, and a decision whose options
+    all keep failing is dropped so it is computed afresh.
+    """
+
+    def __init__(self, ttl: float = 900, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedDecision]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(domain: str, signature: str, engine: str) -> str:
+        """Cache key for a failure signature"""
+        return f"{domain}|{signature}|{engine}"
+
+    def get(self, key: str) -> Optional[List[Any]]:
+        """
+        Get the ranked options for a key
+
+        Args:
+            key: Decision key
+
+        Returns:
+            List of options, best first, or None if not cached
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.expired or entry.exhausted:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry.ranked()
+
+    def put(self, key: str, options: Dict[str, Any]):
+        """
+        Store a freshly computed decision
+
+        Args:
+            key: Decision key
+            options: Action name -> action, in preference order
+        """
+        if not options:
+            return
+
+        self._entries[key] = CachedDecision(options, self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def record(self, key: str, name: str, success: bool):
+        """
+        Record the outcome of an action taken for a key
+
+        Args:
+            key: Decision key
+            name: Action name
+            success: Whether the action resolved the failure
+        """
+        entry = self._entries.get(key)
+        if entry is None or name not in entry.options:
+            return
+
+        if success:
+            entry.successes[name] += 1
+        else:
+            entry.failures[name] += 1
+            logger.debug(f"Decision '{name}' failed for {key}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# Global instance
+decision_cache = DecisionCache(
+    ttl=settings.decision_cache_ttl,
+    max_entries=settings.decision_cache_max_entries
+)
@@ -0,0 +1,234 @@
+"""
+Domain Backoff - Per-domain next-allowed times from Retry-After and rate-limit headers
+"""
+import asyncio
+import logging
+import math
+import re
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+from ..config.settings import settings
+from ..utils.request_context import DeadlineExceeded, remaining_time
+from .cache import CacheBackend, create_cache_backend
+
+logger = logging.getLogger(__name__)
+
+RESET_HEADERS = ("ratelimit-reset", "x-ratelimit-reset", "x-rate-limit-reset")
+REMAINING_HEADERS = ("ratelimit-remaining", "x-ratelimit-remaining", "x-rate-limit-remaining")
+
+# Structured IETF header: "RateLimit: limit=100, remaining=0, reset=30" or "...;r=0;t=30"
+STRUCTURED_PARAM = re.compile(r'\b(remaining|reset|r|t)\s*=\s*(\d+(?:\.\d+)?)')
+
+
+def _parse_retry_after(value: str, now: float) -> Optional[float]:
+    """Retry-After as delta seconds or an HTTP date"""
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(value).timestamp() - now
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _parse_reset(value: str, now: float) -> Optional[float]:
+    """X-RateLimit-Reset as delta seconds, epoch seconds or epoch milliseconds"""
+    try:
+        reset = float(value.strip())
+    except ValueError:
+        return None
+    if reset > 1e12:
+        return reset / 1000 - now
+    if reset > 1e9:
+        return reset - now
+    return reset
+
+
+def parse_backoff(
+    status_code: Optional[int],
+    headers: Optional[Mapping[str, str]],
+    now: Optional[float] = None
+) -> Optional[float]:
+    """
+    Seconds the origin asked us to wait before the next request
+
+    Retry-After wins; otherwise rate-limit reset headers count when the
+    remaining quota is exhausted (or the response is a 429). A 429 with no
+    usable header backs off for backoff_default_delay.
+
+    Args:
+        status_code: HTTP status code
+        headers: Response headers
+        now: Current epoch time (for HTTP dates and epoch resets)
+
+    Returns:
+        float or None if no backoff is needed
+    """
+    now = time.time() if now is None else now
+    headers = {key.lower(): value for key, value in (headers or {}).items()}
+    delay = None
+
+    if "retry-after" in headers and status_code in (429, 503):
+        delay = _parse_retry_after(headers["retry-after"], now)
+
+    if delay is None:
+        remaining = next((headers[name] for name in REMAINING_HEADERS if name in headers), None)
+        reset = next((headers[name] for name in RESET_HEADERS if name in headers), None)
+
+        if "ratelimit" in headers:
+            params = dict(STRUCTURED_PARAM.findall(headers["ratelimit"]))
+            remaining = params.get("remaining", params.get("r", remaining))
+            reset = params.get("reset", params.get("t", reset))
+
+        exhausted = status_code == 429
+        try:
+            exhausted = exhausted or (remaining is not None and float(remaining) <= 0)
+        except ValueError:
+            pass
+        if exhausted and reset is not None:
+            delay = _parse_reset(reset, now)
+
+    if delay is None and status_code == 429:
+        delay = settings.backoff_default_delay
+
+    if delay is None or delay <= 0:
+        return None
+    return min(delay, settings.backoff_max_delay)
+
+
+class DomainBackoff:
+    """
+    Registry of per-domain next-allowed request times
+
+    Engines and evasion fetches note every response; before sending they
+    wait until the domain's next-allowed time. Times are keyed by domain
+    and egress (direct or proxy host), since limits are usually per client
+    IP, and kept in a shared backend so all workers honour them.
+    """
+
+    def __init__(self, backend: str = "memory"):
+        self.backend_name = backend
+        self._backend: Optional[CacheBackend] = None
+        self._next_allowed: Dict[str, float] = {}
+        self.backoffs = 0
+        self.waits = 0
+        self.total_wait = 0.0
+
+    @property
+    def backend(self) -> CacheBackend:
+        # Created on first use, so importing the module never touches disk
+        if self._backend is None:
+            self._backend = create_cache_backend(
+                self.backend_name,
+                namespace="domain_backoff",
+                max_entries=10000,
+                ttl=int(settings.backoff_max_delay) + 1
+            )
+        return self._backend
+
+    @staticmethod
+    def key(domain: str, via: Optional[str] = None) -> str:
+        return f"{domain}|{via or 'direct'}"
+
+    async def note_response(
+        self,
+        domain: str,
+        status_code: Optional[int],
+        headers: Optional[Mapping[str, str]],
+        via: Optional[str] = None
+    ) -> Optional[float]:
+        """
+        Record the backoff a response asks for
+
+        Args:
+            domain: Responding domain
+            status_code: HTTP status code
+            headers: Response headers
+            via: Proxy host the request went through (None = direct)
+
+        Returns:
+            Backoff in seconds, or None
+        """
+        delay = parse_backoff(status_code, headers)
+        if delay is None:
+            return None
+
+        key = self.key(domain, via)
+        until = time.time() + delay
+        if until <= self._next_allowed.get(key, 0.0):
+            return delay
+
+        self._next_allowed[key] = until
+        self.backoffs += 1
+        logger.info(f"{domain} asked for a {delay:.1f}s backoff (status {status_code})")
+
+        try:
+            await self.backend.set(key, repr(until), ttl=math.ceil(delay) + 1)
+        except Exception as e:
+            logger.warning(f"Failed to share backoff for {domain}: {e}")
+        return delay
+
+    async def delay(self, domain: str, via: Optional[str] = None) -> float:
+        """Seconds until the next request to a domain may be sent"""
+        key = self.key(domain, via)
+        until = self._next_allowed.get(key, 0.0)
+
+        if self.backend_name != "memory":
+            # Another worker may have been told to back off
+            try:
+                stored = await self.backend.get(key)
+                if stored:
+                    until = max(until, float(stored))
+            except Exception as e:
+                logger.warning(f"Failed to read shared backoff for {domain}: {e}")
+
+        now = time.time()
+        if until <= now:
+            self._next_allowed.pop(key, None)
+            return 0.0
+        self._next_allowed[key] = until
+        return until - now
+
+    async def wait(self, domain: str, via: Optional[str] = None):
+        """
+        Wait until a request to the domain is allowed
+
+        Raises:
+            DeadlineExceeded: If the backoff outlasts the request deadline
+        """
+        if not settings.backoff_enabled:
+            return
+
+        delay = await self.delay(domain, via)
+        if delay <= 0:
+            return
+
+        remaining = remaining_time()
+        if remaining is not None and delay >= remaining:
+            raise DeadlineExceeded(
+                f"{domain} asked for a {delay:.0f}s backoff, beyond the request deadline"
+            )
+
+        logger.info(f"Backing off {delay:.1f}s before requesting {domain}")
+        self.waits += 1
+        self.total_wait += delay
+        await asyncio.sleep(delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Backoff statistics"""
+        now = time.time()
+        return {
+            "backend": self.backend_name,
+            "backing_off": sum(1 for until in self._next_allowed.values() if until > now),
+            "backoffs": self.backoffs,
+            "waits": self.waits,
+            "total_wait": self.total_wait,
+        }
+
+
+# Global instance
+domain_backoff = DomainBackoff(backend=settings.backoff_backend)
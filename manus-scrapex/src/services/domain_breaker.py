@@ -0,0 +1,171 @@
+"""
+Domain Breaker - Per-domain circuit breakers for persistently blocked targets
+"""
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, Optional
+
+from ..config.settings import settings
+from ..utils.circuit_breaker import CircuitBreaker, CircuitState
+
+logger = logging.getLogger(__name__)
+
+
+class BlockRateBreaker(CircuitBreaker):
+    """
+    Circuit breaker tripped by the block rate over a sliding window
+
+    Opens once at least min_requests outcomes are recorded and the share
+    of blocked ones reaches block_rate. Like every CircuitBreaker,
+    half-open admits a single probe whose outcome closes or re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        block_rate: float = 0.8,
+        window: int = 20,
+        min_requests: int = 5,
+        recovery_timeout: float = 120.0
+    ):
+        super().__init__(name, failure_threshold=window, recovery_timeout=recovery_timeout)
+        self.block_rate = block_rate
+        self.min_requests = min_requests
+        self.outcomes: deque = deque(maxlen=window)
+
+    @property
+    def current_block_rate(self) -> float:
+        return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def record_success(self):
+        """Record an unblocked response"""
+        if self._state != CircuitState.CLOSED:
+            self.outcomes.clear()
+        self.outcomes.append(False)
+        super().record_success()
+
+    def record_failure(self):
+        """Record a block that could not be evaded"""
+        self.outcomes.append(True)
+        self.consecutive_failures += 1
+        self._probe_started = None
+
+        if self.state == CircuitState.HALF_OPEN or (
+            self._state == CircuitState.CLOSED
+            and len(self.outcomes) >= self.min_requests
+            and self.current_block_rate >= self.block_rate
+        ):
+            self._open()
+
+    def _open(self):
+        """Trip the breaker"""
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+        logger.warning(
+            f"Circuit [{self.name}] opened at block rate {self.current_block_rate:.0%}, "
+            f"probing again in {self.recovery_timeout:.0f}s"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get breaker statistics"""
+        stats = super().get_stats()
+        stats["block_rate"] = self.current_block_rate
+        return stats
+
+
+class DomainBreakers:
+    """
+    Block-rate circuit breakers keyed by domain
+
+    Fed with the outcome of every anti-bot check, so requests for a
+    hard-blocked domain are refused up front instead of each walking the
+    full scrape/evade/retry loop.
+    """
+
+    MAX_OPEN_LISTED = 20
+
+    def __init__(self, max_domains: int = 10000):
+        self.max_domains = max_domains
+        self._breakers: "OrderedDict[str, BlockRateBreaker]" = OrderedDict()
+
+    def breaker(self, domain: str) -> BlockRateBreaker:
+        """Get or create the breaker for a domain"""
+        breaker = self._breakers.get(domain)
+        if breaker is None:
+            breaker = self._breakers[domain] = BlockRateBreaker(
+                f"domain:{domain}",
+                block_rate=settings.domain_breaker_block_rate,
+                window=settings.domain_breaker_window,
+                min_requests=settings.domain_breaker_min_requests,
+                recovery_timeout=settings.domain_breaker_recovery_timeout
+            )
+            self._evict()
+        else:
+            self._breakers.move_to_end(domain)
+        return breaker
+
+    def _evict(self):
+        # Drop least recently used breakers, keeping tripped ones
+        for domain in list(self._breakers):
+            if len(self._breakers) <= self.max_domains:
+                break
+            if self._breakers[domain].state == CircuitState.CLOSED:
+                del self._breakers[domain]
+
+    def acquire(self, domain: str) -> Optional[float]:
+        """
+        Ask to send a request to a domain
+
+        Args:
+            domain: Target domain
+
+        Returns:
+            None if the request may go ahead, else seconds until it could
+        """
+        breaker = self.breaker(domain)
+        if breaker.allow_request():
+            return None
+        return breaker.retry_in()
+
+    def record(self, domain: str, blocked: bool):
+        """
+        Record the outcome of an anti-bot check
+
+        Args:
+            domain: Target domain
+            blocked: Whether the page stayed blocked after evasion
+        """
+        breaker = self.breaker(domain)
+        if blocked:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def release(self, domain: str):
+        """Free a half-open probe whose request ended without an anti-bot verdict"""
+        breaker = self._breakers.get(domain)
+        if breaker is not None:
+            breaker.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Breaker statistics"""
+        states = {state.value: 0 for state in CircuitState}
+        open_domains = {}
+        for domain, breaker in self._breakers.items():
+            state = breaker.state
+            states[state.value] += 1
+            if state != CircuitState.CLOSED and len(open_domains) < self.MAX_OPEN_LISTED:
+                open_domains[domain] = breaker.get_stats()
+
+        return {
+            "domains": len(self._breakers),
+            "states": states,
+            "open": open_domains,
+            "rejected": sum(breaker.rejected for breaker in self._breakers.values()),
+        }
+
+
+# Global instance
+domain_breakers = DomainBreakers(max_domains=settings.domain_breaker_max_domains)
@@ -0,0 +1,322 @@
+"""
+Extraction Cache - Reuse extraction results for unchanged or near-identical pages
+"""
+import hashlib
+import json
+import logging
+import re
+from typing import Optional, Dict, Any, List, NamedTuple, Set, Tuple
+from bs4 import BeautifulSoup, Comment
+
+from ..models.scraping import FieldDefinition
+from ..utils.simhash import simhash, hamming_distance, simhash_bands, word_shingles
+from ..config.settings import settings
+from .cache import CacheBackend, MemoryCacheBackend, create_cache_backend
+
+logger = logging.getLogger(__name__)
+
+# Volatile content that changes between fetches of the same page
+AD_PATTERN = re.compile(r'(^|[\s_-])(ad|ads|advert\w*|banner|sponsor\w*)($|[\s_-])', re.I)
+TIMESTAMP_PATTERN = re.compile(
+    r'\b\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?\b'
+    r'|\b\d{1,2}:\d{2}(?::\d{2})?\s*(?:[ap]\.?m\.?)?\b',
+    re.I
+)
+TOKEN_PATTERN = re.compile(r'\b[A-Za-z0-9_\-+/=]{24,}\b')
+# Attributes whose values can be extracted (links, images, dates, meta content)
+EVIDENCE_ATTRIBUTES = ('href', 'src', 'datetime', 'content', 'alt')
+
+
+class ContentFingerprint(NamedTuple):
+    """Normalised page content and its hashes"""
+    content_hash: str
+    simhash: int
+    text: str
+    evidence: str  # Visible text plus the volatile parts dropped from the hash
+
+
+class ExtractionCache:
+    """
+    Extraction result cache keyed by (schema hash, normalised content hash)
+
+    - Exact hits: pages whose normalised text is identical
+    - Near-duplicate hits: SimHash within extraction_cache_simhash_distance
+    - Either kind is accepted only if every cached value still appears in
+      the new page, including the dates and attributes the hash ignores
+    - LRU+TTL in memory, optionally backed by disk or Redis
+    """
+
+    def __init__(self):
+        ttl = settings.extraction_cache_ttl
+
+        self.memory = MemoryCacheBackend(
+            "extraction", settings.extraction_cache_max_entries, ttl
+        )
+        self.persistent: Optional[CacheBackend] = None
+        if settings.extraction_cache_backend != "memory":
+            self.persistent = create_cache_backend(
+                settings.extraction_cache_backend,
+                namespace="extraction",
+                max_entries=settings.extraction_cache_max_entries,
+                ttl=ttl
+            )
+
+        # schema hash -> band -> entry keys, and entry key -> simhash
+        self._bands: Dict[str, Dict[int, Set[str]]] = {}
+        self._simhashes: Dict[str, int] = {}
+
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    def fingerprint(self, html: str) -> ContentFingerprint:
+        """
+        Normalise a page and fingerprint it
+
+        Scripts, styles, hidden inputs (CSRF tokens), <time> elements, ad
+        slots, timestamps and long opaque tokens are dropped before hashing.
+
+        Args:
+            html: Raw HTML
+
+        Returns:
+            ContentFingerprint: Hashes of the normalised text
+        """
+        text, evidence = self._normalize(html)
+        return ContentFingerprint(
+            content_hash=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            simhash=simhash(word_shingles(text)),
+            text=text,
+            evidence=evidence
+        )
+
+    def _normalize(self, html: str) -> Tuple[str, str]:
+        """Extract stable visible text, and the text plus volatile values, from HTML"""
+        try:
+            soup = BeautifulSoup(html, 'lxml')
+
+            for tag in soup(['script', 'style', 'noscript', 'link', 'iframe']):
+                tag.decompose()
+
+            for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+                comment.extract()
+
+            attributes = [
+                tag[attr] for tag in soup.find_all(True) for attr in EVIDENCE_ATTRIBUTES
+                if tag.has_attr(attr)
+            ]
+            evidence = " ".join([soup.get_text(" ", strip=True)] + attributes)
+
+            for tag in soup(['meta', 'time']):
+                tag.decompose()
+
+            for tag in soup.find_all('input', attrs={'type': 'hidden'}):
+                tag.decompose()
+
+            for tag in soup.find_all(True):
+                if tag.decomposed or tag.attrs is None:
+                    continue
+                marker = " ".join([tag.get('id', '')] + tag.get('class', []))
+                if marker and AD_PATTERN.search(marker):
+                    tag.decompose()
+
+            text = soup.get_text(" ", strip=True)
+
+        except Exception as e:
+            logger.error(f"Content normalisation failed: {e}")
+            text = evidence = html
+
+        text = TIMESTAMP_PATTERN.sub(" ", text)
+        text = TOKEN_PATTERN.sub(" ", text)
+        return " ".join(text.split()).lower(), " ".join(evidence.split()).lower()
+
+    def schema_hash(self, schema: Dict[str, FieldDefinition]) -> str:
+        """Stable hash of an extraction schema"""
+        payload = json.dumps(
+            {field: defn.model_dump() for field, defn in schema.items()},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    async def get(
+        self,
+        fingerprint: ContentFingerprint,
+        schema: Dict[str, FieldDefinition]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up cached extraction for a page
+
+        Args:
+            fingerprint: Page fingerprint
+            schema: Extraction schema
+
+        Returns:
+            Dict or None on miss
+        """
+        schema_key = self.schema_hash(schema)
+        key = f"{schema_key}:{fingerprint.content_hash}"
+
+        entry = await self._load(key)
+        if entry is not None:
+            # Entries loaded from the persistent backend after a restart are re-indexed
+            if key not in self._simhashes and "simhash" in entry:
+                self._index(schema_key, key, entry["simhash"])
+            if self._values_present(entry["data"], fingerprint.evidence):
+                self.exact_hits += 1
+                logger.info("Extraction cache hit (exact)")
+                return entry["data"]
+
+        for candidate in self._near_duplicate_keys(schema_key, fingerprint.simhash):
+            entry = await self._load(candidate)
+            if entry is None:
+                self._forget(schema_key, candidate)
+                continue
+
+            if self._values_present(entry["data"], fingerprint.evidence):
+                self.near_hits += 1
+                logger.info("Extraction cache hit (near-duplicate)")
+                return entry["data"]
+
+        self.misses += 1
+        return None
+
+    async def set(
+        self,
+        fingerprint: ContentFingerprint,
+        schema: Dict[str, FieldDefinition],
+        data: Dict[str, Any]
+    ):
+        """
+        Store extraction result for a page
+
+        Args:
+            fingerprint: Page fingerprint
+            schema: Extraction schema
+            data: Extracted data
+        """
+        schema_key = self.schema_hash(schema)
+        key = f"{schema_key}:{fingerprint.content_hash}"
+        value = json.dumps({"data": data, "simhash": fingerprint.simhash}, default=str)
+
+        await self.memory.set(key, value)
+        if self.persistent is not None:
+            await self.persistent.set(key, value)
+
+        self._index(schema_key, key, fingerprint.simhash)
+
+    async def delete(
+        self,
+        fingerprint: ContentFingerprint,
+        schema: Dict[str, FieldDefinition]
+    ):
+        """Remove cached extraction for a page"""
+        schema_key = self.schema_hash(schema)
+        key = f"{schema_key}:{fingerprint.content_hash}"
+
+        await self.memory.delete(key)
+        if self.persistent is not None:
+            await self.persistent.delete(key)
+        self._forget(schema_key, key)
+
+    async def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read an entry from memory, then the persistent backend"""
+        value = await self.memory.get(key)
+
+        if value is None and self.persistent is not None:
+            value = await self.persistent.get(key)
+            if value is not None:
+                await self.memory.set(key, value)
+
+        if value is None:
+            return None
+
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError:
+            return None
+
+    def _near_duplicate_keys(self, schema_key: str, fingerprint: int) -> List[str]:
+        """Indexed entries within the configured Hamming distance, closest first"""
+        bands = self._bands.get(schema_key, {})
+        candidates: Set[str] = set()
+        for band in simhash_bands(fingerprint):
+            candidates.update(bands.get(band, ()))
+
+        max_distance = settings.extraction_cache_simhash_distance
+        scored = []
+        for key in candidates:
+            distance = hamming_distance(self._simhashes.get(key, ~fingerprint), fingerprint)
+            if distance <= max_distance:
+                scored.append((distance, key))
+
+        return [key for _, key in sorted(scored)]
+
+    def _index(self, schema_key: str, key: str, fingerprint: int):
+        """Add an entry to the near-duplicate index"""
+        self._forget(schema_key, key)
+
+        # Keep the index bounded like the memory cache (oldest first)
+        while len(self._simhashes) >= settings.extraction_cache_max_entries:
+            oldest = next(iter(self._simhashes))
+            self._forget(oldest.split(":", 1)[0], oldest)
+
+        self._simhashes[key] = fingerprint
+        bands = self._bands.setdefault(schema_key, {})
+        for band in simhash_bands(fingerprint):
+            bands.setdefault(band, set()).add(key)
+
+    def _forget(self, schema_key: str, key: str):
+        """Drop an entry from the near-duplicate index"""
+        fingerprint = self._simhashes.pop(key, None)
+        if fingerprint is None:
+            return
+
+        bands = self._bands.get(schema_key, {})
+        for band in simhash_bands(fingerprint):
+            keys = bands.get(band)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del bands[band]
+
+    def _values_present(self, data: Dict[str, Any], text: str) -> bool:
+        """
+        Check cached scalar values still appear in the page
+
+        Guards hits against stale values: a near-duplicate that differs only
+        by a changed price, or an identical page whose date or image URL
+        (both ignored by the content hash) changed.
+        """
+        for value in data.values():
+            if value is None or isinstance(value, bool):
+                continue
+
+            if isinstance(value, (int, float)):
+                variants = {str(value), f"{value:,}", f"{value:.2f}", f"{value:,.2f}"}
+                if float(value).is_integer():
+                    variants.update({str(int(value)), f"{int(value):,}"})
+                if not any(variant in text for variant in variants):
+                    return False
+
+            elif isinstance(value, str):
+                if " ".join(value.split()).lower() not in text:
+                    return False
+
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.exact_hits + self.near_hits + self.misses
+        return {
+            "backend": settings.extraction_cache_backend,
+            "entries": len(self.memory),
+            "exact_hits": self.exact_hits,
+            "near_duplicate_hits": self.near_hits,
+            "misses": self.misses,
+            "hit_rate": (self.exact_hits + self.near_hits) / lookups if lookups > 0 else 0,
+        }
+
+
+# Global instance
+extraction_cache = ExtractionCache()
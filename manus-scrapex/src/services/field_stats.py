@@ -0,0 +1,284 @@
+"""
+Field Statistics - Streaming per-domain statistics of extracted values
+"""
+import math
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from ..config.settings import settings
+
+
+class P2Quantile:
+    """
+    Streaming quantile estimate (P² algorithm, Jain & Chlamtac 1985)
+
+    Keeps five markers, so memory and update cost are O(1) regardless of
+    how many values are observed.
+    """
+
+    def __init__(self, q: float):
+        self.q = q
+        self.count = 0
+        self._initial: List[float] = []
+        self._heights: List[float] = []
+        self._positions: List[float] = []
+        self._desired: List[float] = []
+        self._increments = [0.0, q / 2, q, (1 + q) / 2, 1.0]
+
+    def add(self, x: float):
+        self.count += 1
+
+        if self.count <= 5:
+            self._initial.append(x)
+            if self.count == 5:
+                self._heights = sorted(self._initial)
+                self._positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+                q = self.q
+                self._desired = [1.0, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5.0]
+            return
+
+        heights = self._heights
+        if x < heights[0]:
+            heights[0] = x
+            cell = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            cell = 3
+        else:
+            cell = next(i for i in range(4) if heights[i] <= x < heights[i + 1])
+
+        for i in range(cell + 1, 5):
+            self._positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in (1, 2, 3):
+            delta = self._desired[i] - self._positions[i]
+            if (
+                (delta >= 1 and self._positions[i + 1] - self._positions[i] > 1)
+                or (delta <= -1 and self._positions[i - 1] - self._positions[i] < -1)
+            ):
+                step = 1 if delta > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                self._positions[i] += step
+
+    def _parabolic(self, i: int, d: int) -> float:
+        n, h = self._positions, self._heights
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i: int, d: int) -> float:
+        n, h = self._positions, self._heights
+        return h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+
+    @property
+    def value(self) -> Optional[float]:
+        if self.count == 0:
+            return None
+        if self.count < 5:
+            ordered = sorted(self._initial)
+            return ordered[min(int(self.q * len(ordered)), len(ordered) - 1)]
+        return self._heights[2]
+
+
+class QuartileSketch:
+    """Streaming quartiles with Tukey-fence outlier test"""
+
+    def __init__(self):
+        self.q1 = P2Quantile(0.25)
+        self.q3 = P2Quantile(0.75)
+
+    def add(self, x: float):
+        self.q1.add(x)
+        self.q3.add(x)
+
+    def is_outlier(self, x: float, multiplier: float) -> bool:
+        q1, q3 = self.q1.value, self.q3.value
+        if q1 is None or q3 is None:
+            return False
+        # Floor the spread so constant-valued fields still tolerate tiny jitter
+        iqr = max(q3 - q1, 1e-9 + abs(q1 + q3) * 0.01)
+        return x < q1 - multiplier * iqr or x > q3 + multiplier * iqr
+
+    def get_stats(self) -> Dict[str, Optional[float]]:
+        return {"q1": self.q1.value, "q3": self.q3.value}
+
+
+def _signed_log(x: float) -> float:
+    """Log scale that keeps sign, so skewed values like prices compare sensibly"""
+    return math.copysign(math.log1p(abs(x)), x)
+
+
+class FieldStats:
+    """Running statistics of one field on one domain"""
+
+    def __init__(self):
+        self.count = 0
+        self.nulls = 0
+        self.numbers = QuartileSketch()
+        self.lengths = QuartileSketch()
+        self.categories: Optional[Dict[str, int]] = {}
+
+    def update(self, value: Any):
+        self.count += 1
+        if value is None:
+            self.nulls += 1
+            return
+
+        if isinstance(value, bool):
+            self._count_category(str(value))
+        elif isinstance(value, (int, float)):
+            self.numbers.add(_signed_log(value))
+        elif isinstance(value, str):
+            self.lengths.add(float(len(value)))
+            self._count_category(value.strip().lower())
+        elif isinstance(value, (list, dict)):
+            self.lengths.add(float(len(value)))
+
+    def _count_category(self, key: str):
+        if self.categories is None:
+            return
+        self.categories[key] = self.categories.get(key, 0) + 1
+        if len(self.categories) > settings.field_stats_max_categories:
+            # Free text or identifiers: stop tracking categories
+            self.categories = None
+
+    @property
+    def is_categorical(self) -> bool:
+        """Few distinct values relative to observations (e.g. availability, brand)"""
+        if self.categories is None:
+            return False
+        return len(self.categories) <= 0.2 * (self.count - self.nulls)
+
+    def anomaly(self, value: Any) -> Optional[str]:
+        """
+        Reason a value is unusual for this field, or None if it is typical
+
+        Args:
+            value: Extracted value
+
+        Returns:
+            str or None
+        """
+        multiplier = settings.field_stats_iqr_multiplier
+
+        if value is None:
+            if self.nulls / self.count < 0.05:
+                return "usually present, got null"
+            return None
+
+        if isinstance(value, bool):
+            if self.is_categorical and str(value) not in self.categories:
+                return f"value {value} never seen on this domain"
+            return None
+
+        if isinstance(value, (int, float)):
+            if self.numbers.q1.count and self.numbers.is_outlier(_signed_log(value), multiplier):
+                return f"value {value} outside usual range"
+            return None
+
+        if isinstance(value, str):
+            if self.is_categorical and value.strip().lower() not in self.categories:
+                return f"'{value[:50]}' is not one of the usual values"
+            if self.lengths.q1.count and self.lengths.is_outlier(float(len(value)), multiplier):
+                return f"unusual length {len(value)}"
+            return None
+
+        if isinstance(value, (list, dict)):
+            if self.lengths.q1.count and self.lengths.is_outlier(float(len(value)), multiplier):
+                return f"unusual size {len(value)}"
+
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "null_rate": self.nulls / self.count if self.count else 0.0,
+            "log_value_quartiles": self.numbers.get_stats(),
+            "length_quartiles": self.lengths.get_stats(),
+            "categories": len(self.categories) if self.categories is not None else None,
+        }
+
+
+class FieldStatsStore:
+    """
+    Per-(domain, field) running statistics
+
+    Updated with every accepted result and used to flag outliers in O(1),
+    so typical values on stable sites need no LLM consistency check.
+    """
+
+    def __init__(self, max_domains: int = 10000):
+        self.max_domains = max_domains
+        self._domains: "OrderedDict[str, Dict[str, FieldStats]]" = OrderedDict()
+        self.checks = 0
+        self.anomalies = 0
+
+    def update(self, domain: str, record: Dict[str, Any]):
+        """Add an accepted record to the domain's statistics"""
+        fields = self._domains.get(domain)
+        if fields is None:
+            fields = self._domains[domain] = {}
+            while len(self._domains) > self.max_domains:
+                self._domains.popitem(last=False)
+        else:
+            self._domains.move_to_end(domain)
+
+        for field, value in record.items():
+            stats = fields.get(field)
+            if stats is None:
+                stats = fields[field] = FieldStats()
+            stats.update(value)
+
+    def check(self, domain: str, record: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        """
+        Check a record against the domain's statistics
+
+        Args:
+            domain: Source domain
+            record: Extracted record
+
+        Returns:
+            Dict: field -> anomaly reason, or None if typical. Fields with
+            fewer than field_stats_min_samples observations are omitted.
+        """
+        fields = self._domains.get(domain, {})
+        results = {}
+
+        for field, value in record.items():
+            stats = fields.get(field)
+            if stats is None or stats.count < settings.field_stats_min_samples:
+                continue
+
+            reason = stats.anomaly(value)
+            results[field] = reason
+            self.checks += 1
+            if reason:
+                self.anomalies += 1
+
+        return results
+
+    def get_domain_stats(self, domain: str) -> Dict[str, Any]:
+        """Statistics of every field seen on a domain"""
+        return {
+            field: stats.get_stats()
+            for field, stats in self._domains.get(domain, {}).items()
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Store statistics"""
+        return {
+            "domains": len(self._domains),
+            "checks": self.checks,
+            "anomalies": self.anomalies,
+            "anomaly_rate": self.anomalies / self.checks if self.checks else 0.0,
+        }
+
+
+# Global instance
+field_stats = FieldStatsStore(max_domains=settings.field_stats_max_domains)
@@ -0,0 +1,184 @@
+"""
+API Key Pool - Load balancing across multiple credentials per LLM provider
+"""
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import openai
+
+from ..config.settings import settings
+from .rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class PooledKey:
+    """One API key with its own client, rate limits and health"""
+
+    def __init__(
+        self,
+        name: str,
+        api_key: str,
+        base_url: Optional[str] = None,
+        rpm: int = 0,
+        tpm: int = 0,
+        max_concurrency: int = 0
+    ):
+        self.name = name
+        self.client = openai.AsyncOpenAI(api_key=api_key, base_url=base_url)
+        self.limiter = RateLimiter(name, rpm=rpm, tpm=tpm, max_concurrency=max_concurrency)
+
+        # Last characters only, so stats never expose the secret
+        self.hint = f"...{api_key[-4:]}" if len(api_key) > 8 else "..."
+
+        # Health
+        self.quarantined_until = 0.0
+        self.quarantine_reason: Optional[str] = None
+        self.throttled = False  # Quarantined only for rate limiting, so it comes back by itself
+        self.successes = 0
+        self.failures = 0
+        self.rate_limited = 0
+        self.auth_failures = 0
+
+    @property
+    def available(self) -> bool:
+        """Whether the key is out of quarantine"""
+        return time.monotonic() >= self.quarantined_until
+
+    def quarantine(self, seconds: float, reason: str, throttled: bool = False):
+        """Take the key out of rotation for a while"""
+        rejected = not self.available and not self.throttled
+        self.quarantined_until = max(self.quarantined_until, time.monotonic() + seconds)
+        self.quarantine_reason = reason
+        self.throttled = throttled and not rejected
+        logger.warning(
+            f"API key {self.name} ({self.hint}) quarantined for {seconds:.0f}s: {reason}"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get key statistics"""
+        stats = {
+            "key": self.hint,
+            "available": self.available,
+            "quarantined_for": max(self.quarantined_until - time.monotonic(), 0),
+            "quarantine_reason": self.quarantine_reason if not self.available else None,
+            "successes": self.successes,
+            "failures": self.failures,
+            "rate_limited": self.rate_limited,
+            "auth_failures": self.auth_failures,
+        }
+        stats.update(self.limiter.get_stats())
+        return stats
+
+
+class APIKeyPool:
+    """
+    Pool of API keys for one provider
+
+    - Each key has its own client and RPM/TPM/concurrency limiter, so
+      throughput scales with the number of keys
+    - Calls go to the least-loaded available key
+    - Keys answering 429 are quarantined briefly (Retry-After if given),
+      keys answering 401/403 for much longer
+    - When every key is rate limited, the one back soonest is handed out
+      and the caller waits for it rather than failing
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        api_keys: List[str],
+        base_url: Optional[str] = None,
+        rpm: int = 0,
+        tpm: int = 0,
+        max_concurrency: int = 0
+    ):
+        self.provider = provider
+        self.keys: List[PooledKey] = []
+
+        for api_key in dict.fromkeys(key.strip() for key in api_keys):
+            if api_key:
+                self.keys.append(PooledKey(
+                    f"{provider}#{len(self.keys)}",
+                    api_key,
+                    base_url=base_url,
+                    rpm=rpm,
+                    tpm=tpm,
+                    max_concurrency=max_concurrency
+                ))
+
+    def select(self) -> PooledKey:
+        """
+        Pick the least-loaded available key
+
+        If every key is quarantined, the rate-limited key whose quarantine
+        ends first is returned; check its quarantined_until before calling.
+
+        Returns:
+            PooledKey: Key to use for the next call
+
+        Raises:
+            RuntimeError: If every key was rejected (401/403)
+        """
+        candidates = [key for key in self.keys if key.available]
+        if not candidates:
+            throttled = [key for key in self.keys if key.throttled]
+            if not throttled:
+                raise RuntimeError(f"All {self.provider} API keys are quarantined")
+            return min(throttled, key=lambda key: key.quarantined_until)
+
+        # Ties go to the key with fewer successes so idle keys share the work
+        return min(candidates, key=lambda key: (key.limiter.load(), key.successes))
+
+    def report_success(self, key: PooledKey):
+        """Record a successful call"""
+        key.successes += 1
+
+    def report_failure(self, key: PooledKey, error: Exception):
+        """
+        Record a failed call, quarantining the key on 429/401/403
+
+        Args:
+            key: Key used for the call
+            error: Exception raised by the client
+        """
+        key.failures += 1
+        status = getattr(error, "status_code", None)
+
+        if status == 429:
+            key.rate_limited += 1
+            key.quarantine(
+                self._retry_after(error) or settings.llm_key_rate_limit_quarantine,
+                "rate limited (429)",
+                throttled=True
+            )
+        elif status in (401, 403):
+            key.auth_failures += 1
+            key.quarantine(settings.llm_key_auth_quarantine, f"rejected ({status})")
+
+    def _retry_after(self, error: Exception) -> Optional[float]:
+        """Seconds from a Retry-After header, if present"""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        try:
+            value = float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            return None
+        return value if value > 0 else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics"""
+        return {
+            "keys": len(self.keys),
+            "available": sum(1 for key in self.keys if key.available),
+            "per_key": {key.name: key.get_stats() for key in self.keys},
+        }
+
+
+def configured_keys(single: Optional[str], pooled: Optional[str]) -> List[str]:
+    """Combine a single key setting with a comma-separated key list"""
+    keys = [single] if single else []
+    if pooled:
+        keys.extend(pooled.split(","))
+    return keys
@@ -0,0 +1,250 @@
+"""
+LLM Router - Latency-aware, hedged routing between LLM providers
+"""
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from ..models.base import LLMProvider
+from ..config.settings import settings
+from ..utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderHealth:
+    """Recent latency and error rate of one model"""
+
+    def __init__(self, window: int):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+
+    def record(self, latency: float, success: bool):
+        """Record one provider call"""
+        self.outcomes.append(success)
+        if success:
+            self.latencies.append(latency)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency percentile of recent successful calls (None without data)"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    @property
+    def error_rate(self) -> float:
+        """Share of recent calls that failed"""
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get health statistics"""
+        return {
+            "samples": len(self.outcomes),
+            "p50_latency": self.percentile(0.5),
+            "p95_latency": self.percentile(0.95),
+            "error_rate": self.error_rate,
+        }
+
+
+class LLMRouter:
+    """
+    Routes a call between a primary and a secondary model
+
+    - Per-model latency percentiles and error rates from recent calls
+    - If the primary has not answered within its p95 latency (or failed),
+      the same call is sent to the secondary; the first valid response
+      wins and the other request is cancelled
+    - A circuit breaker per model skips providers with sustained failures
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self.health: Dict[str, ProviderHealth] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+        # Metrics
+        self.routed = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def _health(self, model: LLMProvider) -> ProviderHealth:
+        if model.value not in self.health:
+            self.health[model.value] = ProviderHealth(settings.llm_latency_window)
+        return self.health[model.value]
+
+    def breaker(self, model: LLMProvider) -> CircuitBreaker:
+        """Circuit breaker of a model"""
+        if model.value not in self.breakers:
+            self.breakers[model.value] = CircuitBreaker(
+                f"llm:{model.value}",
+                failure_threshold=settings.llm_circuit_failure_threshold,
+                recovery_timeout=settings.llm_circuit_recovery_timeout
+            )
+        return self.breakers[model.value]
+
+    def record(self, model: LLMProvider, latency: float, success: bool):
+        """
+        Record the outcome of one provider request
+
+        Args:
+            model: Model called
+            latency: Provider latency in seconds (excluding queueing)
+            success: Whether the call succeeded
+        """
+        self._health(model).record(latency, success)
+        breaker = self.breaker(model)
+        if success:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+    def hedge_delay(self, model: LLMProvider) -> float:
+        """Seconds to wait for a model before hedging to the secondary"""
+        health = self._health(model)
+        if len(health.latencies) < settings.llm_hedge_min_samples:
+            return settings.llm_hedge_default_delay
+
+        p95 = health.percentile(settings.llm_hedge_percentile)
+        return max(p95, settings.llm_hedge_min_delay)
+
+    async def complete(
+        self,
+        prompt: str,
+        primary_model: LLMProvider,
+        fallback_model: LLMProvider,
+        validate: Optional[Callable[[str], bool]] = None,
+        **kwargs
+    ) -> str:
+        """
+        Complete on the primary model, hedging to the fallback when slow or failing
+
+        Args:
+            prompt: The prompt
+            primary_model: Preferred model
+            fallback_model: Model to hedge to
+            validate: Accepts a response (defaults to non-empty, valid JSON in JSON mode)
+            **kwargs: Arguments for LLMService.complete
+
+        Returns:
+            str: First valid response
+
+        Raises:
+            CircuitOpenError: If every configured model's circuit is open
+        """
+        self.routed += 1
+        validate = validate or self._default_validator(kwargs.get("response_format"))
+
+        configured = [
+            model for model in dict.fromkeys([primary_model, fallback_model])
+            if self.service.is_configured(model)
+        ] or [primary_model]
+        models = [model for model in configured if self.breaker(model).allow_request()]
+        if not models:
+            raise CircuitOpenError(
+                f"Circuit open for {', '.join(model.value for model in configured)}"
+            )
+
+        try:
+            if len(models) == 1 or not settings.llm_hedge_enabled:
+                return await self.service.complete(prompt, model=models[0], **kwargs)
+            return await self._hedged(prompt, models, validate, **kwargs)
+        finally:
+            # Free half-open probe slots that never reached the provider
+            # (cache hit, coalesced call, hedge not needed or cancelled)
+            for model in models:
+                self.breaker(model).release()
+
+    async def _hedged(
+        self,
+        prompt: str,
+        models: List[LLMProvider],
+        validate: Callable[[str], bool],
+        **kwargs
+    ) -> str:
+        """Race the primary against a delayed call to the secondary"""
+        primary, secondary = models
+        loop = asyncio.get_running_loop()
+        hedge_at = loop.time() + self.hedge_delay(primary)
+        tasks: Dict[asyncio.Task, LLMProvider] = {
+            asyncio.ensure_future(self.service.complete(prompt, model=primary, **kwargs)): primary
+        }
+        pending = set(tasks)
+        last_error: Optional[Exception] = None
+
+        try:
+            while pending:
+                timeout = max(hedge_at - loop.time(), 0) if len(tasks) == 1 else None
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    model = tasks[task]
+                    try:
+                        content = task.result()
+                    except Exception as e:
+                        logger.warning(f"Routed call to {model.value} failed: {e}")
+                        last_error = e
+                        continue
+
+                    if validate(content):
+                        if model == secondary:
+                            self.hedge_wins += 1
+                        return content
+
+                    logger.warning(f"Routed call to {model.value} returned an invalid response")
+                    last_error = ValueError(f"Invalid response from {model.value}")
+
+                # Primary is slow, failed or invalid: hedge to the secondary
+                if len(tasks) == 1:
+                    self.hedged += 1
+                    logger.info(f"Hedging LLM call from {primary.value} to {secondary.value}")
+                    task = asyncio.ensure_future(
+                        self.service.complete(prompt, model=secondary, **kwargs)
+                    )
+                    tasks[task] = secondary
+                    pending.add(task)
+
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        raise last_error
+
+    def _default_validator(self, response_format: Optional[Dict]) -> Callable[[str], bool]:
+        """Non-empty response, parseable JSON when JSON mode was requested"""
+        json_mode = bool(response_format) and response_format.get("type") == "json_object"
+
+        def validate(content: str) -> bool:
+            if not content or not content.strip():
+                return False
+            if json_mode:
+                try:
+                    json.loads(content)
+                except json.JSONDecodeError:
+                    return False
+            return True
+
+        return validate
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get routing statistics"""
+        models: List[str] = sorted(set(self.health) | set(self.breakers))
+        return {
+            "routed": self.routed,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "models": {
+                name: {
+                    **(self.health[name].get_stats() if name in self.health else {}),
+                    "circuit": self.breakers[name].get_stats() if name in self.breakers else None,
+                }
+                for name in models
+            },
+        }
@@ -1,16 +1,28 @@
 """
 LLM Service - DeepSeek integration with fallback to GPT-4/Claude
 """
+import asyncio
+import hashlib
 import json
 import time
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator, Callable, Awaitable
 from enum import Enum
 import openai
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ..models.base import LLMProvider
 from ..config.settings import settings
+from ..utils.request_context import (
+    request_priority, remaining_time, check_deadline, time_budget, DeadlineExceeded,
+    llm_cache_refresh
+)
+from ..utils.retry import retry_async
+from ..utils.circuit_breaker import CircuitOpenError
+from .cache import create_cache_backend
+from .key_pool import APIKeyPool, PooledKey, configured_keys
+from .rate_limiter import Reservation
+from .llm_router import LLMRouter
+from .singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -21,33 +33,50 @@ class LLMService:
     """
 
     def __init__(self):
-        # DeepSeek client
-        if settings.deepseek_api_key:
-            self.deepseek_client = openai.AsyncOpenAI(
-                api_key=settings.deepseek_api_key,
-                base_url=settings.deepseek_base_url
-            )
-        else:
-            self.deepseek_client = None
+        # Key pools: each key has its own client, rate limits and health
+        self.key_pools = {
+            "deepseek": APIKeyPool(
+                "deepseek",
+                configured_keys(settings.deepseek_api_key, settings.deepseek_api_keys),
+                base_url=settings.deepseek_base_url,
+                rpm=settings.deepseek_rpm_limit,
+                tpm=settings.deepseek_tpm_limit,
+                max_concurrency=settings.llm_max_concurrency
+            ),
+            # OpenAI (fallback)
+            "openai": APIKeyPool(
+                "openai",
+                configured_keys(settings.openai_api_key, settings.openai_api_keys),
+                rpm=settings.openai_rpm_limit,
+                tpm=settings.openai_tpm_limit,
+                max_concurrency=settings.llm_max_concurrency
+            ),
+        }
+
+        if not self.key_pools["deepseek"].keys:
             logger.warning("DeepSeek API key not configured")
+        if not self.key_pools["openai"].keys:
+            logger.warning("OpenAI API key not configured")
 
-        # OpenAI client (fallback)
-        if settings.openai_api_key:
-            self.openai_client = openai.AsyncOpenAI(
-                api_key=settings.openai_api_key
+        # Response cache for deterministic calls
+        self.response_cache = None
+        if settings.llm_cache_enabled:
+            self.response_cache = create_cache_backend(
+                settings.llm_cache_backend,
+                namespace="llm",
+                max_entries=settings.llm_cache_max_entries,
+                ttl=settings.llm_cache_ttl
             )
-        else:
-            self.openai_client = None
-            logger.warning("OpenAI API key not configured")
+
+        # Concurrent identical calls share one provider request
+        self.singleflight = SingleFlight("llm")
+
+        # Latency/error tracking, hedging and circuit breakers across providers
+        self.router = LLMRouter(self)
 
         # Metrics tracking
         self.metrics = LLMMetrics()
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        reraise=True
-    )
     async def complete(
         self,
         prompt: str,
@@ -56,10 +85,20 @@ class LLMService:
         max_tokens: int = 2000,
         response_format: Optional[Dict] = None,
         system_message: Optional[str] = None,
+        use_cache: bool = True,
+        priority: Optional[int] = None,
         **kwargs
     ) -> str:
         """
-        Call LLM with retry logic and metrics
+        Call LLM with response caching, retry logic and metrics
+
+        Calls with temperature <= settings.llm_cache_max_temperature are
+        served from the response cache when an identical call (model,
+        prompt, system message and generation params) was made before.
+        Identical calls already in flight are coalesced into one request.
+        JSON-mode responses are cached only if they parse. While
+        llm_cache_refresh is set (a retry after a rejected result) the
+        provider is always called and its response replaces the cached one.
 
         Args:
             prompt: The user prompt
@@ -68,34 +107,297 @@ class LLMService:
             max_tokens: Maximum tokens to generate
             response_format: Response format (e.g., {"type": "json_object"})
             system_message: Optional system message
+            use_cache: Set False to bypass the response cache and coalescing
+            priority: Admission priority (defaults to the current request's priority)
             **kwargs: Additional arguments
 
         Returns:
             str: Generated text response
         """
+        call_key = self._cache_key(
+            prompt, model, temperature, max_tokens, response_format, system_message, kwargs
+        )
+        cacheable = (
+            self.response_cache is not None
+            and use_cache
+            and temperature <= settings.llm_cache_max_temperature
+        )
+        refresh = llm_cache_refresh.get()
+
+        if cacheable and not refresh:
+            cached = await self.response_cache.get(call_key)
+            self.metrics.record_cache(model, hit=cached is not None)
+
+            if cached is not None:
+                logger.debug(f"LLM cache hit - model: {model.value}")
+                return cached
+
+        if priority is None:
+            priority = request_priority.get()
+
+        async def call_provider() -> str:
+            content = await self._complete_uncached(
+                prompt=prompt,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format=response_format,
+                system_message=system_message,
+                priority=priority,
+                **kwargs
+            )
+
+            if cacheable and self._cacheable_response(content, response_format):
+                await self.response_cache.set(call_key, content)
+
+            return content
+
+        if not use_cache or refresh:
+            return await call_provider()
+
+        return await self.singleflight.do(call_key, call_provider)
+
+    async def complete_stream(
+        self,
+        prompt: str,
+        model: LLMProvider = LLMProvider.DEEPSEEK_V3,
+        temperature: float = 0,
+        max_tokens: int = 2000,
+        response_format: Optional[Dict] = None,
+        system_message: Optional[str] = None,
+        priority: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion as text deltas
+
+        Cached responses are yielded in one piece. Stopping iteration early
+        (break / aclose()) closes the provider stream, so no further tokens
+        are generated or billed. Only complete responses are cached.
+        The model's circuit breaker is checked first and the outcome is
+        recorded with the router, so a degraded provider is skipped by
+        streams and routed calls alike. Failures are not retried or hedged;
+        callers fall back to complete_with_fallback().
+
+        Args:
+            prompt: The user prompt
+            model: LLM provider to use
+            temperature: Sampling temperature (0-2)
+            max_tokens: Maximum tokens to generate
+            response_format: Response format (e.g., {"type": "json_object"})
+            system_message: Optional system message
+            priority: Admission priority (defaults to the current request's priority)
+            **kwargs: Additional arguments
+
+        Yields:
+            str: Content deltas
+        """
+        call_key = self._cache_key(
+            prompt, model, temperature, max_tokens, response_format, system_message, kwargs
+        )
+        cacheable = (
+            self.response_cache is not None
+            and temperature <= settings.llm_cache_max_temperature
+        )
+
+        if cacheable and not llm_cache_refresh.get():
+            cached = await self.response_cache.get(call_key)
+            self.metrics.record_cache(model, hit=cached is not None)
+            if cached is not None:
+                yield cached
+                return
+
+        if priority is None:
+            priority = request_priority.get()
+
+        pool, call = self._route(model)
+        breaker = self.router.breaker(model)
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"Circuit open for {model.value}")
+
+        try:
+            key, reservation = await self._reserve(
+                pool, prompt, system_message, max_tokens, priority
+            )
+        except BaseException:
+            breaker.release()
+            raise
+
         start_time = time.time()
+        first_token_time: Optional[float] = None
+        parts: List[str] = []
+        usage = None
+        stream = None
+        finished = False
+        failed = False
 
         try:
-            # Route to appropriate provider
-            if model in [LLMProvider.DEEPSEEK_V3, LLMProvider.DEEPSEEK_CODER]:
-                if not self.deepseek_client:
-                    raise ValueError("DeepSeek client not configured")
+            stream = await call(
+                client=key.client,
+                timeout=time_budget(settings.llm_request_timeout, "LLM call"),
+                prompt=prompt,
+                model=model.value,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format=response_format,
+                system_message=system_message,
+                stream=True,
+                **kwargs
+            )
 
-                response = await self._call_deepseek(
-                    prompt=prompt,
-                    model=model.value,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                    response_format=response_format,
-                    system_message=system_message,
-                    **kwargs
-                )
+            async for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    if first_token_time is None:
+                        first_token_time = time.time() - start_time
+                    parts.append(delta)
+                    yield delta
+
+            finished = True
+            pool.report_success(key)
+
+        except Exception as e:
+            failed = True
+            pool.report_failure(key, e)
+            logger.error(f"LLM stream failed - model: {model.value}, error: {e}")
+            raise
+
+        finally:
+            if stream is not None and not finished:
+                await stream.close()
+
+            if failed or finished:
+                self.router.record(model, time.time() - start_time, success=not failed)
+            elif parts:
+                # Stopped early by the caller: healthy, but not a full-length latency sample
+                breaker.record_success()
+            else:
+                breaker.release()
+
+            # Aborted streams don't report usage: estimate from what was generated
+            tokens_used = usage.total_tokens if usage is not None else (
+                (len(prompt) + len(system_message or "") + len("".join(parts))) // 4
+            )
+            key.limiter.release(reservation, tokens_used)
+
+            prompt_tokens, cached_tokens = self._prompt_cache_usage(usage)
+            await self.metrics.record(
+                model=model,
+                latency=time.time() - start_time,
+                tokens_used=tokens_used if not failed else 0,
+                success=not failed,
+                prompt_tokens=prompt_tokens,
+                cached_tokens=cached_tokens
+            )
+            self.metrics.record_stream(first_token_time, stopped_early=not finished and not failed)
 
-            elif model in [LLMProvider.GPT4, LLMProvider.GPT4_VISION]:
-                if not self.openai_client:
-                    raise ValueError("OpenAI client not configured")
+        content = "".join(parts)
+        if cacheable and self._cacheable_response(content, response_format):
+            await self.response_cache.set(call_key, content)
 
-                response = await self._call_openai(
+    def _cache_key(
+        self,
+        prompt: str,
+        model: LLMProvider,
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict],
+        system_message: Optional[str],
+        extra: Dict[str, Any]
+    ) -> str:
+        """Hash of everything that determines the completion"""
+        payload = json.dumps(
+            {
+                "model": model.value,
+                "prompt": prompt,
+                "system_message": system_message,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "response_format": response_format,
+                "extra": extra,
+            },
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cacheable_response(self, content: Optional[str], response_format: Optional[Dict]) -> bool:
+        """Non-empty, and valid JSON when JSON mode was requested"""
+        if not content:
+            return False
+        if response_format and response_format.get("type") == "json_object":
+            try:
+                json.loads(content)
+            except json.JSONDecodeError:
+                return False
+        return True
+
+    async def _complete_uncached(
+        self,
+        prompt: str,
+        model: LLMProvider,
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict] = None,
+        system_message: Optional[str] = None,
+        priority: int = 1,
+        **kwargs
+    ) -> str:
+        """
+        Call the provider, retrying transient errors
+
+        Only rate limits, timeouts, connection errors and 5xx responses are
+        retried, and only while the request deadline leaves room for the
+        backoff. Configuration and client errors fail immediately.
+        """
+        return await retry_async(
+            lambda: self._complete_once(
+                prompt=prompt,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format=response_format,
+                system_message=system_message,
+                priority=priority,
+                **kwargs
+            ),
+            attempts=settings.llm_retry_attempts,
+            base_delay=settings.llm_retry_base_delay,
+            max_delay=settings.llm_retry_max_delay,
+            name=f"LLM call ({model.value})"
+        )
+
+    async def _complete_once(
+        self,
+        prompt: str,
+        model: LLMProvider,
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict] = None,
+        system_message: Optional[str] = None,
+        priority: int = 1,
+        **kwargs
+    ) -> str:
+        """Call the provider on the least-loaded key with rate limiting and metrics"""
+        start_time = time.time()
+
+        try:
+            pool, call = self._route(model)
+            key, reservation = await self._reserve(
+                pool, prompt, system_message, max_tokens, priority
+            )
+
+            actual_tokens = None
+            call_start = time.time()
+            try:
+                response = await call(
+                    client=key.client,
+                    timeout=time_budget(settings.llm_request_timeout, "LLM call"),
                     prompt=prompt,
                     model=model.value,
                     temperature=temperature,
@@ -104,20 +406,32 @@ class LLMService:
                     system_message=system_message,
                     **kwargs
                 )
-
-            else:
-                raise ValueError(f"Unsupported model: {model}")
+                pool.report_success(key)
+                self.router.record(model, time.time() - call_start, success=True)
+                if getattr(response, 'usage', None) is not None:
+                    actual_tokens = response.usage.total_tokens
+            except Exception as e:
+                pool.report_failure(key, e)
+                self.router.record(model, time.time() - call_start, success=False)
+                raise
+            finally:
+                key.limiter.release(reservation, actual_tokens)
 
             # Extract content
             content = response.choices[0].message.content
 
             # Record metrics
             latency = time.time() - start_time
+            prompt_tokens, cached_tokens = self._prompt_cache_usage(
+                getattr(response, 'usage', None)
+            )
             await self.metrics.record(
                 model=model,
                 latency=latency,
                 tokens_used=response.usage.total_tokens if hasattr(response, 'usage') else 0,
-                success=True
+                success=True,
+                prompt_tokens=prompt_tokens,
+                cached_tokens=cached_tokens
             )
 
             logger.info(
@@ -138,14 +452,88 @@ class LLMService:
             logger.error(f"LLM call failed - model: {model.value}, error: {e}")
             raise
 
+    def _prompt_cache_usage(self, usage: Any) -> Tuple[int, int]:
+        """
+        Prompt tokens and provider-cached prompt tokens from a usage report
+
+        DeepSeek reports prompt_cache_hit_tokens, OpenAI reports
+        prompt_tokens_details.cached_tokens.
+        """
+        if usage is None:
+            return 0, 0
+
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+        cached_tokens = getattr(usage, "prompt_cache_hit_tokens", None)
+        if cached_tokens is None:
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached_tokens = getattr(details, "cached_tokens", None) if details is not None else None
+
+        return prompt_tokens, cached_tokens or 0
+
+    def _route(self, model: LLMProvider) -> Tuple[APIKeyPool, Callable[..., Awaitable[Any]]]:
+        """Key pool and call function for a model"""
+        if model in [LLMProvider.DEEPSEEK_V3, LLMProvider.DEEPSEEK_CODER]:
+            pool = self.key_pools["deepseek"]
+            if not pool.keys:
+                raise ValueError("DeepSeek client not configured")
+            return pool, self._call_deepseek
+
+        if model in [LLMProvider.GPT4, LLMProvider.GPT4_VISION]:
+            pool = self.key_pools["openai"]
+            if not pool.keys:
+                raise ValueError("OpenAI client not configured")
+            return pool, self._call_openai
+
+        raise ValueError(f"Unsupported model: {model}")
+
+    async def _reserve(
+        self,
+        pool: APIKeyPool,
+        prompt: str,
+        system_message: Optional[str],
+        max_tokens: int,
+        priority: int
+    ) -> Tuple[PooledKey, Reservation]:
+        """Pick the least-loaded key and wait for its rate-limit capacity"""
+        estimated_tokens = (
+            len(prompt) + len(system_message or "")
+        ) // 4 + max_tokens
+        key = pool.select()
+
+        # Every key rate limited: wait for the first one back, within the deadline
+        wait = key.quarantined_until - time.monotonic()
+        if wait > 0:
+            remaining = remaining_time()
+            if remaining is not None and wait >= remaining:
+                raise DeadlineExceeded(
+                    f"Request deadline exceeded waiting for a {pool.provider} API key"
+                )
+            logger.info(f"All {pool.provider} API keys rate limited, waiting {wait:.1f}s")
+            await asyncio.sleep(wait)
+
+        # Don't queue for rate-limit capacity past the request deadline
+        check_deadline("LLM call")
+        try:
+            reservation = await asyncio.wait_for(
+                key.limiter.acquire(estimated_tokens, priority),
+                timeout=remaining_time()
+            )
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded("Request deadline exceeded while queued for LLM rate limit")
+
+        return key, reservation
+
     async def _call_deepseek(
         self,
+        client: openai.AsyncOpenAI,
         prompt: str,
         model: str,
         temperature: float,
         max_tokens: int,
         response_format: Optional[Dict] = None,
         system_message: Optional[str] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
         **kwargs
     ):
         """Call DeepSeek API"""
@@ -164,22 +552,30 @@ class LLMService:
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
+            "timeout": timeout,
         }
 
+        if stream:
+            completion_kwargs["stream"] = True
+            completion_kwargs["stream_options"] = {"include_usage": True}
+
         # DeepSeek supports JSON mode
         if response_format and response_format.get("type") == "json_object":
             completion_kwargs["response_format"] = {"type": "json_object"}
 
-        return await self.deepseek_client.chat.completions.create(**completion_kwargs)
+        return await client.chat.completions.create(**completion_kwargs)
 
     async def _call_openai(
         self,
+        client: openai.AsyncOpenAI,
         prompt: str,
         model: str,
         temperature: float,
         max_tokens: int,
         response_format: Optional[Dict] = None,
         system_message: Optional[str] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
         **kwargs
     ):
         """Call OpenAI API"""
@@ -198,13 +594,18 @@ class LLMService:
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
+            "timeout": timeout,
         }
 
+        if stream:
+            completion_kwargs["stream"] = True
+            completion_kwargs["stream_options"] = {"include_usage": True}
+
         # OpenAI also supports JSON mode
         if response_format and response_format.get("type") == "json_object":
             completion_kwargs["response_format"] = {"type": "json_object"}
 
-        return await self.openai_client.chat.completions.create(**completion_kwargs)
+        return await client.chat.completions.create(**completion_kwargs)
 
     async def batch_complete(
         self,
@@ -232,6 +633,18 @@ class LLMService:
 
         return await asyncio.gather(*tasks)
 
+    def is_configured(self, model: LLMProvider) -> bool:
+        """Whether the model's provider has at least one API key"""
+        if model in [LLMProvider.DEEPSEEK_V3, LLMProvider.DEEPSEEK_CODER]:
+            return bool(self.key_pools["deepseek"].keys)
+        if model in [LLMProvider.GPT4, LLMProvider.GPT4_VISION]:
+            return bool(self.key_pools["openai"].keys)
+        return False
+
+    def get_rate_limit_stats(self) -> Dict[str, Any]:
+        """Get key health and admission/queueing stats per provider"""
+        return {name: pool.get_stats() for name, pool in self.key_pools.items()}
+
     async def complete_with_fallback(
         self,
         prompt: str,
@@ -240,25 +653,22 @@ class LLMService:
         **kwargs
     ) -> str:
         """
-        Try primary model, fallback to secondary if fails
+        Call the primary model, hedging to the fallback when it is slow or failing
+
+        The fallback is called as soon as the primary fails or exceeds its
+        recent p95 latency; the first valid response wins and the other
+        call is cancelled. Models whose circuit breaker is open are skipped.
 
         Args:
             prompt: The prompt
             primary_model: Primary LLM to try
-            fallback_model: Fallback LLM if primary fails
+            fallback_model: Fallback LLM for hedging
             **kwargs: Additional arguments
 
         Returns:
             str: Generated response
         """
-        try:
-            return await self.complete(prompt, model=primary_model, **kwargs)
-        except Exception as e:
-            logger.warning(
-                f"Primary model {primary_model.value} failed: {e}. "
-                f"Falling back to {fallback_model.value}"
-            )
-            return await self.complete(prompt, model=fallback_model, **kwargs)
+        return await self.router.complete(prompt, primary_model, fallback_model, **kwargs)
 
 
 class LLMMetrics:
@@ -271,16 +681,63 @@ class LLMMetrics:
         self.total_latency = 0.0
         self.total_tokens = 0
         self.total_cost = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.total_prompt_tokens = 0
+        self.total_cached_tokens = 0
+        self.streamed_requests = 0
+        self.streams_stopped_early = 0
+        self.total_time_to_first_token = 0.0
+        self.first_token_samples = 0
 
         # Per-model metrics
         self.model_stats: Dict[str, Dict[str, Any]] = {}
 
+    def _get_model_stats(self, model: LLMProvider) -> Dict[str, Any]:
+        """Get (or create) per-model stats"""
+        model_key = model.value
+        if model_key not in self.model_stats:
+            self.model_stats[model_key] = {
+                "requests": 0,
+                "successes": 0,
+                "failures": 0,
+                "total_latency": 0.0,
+                "total_tokens": 0,
+                "total_cost": 0.0,
+                "prompt_tokens": 0,
+                "cached_prompt_tokens": 0,
+                "cache_hits": 0,
+                "cache_misses": 0
+            }
+        return self.model_stats[model_key]
+
+    def record_cache(self, model: LLMProvider, hit: bool):
+        """Record a response cache lookup"""
+        stats = self._get_model_stats(model)
+        if hit:
+            self.cache_hits += 1
+            stats["cache_hits"] += 1
+        else:
+            self.cache_misses += 1
+            stats["cache_misses"] += 1
+
+    def record_stream(self, time_to_first_token: Optional[float], stopped_early: bool):
+        """Record a streamed completion"""
+        self.streamed_requests += 1
+        if stopped_early:
+            self.streams_stopped_early += 1
+        if time_to_first_token is not None:
+            self.total_time_to_first_token += time_to_first_token
+            self.first_token_samples += 1
+
     async def record(
         self,
         model: LLMProvider,
         latency: float,
         tokens_used: int = 0,
-        success: bool = True
+        success: bool = True,
+        prompt_tokens: int = 0,
+        cached_tokens: int = 0
     ):
         """Record metrics for an LLM call"""
         self.total_requests += 1
@@ -292,43 +749,46 @@ class LLMMetrics:
 
         self.total_latency += latency
         self.total_tokens += tokens_used
+        self.total_prompt_tokens += prompt_tokens
+        self.total_cached_tokens += cached_tokens
 
         # Estimate cost
-        cost = self._estimate_cost(model, tokens_used)
+        cost = self._estimate_cost(model, tokens_used, prompt_tokens, cached_tokens)
         self.total_cost += cost
 
         # Per-model stats
-        model_key = model.value
-        if model_key not in self.model_stats:
-            self.model_stats[model_key] = {
-                "requests": 0,
-                "successes": 0,
-                "failures": 0,
-                "total_latency": 0.0,
-                "total_tokens": 0,
-                "total_cost": 0.0
-            }
-
-        stats = self.model_stats[model_key]
+        stats = self._get_model_stats(model)
         stats["requests"] += 1
         stats["successes"] += 1 if success else 0
         stats["failures"] += 0 if success else 1
         stats["total_latency"] += latency
         stats["total_tokens"] += tokens_used
+        stats["prompt_tokens"] += prompt_tokens
+        stats["cached_prompt_tokens"] += cached_tokens
         stats["total_cost"] += cost
 
-    def _estimate_cost(self, model: LLMProvider, tokens: int) -> float:
+    def _estimate_cost(
+        self,
+        model: LLMProvider,
+        tokens: int,
+        prompt_tokens: int = 0,
+        cached_tokens: int = 0
+    ) -> float:
         """
         Estimate cost based on model and tokens
 
         Pricing (as of 2025):
-        - DeepSeek-V3: $0.14/M input, $0.28/M output
+        - DeepSeek-V3: $0.14/M input ($0.014/M cached), $0.28/M output
         - GPT-4 Turbo: $10/M input, $30/M output
         - Claude 3.5: $3/M input, $15/M output
         """
-        # Assume 60/40 split input/output
-        input_tokens = tokens * 0.6
-        output_tokens = tokens * 0.4
+        if prompt_tokens:
+            input_tokens = prompt_tokens
+            output_tokens = max(tokens - prompt_tokens, 0)
+        else:
+            # Assume 60/40 split input/output
+            input_tokens = tokens * 0.6
+            output_tokens = tokens * 0.4
 
         pricing = {
             LLMProvider.DEEPSEEK_V3: (0.14, 0.28),
@@ -338,9 +798,18 @@ class LLMMetrics:
             LLMProvider.CLAUDE: (3.0, 15.0),
         }
 
+        # Price of provider-cached prompt tokens relative to regular input
+        cached_ratio = {
+            LLMProvider.DEEPSEEK_V3: 0.1,
+            LLMProvider.DEEPSEEK_CODER: 0.1,
+        }
+
         if model in pricing:
             input_price, output_price = pricing[model]
-            return (input_tokens / 1_000_000 * input_price) + \
+            cached_tokens = min(cached_tokens, input_tokens)
+            uncached_tokens = input_tokens - cached_tokens
+            return (uncached_tokens / 1_000_000 * input_price) + \
+                   (cached_tokens / 1_000_000 * input_price * cached_ratio.get(model, 1.0)) + \
                    (output_tokens / 1_000_000 * output_price)
 
         return 0.0
@@ -348,6 +817,7 @@ class LLMMetrics:
     def get_summary(self) -> Dict[str, Any]:
         """Get summary of all metrics"""
         avg_latency = self.total_latency / self.total_requests if self.total_requests > 0 else 0
+        cache_lookups = self.cache_hits + self.cache_misses
 
         return {
             "total_requests": self.total_requests,
@@ -357,6 +827,21 @@ class LLMMetrics:
             "average_latency": avg_latency,
             "total_tokens": self.total_tokens,
             "total_cost_usd": self.total_cost,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_rate": self.cache_hits / cache_lookups if cache_lookups > 0 else 0,
+            "prompt_tokens": self.total_prompt_tokens,
+            "cached_prompt_tokens": self.total_cached_tokens,
+            "prompt_cache_hit_rate": (
+                self.total_cached_tokens / self.total_prompt_tokens
+                if self.total_prompt_tokens > 0 else 0
+            ),
+            "streamed_requests": self.streamed_requests,
+            "streams_stopped_early": self.streams_stopped_early,
+            "average_time_to_first_token": (
+                self.total_time_to_first_token / self.first_token_samples
+                if self.first_token_samples > 0 else 0
+            ),
             "model_stats": self.model_stats
         }
 
@@ -0,0 +1,190 @@
+"""
+Rate Limiter - Request/token rate limiting with priority admission
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 60.0
+
+
+class Reservation:
+    """An admitted call holding a concurrency slot and window capacity"""
+
+    def __init__(self, tokens: int, admitted_at: float, wait_time: float):
+        self.tokens = tokens
+        self.admitted_at = admitted_at
+        self.wait_time = wait_time
+        self.released = False
+
+
+class RateLimiter:
+    """
+    Smooth admission control for a rate-limited API
+
+    - Requests-per-minute and tokens-per-minute over a sliding 60s window
+    - Concurrency cap
+    - Waiting calls are admitted highest priority first (FIFO within a
+      priority), so urgent scrapes are not stuck behind bulk jobs
+
+    Limits of 0 disable the corresponding check.
+    """
+
+    def __init__(self, name: str, rpm: int = 0, tpm: int = 0, max_concurrency: int = 0):
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+
+        self._window: Deque[Reservation] = deque()
+        self._window_tokens = 0
+        self._in_flight = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future, int]] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        # Metrics
+        self.admitted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def acquire(self, tokens: int, priority: int = 1) -> Reservation:
+        """
+        Wait until the call can be admitted
+
+        Args:
+            tokens: Estimated tokens (prompt + max output)
+            priority: Higher values are admitted first
+
+        Returns:
+            Reservation: Pass to release() when the call finishes
+        """
+        queued_at = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (-priority, next(self._sequence), future, tokens))
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Admitted just as the caller was cancelled: give the slot back
+            if future.done() and not future.cancelled():
+                self.release(future.result())
+            raise
+
+        reservation: Reservation = future.result()
+        reservation.wait_time = reservation.admitted_at - queued_at
+
+        self.total_wait += reservation.wait_time
+        self.max_wait = max(self.max_wait, reservation.wait_time)
+        if reservation.wait_time > 1.0:
+            logger.info(
+                f"Rate limiter [{self.name}]: admitted after {reservation.wait_time:.2f}s "
+                f"(priority {priority}, queue {len(self._waiters)})"
+            )
+
+        return reservation
+
+    def release(self, reservation: Reservation, actual_tokens: Optional[int] = None):
+        """
+        Release a reservation
+
+        Args:
+            reservation: Reservation from acquire()
+            actual_tokens: Tokens actually used, to correct the estimate
+        """
+        if reservation.released:
+            return
+        reservation.released = True
+        self._in_flight -= 1
+
+        if actual_tokens is not None and reservation in self._window:
+            self._window_tokens += actual_tokens - reservation.tokens
+            reservation.tokens = actual_tokens
+
+        self._dispatch()
+
+    def _prune(self, now: float):
+        """Drop reservations that left the sliding window"""
+        while self._window and now - self._window[0].admitted_at >= WINDOW_SECONDS:
+            expired = self._window.popleft()
+            self._window_tokens -= expired.tokens
+
+    def _dispatch(self):
+        """Admit waiting calls while capacity allows"""
+        now = time.monotonic()
+        self._prune(now)
+
+        while self._waiters:
+            _, _, future, tokens = self._waiters[0]
+
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+
+            if self.max_concurrency and self._in_flight >= self.max_concurrency:
+                # release() dispatches again
+                return
+
+            rate_limited = (
+                (self.rpm and len(self._window) >= self.rpm)
+                or (self.tpm and self._window and self._window_tokens + tokens > self.tpm)
+            )
+            if rate_limited:
+                self._schedule(self._window[0].admitted_at + WINDOW_SECONDS - now)
+                return
+
+            heapq.heappop(self._waiters)
+            reservation = Reservation(tokens, now, 0.0)
+            self._window.append(reservation)
+            self._window_tokens += tokens
+            self._in_flight += 1
+            self.admitted += 1
+            future.set_result(reservation)
+
+    def _schedule(self, delay: float):
+        """Re-run dispatch when window capacity frees up"""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(max(delay, 0.01), self._dispatch)
+
+    def load(self) -> float:
+        """
+        Current utilisation: 0 when idle, 1 when a limit is reached, plus
+        one per queued call
+
+        Used to pick the least-loaded of several limiters.
+        """
+        self._prune(time.monotonic())
+        usage = [0.0]
+        if self.max_concurrency:
+            usage.append(self._in_flight / self.max_concurrency)
+        if self.rpm:
+            usage.append(len(self._window) / self.rpm)
+        if self.tpm:
+            usage.append(self._window_tokens / self.tpm)
+
+        queued = sum(1 for _, _, f, _ in self._waiters if not f.done())
+        return max(usage) + queued
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics"""
+        self._prune(time.monotonic())
+        return {
+            "rpm_limit": self.rpm,
+            "tpm_limit": self.tpm,
+            "max_concurrency": self.max_concurrency,
+            "requests_in_window": len(self._window),
+            "tokens_in_window": self._window_tokens,
+            "in_flight": self._in_flight,
+            "queued": sum(1 for _, _, f, _ in self._waiters if not f.done()),
+            "admitted": self.admitted,
+            "average_wait": self.total_wait / self.admitted if self.admitted > 0 else 0,
+            "max_wait": self.max_wait,
+        }
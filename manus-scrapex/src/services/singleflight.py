@@ -0,0 +1,79 @@
+"""
+Singleflight - Coalesce concurrent identical async operations
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """An in-flight operation and the number of callers awaiting it"""
+
+    def __init__(self, task: "asyncio.Task[Any]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Concurrent calls with the same key share one execution
+
+    The first caller starts the operation as a task; callers arriving
+    while it runs await the same task. The task is cancelled only when
+    every caller waiting on it has been cancelled, so one client giving
+    up does not fail the others.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[str, _Call] = {}
+
+        # Metrics
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn once per key among concurrent callers
+
+        Args:
+            key: Identity of the operation
+            fn: Zero-argument coroutine factory
+
+        Returns:
+            Result of the (shared) operation
+        """
+        self.calls += 1
+
+        call: Optional[_Call] = self._inflight.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._inflight[key] = call
+            call.task.add_done_callback(lambda _, c=call: self._release(key, c))
+        else:
+            self.coalesced += 1
+            logger.debug(f"Singleflight [{self.name}]: coalesced call for {key[:80]}")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+
+    def _release(self, key: str, call: _Call):
+        """Forget a finished call"""
+        if self._inflight.get(key) is call:
+            del self._inflight[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics"""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+            "coalesce_rate": self.coalesced / self.calls if self.calls > 0 else 0,
+        }
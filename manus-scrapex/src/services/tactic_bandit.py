@@ -0,0 +1,244 @@
+"""
+Tactic Bandit - Per-domain Thompson sampling over evasion tactics
+"""
+import json
+import logging
+import random
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..models.base import BlockType
+from ..config.settings import settings
+from .cache import CacheBackend, create_cache_backend
+
+logger = logging.getLogger(__name__)
+
+# Tactics a blocked page can try whatever was suggested, unless its block type rules them out
+GENERIC_TACTICS = [
+    {"tactic": "rotate_proxy", "priority": 1, "reasoning": "Get a fresh IP", "wait_time": 0},
+    {
+        "tactic": "change_headers", "priority": 2,
+        "reasoning": "Change client fingerprint", "wait_time": 0
+    },
+    {"tactic": "stealth_browser", "priority": 3, "reasoning": "Pass JS challenges", "wait_time": 5},
+    {"tactic": "wait", "priority": 4, "reasoning": "Cool down", "wait_time": 30},
+]
+
+# Generic tactics that cannot lift a block type (a new fingerprint doesn't lift an IP ban)
+RULED_OUT = {
+    BlockType.IP_BLOCK: {"change_headers", "stealth_browser"},
+    BlockType.RATE_LIMIT: {"change_headers", "stealth_browser"},
+    BlockType.RECAPTCHA: {"wait"},
+    BlockType.HCAPTCHA: {"wait"},
+    BlockType.FUNCAPTCHA: {"wait"},
+    BlockType.CAPTCHA_UNKNOWN: {"wait"},
+}
+
+# Expected seconds per attempt before any observation
+DEFAULT_LATENCY = {
+    "rotate_proxy": 3.0,
+    "change_headers": 2.0,
+    "stealth_browser": 15.0,
+    "solve_captcha": 30.0,
+}
+
+
+class TacticArm:
+    """Outcome statistics of one tactic on one domain"""
+
+    LATENCY_SMOOTHING = 0.3
+
+    def __init__(self, successes: int = 0, failures: int = 0, latency: Optional[float] = None):
+        self.successes = successes
+        self.failures = failures
+        self.latency = latency
+
+    def update(self, success: bool, latency: float):
+        if success:
+            self.successes += 1
+        else:
+            self.failures += 1
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.LATENCY_SMOOTHING * (latency - self.latency)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"successes": self.successes, "failures": self.failures, "latency": self.latency}
+
+
+class TacticBandit:
+    """
+    Thompson sampling over evasion tactics, per domain
+
+    Each tactic's success probability has a Beta posterior. Candidates are
+    ranked by a sampled success probability per second of expected cost
+    (measured latency plus a proxy surcharge), so tactics that work and are
+    cheap on a domain are tried first while others are still explored.
+    Until a domain has observations, the suggested tactics keep their
+    suggested order ahead of the generic ones. With a disk or redis
+    backend, domain statistics survive restarts.
+    """
+
+    MAX_DOMAINS = 10000
+
+    def __init__(
+        self,
+        backend: str = "memory",
+        ttl: Optional[int] = None,
+        rng: Optional[random.Random] = None
+    ):
+        self.backend_name = backend
+        self.ttl = ttl
+        self.rng = rng or random.Random()
+        self._backend: Optional[CacheBackend] = None
+        self._domains: "OrderedDict[str, Dict[str, TacticArm]]" = OrderedDict()
+        self.pulls = 0
+
+    @property
+    def backend(self) -> CacheBackend:
+        # Created on first use, so importing the module never touches disk
+        if self._backend is None:
+            self._backend = create_cache_backend(
+                self.backend_name,
+                namespace="tactic_bandit",
+                max_entries=self.MAX_DOMAINS,
+                ttl=self.ttl
+            )
+        return self._backend
+
+    async def _arms(self, domain: str) -> Dict[str, TacticArm]:
+        """Load a domain's arms from memory or the persistent backend"""
+        arms = self._domains.get(domain)
+        if arms is not None:
+            self._domains.move_to_end(domain)
+            return arms
+
+        arms = {}
+        try:
+            stored = await self.backend.get(domain)
+            if stored:
+                arms = {name: TacticArm(**data) for name, data in json.loads(stored).items()}
+        except Exception as e:
+            logger.warning(f"Failed to load tactic statistics for {domain}: {e}")
+
+        self._domains[domain] = arms
+        while len(self._domains) > self.MAX_DOMAINS:
+            self._domains.popitem(last=False)
+        return arms
+
+    def expected_cost(self, tactic: Dict[str, Any], arm: Optional[TacticArm]) -> float:
+        """Expected seconds-equivalent cost of one attempt"""
+        name = tactic.get("tactic", "")
+        if arm is not None and arm.latency is not None:
+            latency = arm.latency
+        elif name == "wait":
+            latency = float(tactic.get("wait_time", 60)) + 2.0
+        else:
+            latency = DEFAULT_LATENCY.get(name, 5.0)
+
+        if name == "rotate_proxy":
+            latency += settings.tactic_bandit_proxy_cost
+        return max(latency, 0.1)
+
+    async def rank(
+        self,
+        domain: str,
+        tactics: List[Dict[str, Any]],
+        block_type: Optional[BlockType] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Order candidate tactics for a blocked page
+
+        Suggested tactics get a prior pull towards their suggested order;
+        generic tactics the block type doesn't rule out are added as
+        candidates so they can be explored.
+
+        Args:
+            domain: Blocked domain
+            tactics: Suggested tactics, best first
+            block_type: Detected block type
+
+        Returns:
+            List: Tactics in the order to try them
+        """
+        ruled_out = RULED_OUT.get(block_type, set())
+        candidates: Dict[str, Dict[str, Any]] = {}
+        for tactic in tactics:
+            candidates.setdefault(tactic.get("tactic", ""), tactic)
+        for tactic in GENERIC_TACTICS:
+            if tactic["tactic"] not in ruled_out:
+                candidates.setdefault(tactic["tactic"], tactic)
+
+        arms = await self._arms(domain)
+        suggested = [tactic.get("tactic", "") for tactic in tactics]
+
+        # The cost term would swamp a one-pull prior: trust the suggestions
+        # until the domain has outcomes to learn from
+        observed = any(arm.successes or arm.failures for arm in arms.values())
+
+        def sample(name: str) -> float:
+            arm = arms.get(name) or TacticArm()
+            # Suggestions count as one prior success, the top one as two
+            prior = 0 if name not in suggested else (2 if suggested.index(name) == 0 else 1)
+            theta = self.rng.betavariate(1 + arm.successes + prior, 1 + arm.failures)
+            return theta / self.expected_cost(candidates[name], arms.get(name))
+
+        def order(name: str) -> Tuple[int, float]:
+            if not observed and name in suggested:
+                return suggested.index(name), 0.0
+            return len(suggested), -sample(name)
+
+        keys = {name: order(name) for name in candidates}
+        return sorted(candidates.values(), key=lambda tactic: keys[tactic.get("tactic", "")])
+
+    async def record(self, domain: str, tactic: str, success: bool, latency: float):
+        """
+        Update a tactic's statistics with an evasion outcome
+
+        Args:
+            domain: Blocked domain
+            tactic: Tactic name
+            success: Whether the tactic got an unblocked response
+            latency: Seconds the attempt took
+        """
+        arms = await self._arms(domain)
+        arm = arms.get(tactic)
+        if arm is None:
+            arm = arms[tactic] = TacticArm()
+        arm.update(success, latency)
+        self.pulls += 1
+
+        try:
+            await self.backend.set(
+                domain, json.dumps({name: arm.to_dict() for name, arm in arms.items()})
+            )
+        except Exception as e:
+            logger.warning(f"Failed to persist tactic statistics for {domain}: {e}")
+
+    def get_domain_stats(self, domain: str) -> Dict[str, Any]:
+        """Statistics of every tactic tried on a loaded domain"""
+        return {name: arm.to_dict() for name, arm in self._domains.get(domain, {}).items()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Bandit statistics"""
+        totals: Dict[str, Dict[str, int]] = {}
+        for arms in self._domains.values():
+            for name, arm in arms.items():
+                total = totals.setdefault(name, {"successes": 0, "failures": 0})
+                total["successes"] += arm.successes
+                total["failures"] += arm.failures
+
+        return {
+            "backend": self.backend_name,
+            "domains": len(self._domains),
+            "pulls": self.pulls,
+            "tactics": totals,
+        }
+
+
+# Global instance
+tactic_bandit = TacticBandit(
+    backend=settings.tactic_bandit_backend,
+    ttl=settings.tactic_bandit_ttl
+)
@@ -0,0 +1,266 @@
+"""
+Batch Validation - Vectorised schema and business checks over columnar batches
+"""
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+from .schema_compiler import CompiledSchema, EMAIL_PATTERN
+
+NUMERIC_KINDS = "biuf"
+
+
+class BatchValidationResult:
+    """
+    Per-row outcome of a batch validation
+
+    Each check that fired at least once has a boolean mask over the rows,
+    keyed "field:check" (e.g. "price:invalid_value"). Error masks make a
+    row invalid; warning masks do not.
+    """
+
+    def __init__(
+        self,
+        rows: int,
+        error_masks: Dict[str, np.ndarray],
+        warning_masks: Dict[str, np.ndarray]
+    ):
+        self.rows = rows
+        self.error_masks = error_masks
+        self.warning_masks = warning_masks
+
+        invalid = np.zeros(rows, dtype=bool)
+        for mask in error_masks.values():
+            invalid |= mask
+        self.valid = ~invalid
+
+    @property
+    def valid_count(self) -> int:
+        return int(self.valid.sum())
+
+    def row_issues(self, row: int) -> Dict[str, List[str]]:
+        """Checks that failed for one row"""
+        return {
+            "errors": [key for key, mask in self.error_masks.items() if mask[row]],
+            "warnings": [key for key, mask in self.warning_masks.items() if mask[row]],
+        }
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Counts per check"""
+        return {
+            "rows": self.rows,
+            "valid": self.valid_count,
+            "invalid": self.rows - self.valid_count,
+            "errors": {key: int(mask.sum()) for key, mask in self.error_masks.items()},
+            "warnings": {key: int(mask.sum()) for key, mask in self.warning_masks.items()},
+        }
+
+
+def columns_from_records(
+    records: Iterable[Dict[str, Any]],
+    fields: Optional[Iterable[str]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Convert row records to object columns
+
+    Missing keys become None. Without `fields`, the columns are the union
+    of record keys in first-seen order.
+    """
+    records = list(records)
+    if fields is None:
+        fields = list(dict.fromkeys(key for record in records for key in record))
+
+    return {
+        field: np.array([record.get(field) for record in records], dtype=object)
+        for field in fields
+    }
+
+
+class _Column:
+    """A column with its null, type and numeric views computed once"""
+
+    def __init__(self, values: Any, rows: int):
+        if hasattr(values, "to_numpy"):
+            # pyarrow / pandas; nulls come back as None or NaN
+            values = (
+                values.to_numpy(zero_copy_only=False) if _is_arrow(values) else values.to_numpy()
+            )
+        array = np.asarray(values)
+        if array.ndim != 1 or len(array) != rows:
+            raise ValueError(f"Column has shape {array.shape}, expected ({rows},)")
+
+        self.array = array
+        self.dtype_kind = array.dtype.kind
+
+        if self.dtype_kind in NUMERIC_KINDS:
+            self.null = np.isnan(array) if self.dtype_kind == "f" else np.zeros(rows, dtype=bool)
+            self.types = None
+            self.numbers = array.astype(float)
+        elif self.dtype_kind == "U":
+            self.null = np.zeros(rows, dtype=bool)
+            self.types = None
+            self.numbers = np.full(rows, np.nan)
+        else:
+            array = array.astype(object)
+            self.array = array
+            self.types = np.fromiter((type(value) for value in array), dtype=object, count=rows)
+            self.null = np.fromiter((value is None for value in array), dtype=bool, count=rows)
+            numeric = self._is_type((int, float, bool)) & ~self.null
+            self.numbers = np.where(numeric, array, np.nan).astype(float)
+
+    def _is_type(self, expected: Any) -> np.ndarray:
+        """Rows whose Python type is (a subclass of) expected"""
+        expected = expected if isinstance(expected, tuple) else (expected,)
+        return np.fromiter(
+            (issubclass(value_type, expected) for value_type in self.types),
+            dtype=bool,
+            count=len(self.types)
+        )
+
+    def matches_type(self, expected: Any) -> np.ndarray:
+        """Rows whose value has the expected type (nulls count as matching)"""
+        expected_tuple = expected if isinstance(expected, tuple) else (expected,)
+
+        if self.dtype_kind in NUMERIC_KINDS:
+            if bool in expected_tuple and self.dtype_kind == "b":
+                return np.ones(len(self.array), dtype=bool)
+            if float in expected_tuple:
+                return np.ones(len(self.array), dtype=bool)
+            if int in expected_tuple:
+                # Nullable int columns arrive as float; integral values are ints
+                return self.null | (self.numbers == np.floor(self.numbers))
+            return self.null.copy()
+
+        if self.dtype_kind == "U":
+            return np.full(len(self.array), str in expected_tuple)
+
+        return self.null | self._is_type(expected_tuple)
+
+    def strings(self, non_empty: bool = False) -> np.ndarray:
+        """Mask of string values"""
+        if self.dtype_kind == "U":
+            is_string = np.ones(len(self.array), dtype=bool)
+        elif self.types is None:
+            return np.zeros(len(self.array), dtype=bool)
+        else:
+            is_string = self.types == str
+        if non_empty:
+            is_string &= self.array != ""
+        return is_string
+
+    def string_test(self, test, mask: np.ndarray) -> np.ndarray:
+        """Apply a string predicate to the masked rows"""
+        result = np.zeros(len(self.array), dtype=bool)
+        indices = np.flatnonzero(mask)
+        if len(indices):
+            result[indices] = np.fromiter(
+                (bool(test(str(value))) for value in self.array[indices]),
+                dtype=bool,
+                count=len(indices)
+            )
+        return result
+
+
+def _is_arrow(values: Any) -> bool:
+    return type(values).__module__.startswith("pyarrow")
+
+
+def validate_columns(
+    plan: CompiledSchema,
+    columns: Mapping[str, Any]
+) -> BatchValidationResult:
+    """
+    Run the compiled schema's checks over a columnar batch
+
+    Mirrors CompiledSchema.validate row by row, with one exception: in
+    numeric columns an integral float counts as an int, since nullable
+    integer columns are stored as floats.
+
+    Args:
+        plan: Compiled schema
+        columns: field -> NumPy array, Arrow array or sequence, all of equal length
+
+    Returns:
+        BatchValidationResult: Per-row error and warning masks
+    """
+    rows = len(next(iter(columns.values()))) if columns else 0
+    views = {field: _Column(values, rows) for field, values in columns.items()}
+
+    errors: Dict[str, np.ndarray] = {}
+    warnings: Dict[str, np.ndarray] = {}
+
+    def flag(target: Dict[str, np.ndarray], key: str, mask: np.ndarray):
+        if mask.any():
+            target[key] = target[key] | mask if key in target else mask
+
+    # Schema checks
+    for field in plan.fields:
+        column = views.get(field.name)
+        if column is None:
+            if field.required:
+                flag(errors, f"{field.name}:missing_required", np.ones(rows, dtype=bool))
+            continue
+
+        if field.required:
+            flag(errors, f"{field.name}:required_null", column.null)
+
+        if field.expected is not None:
+            flag(errors, f"{field.name}:type_mismatch", ~column.matches_type(field.expected))
+
+        if field.range:
+            min_val, max_val = field.range
+            with np.errstate(invalid="ignore"):
+                outside = (column.numbers < min_val) | (column.numbers > max_val)
+            flag(warnings, f"{field.name}:out_of_range", outside)
+
+        if field.pattern is not None:
+            is_string = column.strings()
+            flag(
+                warnings,
+                f"{field.name}:pattern",
+                is_string & ~column.string_test(field.pattern.match, is_string)
+            )
+
+    # Business logic checks
+    price = views.get("price")
+    if price is not None:
+        with np.errstate(invalid="ignore"):
+            flag(errors, "price:invalid_value", price.numbers <= 0)
+            flag(warnings, "price:unusually_high", price.numbers > 1000000)
+
+    discount = views.get("discount_price")
+    if price is not None and discount is not None:
+        with np.errstate(invalid="ignore"):
+            both = (price.numbers != 0) & (discount.numbers != 0)
+            flag(
+                warnings,
+                "discount_price:not_below_price",
+                both & (discount.numbers >= price.numbers)
+            )
+
+    rating = views.get("rating")
+    if rating is not None:
+        with np.errstate(invalid="ignore"):
+            flag(warnings, "rating:out_of_range", (rating.numbers < 0) | (rating.numbers > 5))
+
+    for field, column in views.items():
+        is_url, is_email = plan.kind(field)
+        if not (is_url or is_email):
+            continue
+        present = column.strings(non_empty=True)
+        if is_url:
+            flag(
+                warnings,
+                f"{field}:url_scheme",
+                present & ~column.string_test(
+                    lambda v: v.startswith(("http://", "https://")), present
+                )
+            )
+        if is_email:
+            flag(
+                warnings,
+                f"{field}:email_format",
+                present & ~column.string_test(EMAIL_PATTERN.match, present)
+            )
+
+    return BatchValidationResult(rows, errors, warnings)
@@ -0,0 +1,278 @@
+"""
+Block Detection - Indicator-based detection of anti-bot responses
+"""
+import re
+from typing import List, Mapping, Optional, Tuple
+
+from ..models.base import BlockType
+
+# (block type, confidence, matched indicators)
+BlockVerdict = Tuple[BlockType, float, List[str]]
+
+NO_BLOCK: BlockVerdict = (BlockType.NONE, 0.0, [])
+
+CLOUDFLARE_INDICATORS = [
+    "Checking your browser",
+    "cf-browser-verification",
+    "cf_clearance",
+    "Just a moment",
+    "ray ID",
+    "cloudflare"
+]
+
+CAPTCHA_INDICATORS = [
+    "recaptcha",
+    "hcaptcha",
+    "funcaptcha",
+    "I'm not a robot",
+    "g-recaptcha",
+    "h-captcha"
+]
+
+RATE_LIMIT_INDICATORS = [
+    "Too many requests",
+    "Rate limit exceeded",
+    "429",
+    "slow down"
+]
+
+# Markers only an interstitial carries; "cloudflare" or "recaptcha" alone are
+# also on real pages (cdnjs.cloudflare.com scripts, contact form widgets)
+CHALLENGE_MARKERS = [
+    "cf-browser-verification",
+    "/cdn-cgi/challenge-platform",
+    "_cf_chl_opt",
+]
+CHALLENGE_TITLE = re.compile(
+    r"<title>\s*(?:just a moment|attention required|checking your browser)", re.I
+)
+CAPTCHA_WIDGETS = [
+    ("g-recaptcha", BlockType.RECAPTCHA),
+    ("h-captcha", BlockType.HCAPTCHA),
+    ("funcaptcha", BlockType.FUNCAPTCHA),
+]
+
+
+def _lower_keys(headers: Optional[Mapping[str, str]]) -> dict:
+    return {key.lower(): value for key, value in (headers or {}).items()}
+
+
+def detect_block_from_headers(
+    status_code: Optional[int],
+    headers: Optional[Mapping[str, str]]
+) -> BlockVerdict:
+    """
+    Detect a block from the response status and headers alone
+
+    Cloudflare headers (cf-ray, server) are on every page the CDN serves,
+    so they only count together with a challenge status or cf-mitigated.
+
+    Args:
+        status_code: HTTP status code
+        headers: Response headers
+
+    Returns:
+        BlockVerdict
+    """
+    headers = _lower_keys(headers)
+
+    if headers.get("cf-mitigated", "").lower() == "challenge":
+        return BlockType.CLOUDFLARE, 0.95, ["cf-mitigated: challenge"]
+
+    behind_cloudflare = "cf-ray" in headers or "cloudflare" in headers.get("server", "").lower()
+    if behind_cloudflare and status_code in (403, 503):
+        return BlockType.CLOUDFLARE, 0.9, [f"HTTP {status_code} from Cloudflare"]
+
+    if status_code == 403:
+        return BlockType.IP_BLOCK, 0.9, ["HTTP 403 Forbidden"]
+
+    if status_code == 429:
+        return BlockType.RATE_LIMIT, 0.95, ["HTTP 429 Too Many Requests"]
+
+    return NO_BLOCK
+
+
+def detect_block(
+    html: Optional[str],
+    status_code: Optional[int],
+    headers: Optional[Mapping[str, str]]
+) -> BlockVerdict:
+    """
+    Detect a block from the response status, headers and body
+
+    Args:
+        html: Response body (or a prefix of it)
+        status_code: HTTP status code
+        headers: Response headers
+
+    Returns:
+        BlockVerdict
+    """
+    verdict = detect_block_from_headers(status_code, headers)
+    if verdict[0] != BlockType.NONE:
+        return verdict
+
+    html_lower = html.lower() if html else ""
+    indicators = []
+
+    # Cloudflare detection
+    if any(ind.lower() in html_lower for ind in CLOUDFLARE_INDICATORS):
+        indicators.extend([
+            ind for ind in CLOUDFLARE_INDICATORS
+            if ind.lower() in html_lower
+        ])
+        return BlockType.CLOUDFLARE, 0.9, indicators
+
+    # CAPTCHA detection
+    if any(ind in html_lower for ind in CAPTCHA_INDICATORS):
+        indicators.extend([
+            ind for ind in CAPTCHA_INDICATORS
+            if ind in html_lower
+        ])
+
+        # Determine CAPTCHA type
+        if 'recaptcha' in html_lower:
+            return BlockType.RECAPTCHA, 0.95, indicators
+        elif 'hcaptcha' in html_lower:
+            return BlockType.HCAPTCHA, 0.95, indicators
+        elif 'funcaptcha' in html_lower:
+            return BlockType.FUNCAPTCHA, 0.90, indicators
+        else:
+            return BlockType.CAPTCHA_UNKNOWN, 0.80, indicators
+
+    # DataDome
+    if 'datadome' in html_lower:
+        return BlockType.DATADOME, 0.9, ["DataDome detected"]
+
+    # PerimeterX
+    if '_px' in html_lower or 'perimeterx' in html_lower:
+        return BlockType.PERIMETER_X, 0.9, ["PerimeterX detected"]
+
+    # Rate limiting
+    if any(ind.lower() in html_lower for ind in RATE_LIMIT_INDICATORS):
+        indicators.extend([
+            ind for ind in RATE_LIMIT_INDICATORS
+            if ind.lower() in html_lower
+        ])
+        return BlockType.RATE_LIMIT, 0.85, indicators
+
+    return NO_BLOCK
+
+
+def detect_challenge(
+    html: Optional[str],
+    status_code: Optional[int],
+    headers: Optional[Mapping[str, str]],
+    complete: bool = False
+) -> BlockVerdict:
+    """
+    Detect a block certain enough to stop loading the page
+
+    Stricter than detect_block: a 2xx body counts only with a challenge
+    marker (cf-browser-verification, the challenge platform script, a
+    "Just a moment" title), or a captcha widget on a page that is short
+    overall. Non-2xx responses fall back to detect_block.
+
+    Args:
+        html: Response body (or a prefix of it)
+        status_code: HTTP status code
+        headers: Response headers
+        complete: Whether html is the whole body
+
+    Returns:
+        BlockVerdict
+    """
+    verdict = detect_block_from_headers(status_code, headers)
+    if verdict[0] != BlockType.NONE:
+        return verdict
+
+    if status_code is not None and not 200 <= status_code < 300:
+        return detect_block(html, status_code, headers)
+
+    html_lower = html.lower() if html else ""
+
+    markers = [marker for marker in CHALLENGE_MARKERS if marker in html_lower]
+    if CHALLENGE_TITLE.search(html_lower):
+        markers.append("challenge page title")
+    if markers:
+        return BlockType.CLOUDFLARE, 0.95, markers
+
+    if complete:
+        for marker, block_type in CAPTCHA_WIDGETS:
+            if marker in html_lower:
+                return block_type, 0.9, [f"{marker} widget on a short page"]
+
+    return NO_BLOCK
+
+
+class StreamingBlockDetector:
+    """
+    Decide whether a response is a block page while it is downloading
+
+    Engines check the headers as soon as they arrive and feed body chunks
+    as they are read; once a confident verdict is reached the download can
+    be aborted. Only the first `sniff_bytes` of the body are inspected, so
+    a real page costs one scan of its head. Bodies are judged with
+    detect_challenge, since a false positive loses the real page.
+    """
+
+    def __init__(
+        self,
+        status_code: Optional[int],
+        headers: Optional[Mapping[str, str]],
+        sniff_bytes: int = 16384,
+        min_confidence: float = 0.9,
+        encoding: str = "utf-8"
+    ):
+        self.status_code = status_code
+        self.headers = headers
+        self.sniff_bytes = sniff_bytes
+        self.min_confidence = min_confidence
+        self.encoding = encoding
+        self._prefix = bytearray()
+        self.decided = False
+
+    def check_headers(self) -> Optional[BlockVerdict]:
+        """Verdict from status and headers, or None if they are not conclusive"""
+        verdict = detect_block_from_headers(self.status_code, self.headers)
+        return verdict if self._confident(verdict) else None
+
+    def feed(self, chunk: bytes) -> Optional[BlockVerdict]:
+        """
+        Add a body chunk
+
+        Args:
+            chunk: Next bytes of the body
+
+        Returns:
+            Verdict once the head of the body shows a block, else None
+        """
+        if self.decided:
+            return None
+
+        self._prefix.extend(chunk)
+        if len(self._prefix) < self.sniff_bytes:
+            return None
+
+        return self.finish()
+
+    def finish(self) -> Optional[BlockVerdict]:
+        """Decide on whatever has been read so far (e.g. at end of body)"""
+        if self.decided:
+            return None
+        self.decided = True
+
+        verdict = detect_challenge(
+            self.prefix_text,
+            self.status_code,
+            self.headers,
+            complete=len(self._prefix) < self.sniff_bytes
+        )
+        return verdict if self._confident(verdict) else None
+
+    @property
+    def prefix_text(self) -> str:
+        return bytes(self._prefix[:self.sniff_bytes]).decode(self.encoding, errors="replace")
+
+    def _confident(self, verdict: BlockVerdict) -> bool:
+        return verdict[0] != BlockType.NONE and verdict[1] >= self.min_confidence
@@ -0,0 +1,131 @@
+"""
+Circuit Breaker - Stop calling a dependency that keeps failing
+"""
+import logging
+import time
+from enum import Enum
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is refused because the circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    - CLOSED: calls pass; failure_threshold consecutive failures open it
+    - OPEN: calls are refused for recovery_timeout seconds
+    - HALF_OPEN: a single probe call is admitted at a time; its success
+      closes the circuit, its failure re-opens it
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self.consecutive_failures = 0
+
+        # Metrics
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state (OPEN turns HALF_OPEN once the timeout has passed)"""
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+        return self._state
+
+    def _probe_in_flight(self) -> bool:
+        # A probe that never reported back stops counting after recovery_timeout
+        return (
+            self._probe_started is not None
+            and time.monotonic() - self._probe_started < self.recovery_timeout
+        )
+
+    def allow_request(self) -> bool:
+        """Whether a call may go through (half-open: only one probe)"""
+        state = self.state
+        if state == CircuitState.HALF_OPEN:
+            if self._probe_in_flight():
+                self.rejected += 1
+                return False
+            self._probe_started = time.monotonic()
+            logger.info(f"Circuit [{self.name}] half-open, sending probe")
+            return True
+        if state == CircuitState.OPEN:
+            self.rejected += 1
+            return False
+        return True
+
+    def retry_in(self) -> float:
+        """Seconds until a refused call could be admitted"""
+        now = time.monotonic()
+        if self.state == CircuitState.OPEN:
+            return max(self.recovery_timeout - (now - self._opened_at), 0.0)
+        if self._state == CircuitState.HALF_OPEN and self._probe_in_flight():
+            return max(self.recovery_timeout - (now - self._probe_started), 0.0)
+        return 0.0
+
+    def release(self):
+        """Give up the half-open probe slot without an outcome (e.g. the call never ran)"""
+        if self._state == CircuitState.HALF_OPEN:
+            self._probe_started = None
+
+    def record_success(self):
+        """Record a successful call"""
+        if self._state != CircuitState.CLOSED:
+            logger.info(f"Circuit [{self.name}] closed")
+        self._state = CircuitState.CLOSED
+        self._probe_started = None
+        self.consecutive_failures = 0
+
+    def record_failure(self):
+        """Record a failed call"""
+        self.consecutive_failures += 1
+        self._probe_started = None
+
+        if self.state == CircuitState.HALF_OPEN or (
+            self._state == CircuitState.CLOSED
+            and self.consecutive_failures >= self.failure_threshold
+        ):
+            self._open()
+
+    def _open(self):
+        """Trip the breaker"""
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+        logger.warning(
+            f"Circuit [{self.name}] opened after {self.consecutive_failures} "
+            f"consecutive failures, retrying in {self.recovery_timeout:.0f}s"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get breaker statistics"""
+        state = self.state
+        return {
+            "state": state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retry_in": self.retry_in(),
+        }
@@ -0,0 +1,130 @@
+"""
+JSON Stream - Incremental parsing of a JSON object as it is generated
+"""
+import json
+import logging
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalJSONParser:
+    """
+    Parse the top-level members of a JSON object from streamed text
+
+    Text is fed in arbitrary pieces; each member ("key": value) is decoded
+    as soon as the comma or closing brace after it arrives, so callers can
+    act on fields before the object is complete. Anything before the first
+    '{' (e.g. a markdown fence) and after the matching '}' is ignored.
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member: List[str] = []
+
+    def feed(self, text: str) -> Dict[str, Any]:
+        """
+        Consume more text
+
+        Args:
+            text: Next piece of the streamed response
+
+        Returns:
+            Dict: Members completed by this piece
+        """
+        completed: Dict[str, Any] = {}
+
+        for char in text:
+            if self.done:
+                break
+
+            if not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                self._member.append(char)
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete_member(completed)
+                    self.done = True
+                    continue
+            elif char == "," and self._depth == 1:
+                self._complete_member(completed)
+                continue
+
+            self._member.append(char)
+
+        return completed
+
+    def close(self) -> Dict[str, Any]:
+        """
+        Signal the end of the stream
+
+        Decodes a final member left open by a truncated response, if it
+        is itself complete.
+
+        Returns:
+            Dict: Members completed by closing
+        """
+        completed: Dict[str, Any] = {}
+        if self._started and not self.done and self._depth == 1 and not self._in_string:
+            self._complete_member(completed)
+        self.done = True
+        return completed
+
+    def _complete_member(self, completed: Dict[str, Any]):
+        """Decode the buffered member and reset the buffer"""
+        text = "".join(self._member).strip()
+        self._member = []
+        if not text:
+            return
+
+        try:
+            member = json.loads("{" + text + "}")
+        except json.JSONDecodeError:
+            logger.debug(f"Skipping malformed JSON member: {text[:80]}")
+            return
+
+        self.fields.update(member)
+        completed.update(member)
+
+
+def parse_json_object(text: str) -> Dict[str, Any]:
+    """
+    Parse the first JSON object embedded in text
+
+    Unlike a greedy regex, stops at the brace matching the first '{', and
+    keeps the well-formed members of a truncated or partly malformed object.
+
+    Args:
+        text: Text containing a JSON object
+
+    Returns:
+        Dict: Parsed members (empty if none)
+    """
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    parser.close()
+    return parser.fields
@@ -0,0 +1,65 @@
+"""
+Request context - Per-request values visible to every agent and service
+
+Values live in context variables, so they follow the request through
+awaits and into tasks it spawns without threading extra arguments
+through every agent.
+"""
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+# ScrapeRequest.priority (1-10, higher is more urgent)
+request_priority: ContextVar[int] = ContextVar("request_priority", default=1)
+
+# Absolute deadline of the current request (time.monotonic()), None = unbounded
+request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+# Ask the LLM again instead of serving cached responses (set once a result was rejected)
+llm_cache_refresh: ContextVar[bool] = ContextVar("llm_cache_refresh", default=False)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the current request has run out of time"""
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the request deadline (None without a deadline)"""
+    deadline = request_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline(stage: str = "request"):
+    """
+    Raise if the request deadline has passed
+
+    Args:
+        stage: Name of the step about to start (for the error message)
+
+    Raises:
+        DeadlineExceeded: If no time is left
+    """
+    remaining = remaining_time()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceeded(f"Request deadline exceeded before {stage}")
+
+
+def time_budget(timeout: float, stage: str = "request") -> float:
+    """
+    Clamp an operation timeout to the time left for the request
+
+    Args:
+        timeout: The operation's own timeout in seconds
+        stage: Name of the operation (for the error message)
+
+    Returns:
+        float: min(timeout, remaining time)
+
+    Raises:
+        DeadlineExceeded: If no time is left
+    """
+    check_deadline(stage)
+    remaining = remaining_time()
+    return timeout if remaining is None else min(timeout, remaining)
@@ -0,0 +1,106 @@
+"""
+Retry - Error-classified retries that respect the request deadline
+"""
+import asyncio
+import logging
+import random
+from typing import Any, Awaitable, Callable, Optional
+
+import aiohttp
+import openai
+
+from .request_context import DeadlineExceeded, remaining_time
+
+logger = logging.getLogger(__name__)
+
+# Transient HTTP statuses: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether an error is transient and worth retrying
+
+    Rate limits, timeouts, connection failures and 5xx responses are
+    retried. Configuration errors (ValueError), authentication and bad
+    requests, open circuits and exhausted deadlines are not.
+
+    Args:
+        error: Exception raised by the attempt
+
+    Returns:
+        bool: True if another attempt may succeed
+    """
+    if isinstance(error, DeadlineExceeded):
+        return False
+
+    if isinstance(
+        error, (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+    ):
+        return True
+
+    if isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ServerTimeoutError)):
+        return True
+
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+
+    status = getattr(error, "status_code", None) or getattr(error, "status", None)
+    return isinstance(status, int) and status in RETRYABLE_STATUS_CODES
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Server-requested delay (Retry-After header) carried by an error"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or getattr(error, "headers", None) or {}
+    try:
+        value = float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
+
+
+async def retry_async(
+    fn: Callable[[], Awaitable[Any]],
+    attempts: int = 3,
+    base_delay: float = 2.0,
+    max_delay: float = 10.0,
+    name: str = "operation"
+) -> Any:
+    """
+    Call fn, retrying retryable errors with exponential backoff
+
+    A retry is only made if the backoff fits in the time left before the
+    request deadline; otherwise the last error is raised immediately.
+
+    Args:
+        fn: Zero-argument coroutine factory
+        attempts: Maximum number of attempts
+        base_delay: Delay before the second attempt (doubles each time)
+        max_delay: Cap on the delay (a larger Retry-After is honoured)
+        name: Operation name for logging
+
+    Returns:
+        Result of fn
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt >= attempts or not is_retryable(e):
+                raise
+
+            delay = min(base_delay * 2 ** (attempt - 1), max_delay)
+            delay = max(delay, retry_after(e) or 0) + random.uniform(0, delay * 0.1)
+
+            remaining = remaining_time()
+            if remaining is not None and remaining <= delay:
+                logger.warning(
+                    f"{name} failed ({e}); {remaining:.1f}s left before deadline, not retrying"
+                )
+                raise
+
+            logger.warning(
+                f"{name} failed (attempt {attempt}/{attempts}): {e}. Retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
@@ -0,0 +1,376 @@
+"""
+Schema Compiler - Precompiled per-schema validation and coercion plans
+"""
+import json
+import logging
+import re
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..models.scraping import FieldDefinition, ValidationError
+
+logger = logging.getLogger(__name__)
+
+TYPE_MAP = {
+    "string": str,
+    "str": str,
+    "int": int,
+    "integer": int,
+    "float": (int, float),  # Allow int for float
+    "number": (int, float),
+    "bool": bool,
+    "boolean": bool,
+    "list": list,
+    "array": list,
+    "dict": dict,
+    "object": dict,
+}
+
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+NUMBER_PATTERN = re.compile(r'-?\d{1,3}(?:[ \u00a0]\d{3})+(?:[.,]\d+)?|-?\d[\d.,]*')
+TRUE_VALUES = frozenset(["true", "yes", "on"])
+FALSE_VALUES = frozenset(["false", "no", "off"])
+
+
+def parse_number(value: str) -> Optional[float]:
+    """
+    Parse a number from text such as a price
+
+    Currency symbols and surrounding text are ignored. Separators are
+    resolved per locale: the last of ',' / '.' is the decimal point when
+    both occur ("1.299,50", "1,299.50"); a lone separator followed by
+    exactly three digits is a thousands separator ("1,299").
+
+    Args:
+        value: Text containing a number
+
+    Returns:
+        float or None if the text has no number
+    """
+    match = NUMBER_PATTERN.search(value)
+    if not match:
+        return None
+
+    number = re.sub(r'\s', '', match.group(0)).rstrip('.,')
+    if ',' in number and '.' in number:
+        decimal = ',' if number.rfind(',') > number.rfind('.') else '.'
+        thousands = '.' if decimal == ',' else ','
+        number = number.replace(thousands, '').replace(decimal, '.')
+    else:
+        for separator in (',', '.'):
+            if separator in number:
+                parts = number.split(separator)
+                if len(parts) > 2 or len(parts[-1]) == 3:
+                    number = number.replace(separator, '')
+                else:
+                    number = number.replace(separator, '.')
+
+    try:
+        return float(number)
+    except ValueError:
+        return None
+
+
+def infer_value(value: str) -> Any:
+    """Infer a type for untyped text and convert it"""
+    if not value:
+        return None
+
+    value = value.strip()
+
+    try:
+        return int(value)
+    except ValueError:
+        pass
+
+    try:
+        # Remove currency symbols and commas
+        return float(value.replace('$', '').replace('€', '').replace(',', ''))
+    except ValueError:
+        pass
+
+    if value.lower() in TRUE_VALUES:
+        return True
+    if value.lower() in FALSE_VALUES:
+        return False
+
+    return value
+
+
+def _to_float(value: Any) -> Any:
+    if isinstance(value, str):
+        number = parse_number(value)
+        return value if number is None else number
+    return value
+
+
+def _to_int(value: Any) -> Any:
+    number = _to_float(value)
+    if isinstance(number, float) and number.is_integer():
+        return int(number)
+    return number
+
+
+def _to_bool(value: Any) -> Any:
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in TRUE_VALUES:
+            return True
+        if lowered in FALSE_VALUES:
+            return False
+    return value
+
+
+def _to_string(value: Any) -> Any:
+    return value.strip() if isinstance(value, str) else value
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _infer(value: Any) -> Any:
+    return infer_value(value) if isinstance(value, str) else value
+
+
+COERCERS: Dict[Any, Callable[[Any], Any]] = {
+    str: _to_string,
+    int: _to_int,
+    (int, float): _to_float,
+    bool: _to_bool,
+    list: _identity,
+    dict: _identity,
+}
+
+
+class CompiledField:
+    """Validation and coercion plan for one schema field"""
+
+    __slots__ = ("name", "type_name", "expected", "required", "pattern", "range", "coerce")
+
+    def __init__(self, name: str, defn: FieldDefinition):
+        self.name = name
+        self.type_name = defn.type
+        self.expected = TYPE_MAP.get(defn.type.lower())
+        self.required = defn.required
+        self.range = tuple(defn.range) if defn.range else None
+        self.coerce = COERCERS[self.expected] if self.expected is not None else _infer
+
+        self.pattern = None
+        if defn.pattern:
+            try:
+                self.pattern = re.compile(defn.pattern)
+            except re.error as e:
+                logger.warning(f"Ignoring invalid pattern for '{name}': {e}")
+
+
+class CompiledSchema:
+    """
+    Validation and coercion plan for a schema
+
+    Built once per schema; validating a record only runs the precompiled
+    checks (type tuples, compiled regexes, field-name classification).
+    """
+
+    def __init__(self, schema: Dict[str, FieldDefinition]):
+        self.fields = [CompiledField(name, defn) for name, defn in schema.items()]
+        self._by_name = {field.name: field for field in self.fields}
+        self._kinds: Dict[str, Tuple[bool, bool]] = {}
+        for field in self.fields:
+            self.kind(field.name)
+
+    def kind(self, name: str) -> Tuple[bool, bool]:
+        """(is_url, is_email) classification of a field name"""
+        kind = self._kinds.get(name)
+        if kind is None:
+            lowered = name.lower()
+            kind = ("url" in lowered, "email" in lowered)
+            self._kinds[name] = kind
+        return kind
+
+    def coerce(self, name: str, value: Any) -> Any:
+        """Convert a raw extracted value to the field's declared type"""
+        if value is None or value == "":
+            return None
+        field = self._by_name.get(name)
+        return field.coerce(value) if field else _infer(value)
+
+    def coerce_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Coerce every value of a record"""
+        return {name: self.coerce(name, value) for name, value in record.items()}
+
+    def validate(self, data: Dict[str, Any]) -> Tuple[List[ValidationError], List[str]]:
+        """
+        Run schema and business logic checks on a record
+
+        Args:
+            data: Extracted record
+
+        Returns:
+            Tuple of (errors, warnings)
+        """
+        errors, warnings = self._validate_schema(data)
+        logic_errors, logic_warnings = self._validate_business_logic(data)
+        return errors + logic_errors, warnings + logic_warnings
+
+    def _validate_schema(self, data: Dict[str, Any]) -> Tuple[List[ValidationError], List[str]]:
+        errors = []
+        warnings = []
+
+        for field in self.fields:
+            if field.name not in data:
+                if field.required:
+                    errors.append(ValidationError(
+                        field=field.name,
+                        error_type="missing_required",
+                        message=f"Required field '{field.name}' is missing",
+                        value=None
+                    ))
+                continue
+
+            value = data[field.name]
+
+            if value is None:
+                if field.required:
+                    errors.append(ValidationError(
+                        field=field.name,
+                        error_type="required_null",
+                        message=f"Required field '{field.name}' is null",
+                        value=None
+                    ))
+                continue
+
+            if field.expected is not None and not isinstance(value, field.expected):
+                errors.append(ValidationError(
+                    field=field.name,
+                    error_type="type_mismatch",
+                    message=f"Expected type {field.type_name}, got {type(value).__name__}",
+                    value=value
+                ))
+
+            if field.range and isinstance(value, (int, float)):
+                min_val, max_val = field.range
+                if not (min_val <= value <= max_val):
+                    warnings.append(
+                        f"{field.name}: Value {value} out of range [{min_val}, {max_val}]"
+                    )
+
+            if field.pattern is not None and isinstance(value, str):
+                if not field.pattern.match(value):
+                    warnings.append(
+                        f"{field.name}: Value doesn't match pattern {field.pattern.pattern}"
+                    )
+
+        return errors, warnings
+
+    def _validate_business_logic(
+        self,
+        data: Dict[str, Any]
+    ) -> Tuple[List[ValidationError], List[str]]:
+        errors = []
+        warnings = []
+
+        price = data.get("price")
+        if isinstance(price, (int, float)):
+            if price <= 0:
+                errors.append(ValidationError(
+                    field="price",
+                    error_type="invalid_value",
+                    message=f"Price must be positive, got {price}",
+                    value=price
+                ))
+            elif price > 1000000:
+                warnings.append(f"Unusually high price: {price}")
+
+        discount_price = data.get("discount_price")
+        if (
+            price and discount_price
+            and isinstance(price, (int, float)) and isinstance(discount_price, (int, float))
+            and discount_price >= price
+        ):
+            warnings.append(
+                f"Discount price ({discount_price}) should be less than "
+                f"regular price ({price})"
+            )
+
+        rating = data.get("rating")
+        if isinstance(rating, (int, float)) and not (0 <= rating <= 5):
+            warnings.append(f"Rating out of typical range [0-5]: {rating}")
+
+        url_warnings = []
+        email_warnings = []
+        for field, value in data.items():
+            if not value or not isinstance(value, str):
+                continue
+            is_url, is_email = self.kind(field)
+            if is_url and not value.startswith(("http://", "https://")):
+                url_warnings.append(f"{field}: URL doesn't start with http(s): {value}")
+            if is_email and not EMAIL_PATTERN.match(value):
+                email_warnings.append(f"{field}: Invalid email format: {value}")
+
+        return errors, warnings + url_warnings + email_warnings
+
+
+class SchemaCompiler:
+    """
+    Cache of compiled schemas
+
+    Plans are keyed by a fingerprint of the schema's content, so identical
+    schemas from separate requests share a plan and a schema (or one of
+    its field definitions) changed in place gets a fresh one.
+    """
+
+    MAX_SCHEMAS = 256
+
+    def __init__(self):
+        self._plans: "OrderedDict[str, CompiledSchema]" = OrderedDict()
+        self.hits = 0
+        self.compiled = 0
+
+    @staticmethod
+    def fingerprint(schema: Dict[str, FieldDefinition]) -> str:
+        """Stable key for a schema's content"""
+        return json.dumps(
+            [[name, defn.model_dump()] for name, defn in schema.items()],
+            sort_keys=True,
+            default=str
+        )
+
+    def compile(self, schema: Dict[str, FieldDefinition]) -> CompiledSchema:
+        """
+        Get the compiled plan for a schema
+
+        Args:
+            schema: Extraction schema
+
+        Returns:
+            CompiledSchema: Cached or newly compiled plan
+        """
+        key = self.fingerprint(schema)
+        plan = self._plans.get(key)
+        if plan is not None:
+            self.hits += 1
+            self._plans.move_to_end(key)
+            return plan
+
+        plan = CompiledSchema(schema)
+        self.compiled += 1
+        self._plans[key] = plan
+        while len(self._plans) > self.MAX_SCHEMAS:
+            self._plans.popitem(last=False)
+
+        return plan
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Compilation statistics"""
+        total = self.hits + self.compiled
+        return {
+            "schemas": len(self._plans),
+            "compiled": self.compiled,
+            "hits": self.hits,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# Global instance
+schema_compiler = SchemaCompiler()
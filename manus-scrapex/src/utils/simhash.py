@@ -0,0 +1,71 @@
+"""
+SimHash - Locality-sensitive fingerprints for near-duplicate detection
+"""
+import hashlib
+from typing import Iterable, List
+
+SIMHASH_BITS = 64
+
+
+def simhash(tokens: Iterable[str]) -> int:
+    """
+    Compute a 64-bit SimHash over tokens
+
+    Documents that share most tokens get fingerprints with a small
+    Hamming distance.
+
+    Args:
+        tokens: Document tokens (words or shingles)
+
+    Returns:
+        int: 64-bit fingerprint
+    """
+    weights = [0] * SIMHASH_BITS
+
+    for token in tokens:
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "big")
+        for bit in range(SIMHASH_BITS):
+            if value >> bit & 1:
+                weights[bit] += 1
+            else:
+                weights[bit] -= 1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints"""
+    return bin(a ^ b).count("1")
+
+
+def simhash_bands(fingerprint: int, bands: int = 4) -> List[int]:
+    """
+    Split a fingerprint into bands for indexing
+
+    Two fingerprints within distance < bands share at least one band
+    (pigeonhole), so band lookups find all near-duplicate candidates.
+
+    Args:
+        fingerprint: 64-bit fingerprint
+        bands: Number of bands
+
+    Returns:
+        List[int]: Band keys tagged with their band index
+    """
+    width = SIMHASH_BITS // bands
+    mask = (1 << width) - 1
+    return [(index << width) | (fingerprint >> (index * width) & mask) for index in range(bands)]
+
+
+def word_shingles(text: str, size: int = 2) -> List[str]:
+    """Overlapping word n-grams of text"""
+    words = text.split()
+    if len(words) < size:
+        return words
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
@@ -0,0 +1,42 @@
+"""
+URL helpers - Normalisation and domain extraction
+"""
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalise a URL so equivalent spellings compare equal
+
+    Lowercases scheme and host, drops default ports and the fragment,
+    and sorts query parameters.
+
+    Args:
+        url: URL to normalise
+
+    Returns:
+        str: Normalised URL
+    """
+    parts = urlsplit(str(url).strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    if parts.username:
+        credentials = parts.username
+        if parts.password:
+            credentials += f":{parts.password}"
+        netloc = f"{credentials}@{netloc}"
+
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+def get_domain(url: str) -> str:
+    """Lowercased host name of a URL (without port)"""
+    return (urlsplit(str(url)).hostname or "").lower()
@@ -1,10 +1,15 @@
 """
 Scraping Workflow - Orchestrates all agents and engines
 """
+import asyncio
 import logging
-from typing import Dict, Any
+import time
+from enum import Enum
+from typing import Dict, Any, NamedTuple, Optional, Tuple
 
-from ..models.scraping import ScrapeRequest, ScrapeResult, FieldDefinition
+from ..models.scraping import (
+    ScrapeRequest, ScrapeResult, ScrapingStrategy, FieldDefinition, ValidationResult
+)
 from ..models.base import TaskStatus, ScrapingEngine, BlockType
 from ..agents.dispatcher import dispatcher_agent
 from ..agents.antibot import antibot_agent
@@ -12,10 +17,46 @@ from ..agents.extractor import extractor_agent
 from ..agents.validator import validator_agent
 from ..engines.scrapy_engine import scrapy_engine
 from ..engines.playwright_engine import playwright_engine
+from ..services.singleflight import SingleFlight
+from ..services.domain_breaker import domain_breakers
+from ..services.content_gate import content_gate, GateVerdict
+from ..utils.urls import normalize_url, get_domain
+from ..utils.request_context import (
+    request_priority, request_deadline, remaining_time, check_deadline, time_budget,
+    DeadlineExceeded, llm_cache_refresh
+)
 from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Retry actions that can be served by re-extracting fields from the page we already have
+REEXTRACT_ACTIONS = ("re_extract", "switch_extraction_method")
+
+
+class WorkflowStage(str, Enum):
+    """Stages a retry can resume from"""
+    DISPATCH = "dispatch"
+    FETCH = "fetch"
+    EXTRACT = "extract"
+
+
+# Stage each RetryStrategy action resumes from
+RETRY_ACTION_STAGES = {
+    "retry": WorkflowStage.FETCH,
+    "switch_engine": WorkflowStage.FETCH,
+    "re_extract": WorkflowStage.EXTRACT,
+    "switch_extraction_method": WorkflowStage.EXTRACT,
+}
+
+
+class StageFailure(NamedTuple):
+    """A failed stage and where the retry should resume"""
+    stage: WorkflowStage
+    error: str
+    retryable: bool = True
+    engine: Optional[ScrapingEngine] = None  # Engine to switch to for the retry
+    result: Optional[ScrapeResult] = None  # Returned as-is when no retry is left
+
 
 class ScrapingWorkflow:
     """
@@ -25,6 +66,9 @@ class ScrapingWorkflow:
     def __init__(self):
         self.max_retries = settings.max_retries
 
+        # Concurrent fetches of the same page with the same strategy share one request
+        self.fetch_singleflight = SingleFlight("fetch")
+
     async def execute(self, request: ScrapeRequest) -> ScrapeResult:
         """
         Execute complete scraping workflow
@@ -37,91 +81,216 @@ class ScrapingWorkflow:
         5. Validate - Validate extracted data
         6. Retry - If needed, retry with adjusted strategy
 
+        The request runs under a deadline (request.deadline or
+        settings.request_deadline) that every agent and engine sees; retries
+        stop once too little time is left, and the request is abandoned
+        when the deadline passes.
+
         Args:
             request: Scrape request
 
         Returns:
             ScrapeResult: Final scraping result
         """
+        deadline = request.deadline or settings.request_deadline
+
+        try:
+            # Runs as its own task, so the context below doesn't leak to the caller
+            return await asyncio.wait_for(self._run(request, deadline), timeout=deadline)
+        except asyncio.TimeoutError:
+            logger.error(
+                f"=== Workflow for {request.url} exceeded its {deadline:.0f}s deadline ==="
+            )
+            return ScrapeResult(
+                url=request.url,
+                status=TaskStatus.FAILED,
+                error=f"Deadline exceeded ({deadline:.0f}s)"
+            )
+
+    async def _run(self, request: ScrapeRequest, deadline: float) -> ScrapeResult:
+        """
+        Workflow body, run under the request deadline
+
+        Runs as a state machine over dispatch -> fetch (scrape, anti-bot
+        check, content gate) -> extract (extract, validate). The output of
+        every stage is kept, and a retry resumes from the stage that needs
+        redoing: a validation failure fixed by re-extraction does not
+        re-dispatch or re-fetch, and an engine switch re-fetches with the
+        strategy already allocated.
+        """
         logger.info(f"=== Starting workflow for {request.url} ===")
 
+        # LLM calls made on behalf of this request are queued by its priority
+        request_priority.set(request.priority)
+        request_deadline.set(time.monotonic() + deadline)
+
+        domain = get_domain(request.url)
         retry_count = 0
+        # Retry strategy applied by the previous attempt, whose outcome is still unknown
+        pending_retry = None
+        # Engine forced for later attempts (engine switch, or a browser after an empty shell)
+        engine_override = None
+        # Extraction method for the next extract stage (None = settings default)
+        extraction_scored = None
+        extraction_strict = False
+
+        resume = WorkflowStage.DISPATCH
+        strategy = None
+        scrape_result = None
+        gate = None
 
         while retry_count <= self.max_retries:
+            # Whether this attempt holds a domain breaker slot (possibly the half-open probe)
+            admitted = False
             try:
-                # Step 1: Dispatch - Select strategy
-                logger.info(f"[1/5] Dispatching (attempt {retry_count + 1}/{self.max_retries + 1})")
-                strategy = await dispatcher_agent.dispatch(request)
-
-                # Step 2: Scrape - Execute scraping
-                logger.info(f"[2/5] Scraping with {strategy.engine.value}")
-                scrape_result = await self._execute_scraping(request.url, strategy)
-
-                if scrape_result.status == TaskStatus.FAILED:
-                    logger.error(f"Scraping failed: {scrape_result.error}")
-                    if retry_count < self.max_retries:
-                        retry_count += 1
-                        continue
-                    return scrape_result
-
-                # Step 3: Anti-Bot Check
-                logger.info("[3/5] Checking for anti-bot blocks")
-                block_analysis = await antibot_agent.analyze(
-                    html=scrape_result.html or "",
-                    status_code=200,  # Would get this from scrape_result
-                    headers=strategy.headers
-                )
+                # Hard-blocked domain: wait briefly for the circuit, else fail fast
+                if resume != WorkflowStage.EXTRACT and settings.domain_breaker_enabled:
+                    retry_in = domain_breakers.acquire(domain)
+                    if retry_in is not None:
+                        remaining = remaining_time()
+                        if retry_in <= settings.domain_breaker_max_park and (
+                            remaining is None or retry_in < remaining
+                        ):
+                            logger.info(f"Circuit open for {domain}, parking for {retry_in:.1f}s")
+                            await asyncio.sleep(max(retry_in, 0.1))
+                            continue
+                        return ScrapeResult(
+                            url=request.url,
+                            status=TaskStatus.FAILED,
+                            error=(
+                                f"Domain {domain} is blocking requests "
+                                f"(circuit open, retry in {retry_in:.0f}s)"
+                            ),
+                            retry_count=retry_count
+                        )
+                    admitted = True
 
-                if block_analysis.is_blocked:
-                    logger.warning(
-                        f"Block detected: {block_analysis.block_type.value} "
-                        f"(confidence: {block_analysis.confidence:.2f})"
+                # Step 1: Dispatch - Select strategy
+                if resume == WorkflowStage.DISPATCH:
+                    check_deadline("dispatch")
+                    logger.info(
+                        f"[1/5] Dispatching (attempt {retry_count + 1}/{self.max_retries + 1})"
                     )
+                    strategy = await dispatcher_agent.dispatch(request)
+                    resume = WorkflowStage.FETCH
+
+                if engine_override is not None and strategy.engine != engine_override:
+                    strategy.engine = engine_override
+                    strategy.javascript_enabled = engine_override == ScrapingEngine.PLAYWRIGHT
 
-                    # Try evasion
-                    if block_analysis.suggested_tactics:
-                        tactic = block_analysis.suggested_tactics[0]
-                        logger.info(f"Attempting evasion tactic: {tactic.get('tactic')}")
+                # Steps 2-3: Scrape, anti-bot check and content gate
+                if resume == WorkflowStage.FETCH:
+                    scrape_result, gate, failure = await self._fetch_stage(
+                        request, strategy, domain
+                    )
 
-                        evasion_result = await antibot_agent.evade(
+                    if failure is not None:
+                        if failure.engine is not None:
+                            engine_override = failure.engine
+                        if failure.retryable and self._can_retry(retry_count):
+                            retry_count += 1
+                            resume = failure.stage
+                            continue
+                        return failure.result or ScrapeResult(
                             url=request.url,
-                            block_type=block_analysis.block_type,
-                            current_strategy=strategy,
-                            tactic=tactic
+                            status=TaskStatus.FAILED,
+                            html=scrape_result.html,
+                            error=failure.error,
+                            strategy_used=strategy,
+                            retry_count=retry_count
                         )
-
-                        if evasion_result.success and evasion_result.html:
-                            # Update scrape result with evaded content
-                            scrape_result.html = evasion_result.html
-                            logger.info("Evasion successful!")
-                        else:
-                            logger.error(f"Evasion failed: {evasion_result.message}")
-                            if retry_count < self.max_retries:
-                                retry_count += 1
-                                continue
-                            return ScrapeResult(
-                                url=request.url,
-                                status=TaskStatus.FAILED,
-                                error=f"Blocked and evasion failed: {evasion_result.message}",
-                                retry_count=retry_count
-                            )
+                    resume = WorkflowStage.EXTRACT
 
                 # Step 4: Extract - Extract data
-                logger.info("[4/5] Extracting data")
-                extracted_data = await extractor_agent.extract(
-                    html=scrape_result.html or "",
-                    schema=request.schema
+                check_deadline("extraction")
+                logger.info(
+                    f"[4/5] Extracting data (attempt {retry_count + 1}/{self.max_retries + 1})"
                 )
+                if request.mode == "list":
+                    items = await extractor_agent.extract_list(
+                        html=scrape_result.html or "",
+                        schema=request.schema,
+                        item_selector=request.item_selector
+                    )
 
-                scrape_result.data = extracted_data
+                    scrape_result.items = items
+                    scrape_result.data = {"item_count": len(items)}
 
-                # Step 5: Validate - Validate extracted data
-                logger.info("[5/5] Validating data")
-                validation_result = await validator_agent.validate(
-                    data=extracted_data,
-                    schema=request.schema,
-                    html=scrape_result.html
-                )
+                    # Step 5: Validate - Validate each item
+                    logger.info("[5/5] Validating items")
+                    validation_result = await validator_agent.validate_items(
+                        items=items,
+                        schema=request.schema
+                    )
+                else:
+                    extraction = await extractor_agent.extract_result(
+                        html=scrape_result.html or "",
+                        schema=request.schema,
+                        scored=extraction_scored,
+                        strict=extraction_strict
+                    )
+                    extracted_data = extraction.data
+
+                    scrape_result.data = extracted_data
+
+                    # Step 5: Validate - Validate extracted data
+                    logger.info("[5/5] Validating data")
+                    validation_result = await validator_agent.validate(
+                        data=extracted_data,
+                        schema=request.schema,
+                        html=scrape_result.html,
+                        extraction=extraction,
+                        domain=domain
+                    )
+
+                if pending_retry is not None:
+                    validator_agent.record_retry_outcome(pending_retry, validation_result.valid)
+                    pending_retry = None
+
+                # Step 5b: Targeted re-extraction of failed fields (no re-fetch)
+                while (
+                    request.mode != "list"
+                    and self._needs_retry(validation_result)
+                    and self._can_retry(retry_count)
+                ):
+                    failed_fields = validator_agent.get_failed_fields(
+                        validation_result, request.schema
+                    )
+                    if not failed_fields:
+                        break
+
+                    retry_strategy = await validator_agent.suggest_retry_strategy(
+                        validation_result=validation_result,
+                        current_strategy=strategy,
+                        domain=domain
+                    )
+                    if not retry_strategy or retry_strategy.action not in REEXTRACT_ACTIONS:
+                        break
+
+                    retry_count += 1
+                    logger.info(
+                        f"Re-extracting {len(failed_fields)} field(s) "
+                        f"(reason: {retry_strategy.reason})"
+                    )
+                    # Ask the LLM again rather than replaying its rejected answer
+                    llm_cache_refresh.set(True)
+
+                    extracted_data = await extractor_agent.reextract_fields(
+                        html=scrape_result.html or "",
+                        schema=request.schema,
+                        data=extracted_data,
+                        fields=list(failed_fields),
+                        issues=failed_fields
+                    )
+                    scrape_result.data = extracted_data
+
+                    validation_result = await validator_agent.validate(
+                        data=extracted_data,
+                        schema=request.schema,
+                        html=scrape_result.html,
+                        domain=domain
+                    )
+                    validator_agent.record_retry_outcome(retry_strategy, validation_result.valid)
 
                 logger.info(
                     f"Validation: valid={validation_result.valid}, "
@@ -131,26 +300,48 @@ class ScrapingWorkflow:
                 )
 
                 # Check if we should retry
-                if not validation_result.valid or validation_result.overall_confidence < 0.6:
-                    if retry_count < self.max_retries:
+                if self._needs_retry(validation_result):
+                    if request.mode != "list":
+                        # Don't serve the rejected extraction from cache on retry
+                        await extractor_agent.invalidate_cache(
+                            scrape_result.html or "", request.schema
+                        )
+                    # Nor the LLM responses it was built from
+                    llm_cache_refresh.set(True)
+
+                    if self._can_retry(retry_count):
                         # Get retry strategy
                         retry_strategy = await validator_agent.suggest_retry_strategy(
                             validation_result=validation_result,
-                            current_strategy=strategy
+                            current_strategy=strategy,
+                            domain=domain
                         )
 
                         if retry_strategy:
+                            action = retry_strategy.action
+                            resume = RETRY_ACTION_STAGES.get(action, WorkflowStage.FETCH)
                             logger.info(
-                                f"Retrying with strategy: {retry_strategy.action} "
+                                f"Retrying with strategy: {action} from {resume.value} "
                                 f"(reason: {retry_strategy.reason})"
                             )
                             retry_count += 1
-
-                            # Apply modifications to request if needed
-                            if retry_strategy.action == "switch_engine":
-                                # Force different engine on next iteration
-                                # (Dispatcher will be called again)
-                                pass
+                            pending_retry = retry_strategy
+
+                            # Apply the strategy to the retained stage inputs
+                            if action == "switch_engine" and retry_strategy.new_engine:
+                                engine_override = retry_strategy.new_engine
+                            if action == "switch_extraction_method":
+                                # Evidence-backed extraction instead of the default method
+                                extraction_scored = True
+                                extraction_strict = False
+                            elif action == "re_extract":
+                                # Same page, stricter prompt (the LLM cache is refreshed too)
+                                extraction_scored = False
+                                extraction_strict = True
+
+                            wait_time = (retry_strategy.modifications or {}).get("wait_time")
+                            if wait_time and resume != WorkflowStage.EXTRACT:
+                                await asyncio.sleep(time_budget(wait_time, "retry wait"))
 
                             continue
                         else:
@@ -158,16 +349,30 @@ class ScrapingWorkflow:
                             logger.warning("Validation issues but no retry strategy available")
                             break
                     else:
-                        logger.warning("Max retries reached, accepting current result")
+                        logger.warning(
+                            "Max retries or time budget reached, accepting current result"
+                        )
                         break
                 else:
                     # Success!
+                    if gate is not None:
+                        content_gate.learn(domain, gate.features, request.mode)
                     logger.info("✓ Workflow completed successfully!")
                     break
 
+            except asyncio.CancelledError:
+                # Deadline hit mid-attempt
+                if admitted:
+                    domain_breakers.release(domain)
+                raise
+
             except Exception as e:
-                logger.error(f"Workflow error: {e}", exc_info=True)
-                if retry_count < self.max_retries:
+                # Retry resumes from the stage that raised, keeping earlier outputs
+                logger.error(f"Workflow error during {resume.value}: {e}", exc_info=True)
+                if admitted:
+                    # The probe never got an anti-bot verdict: let the next attempt probe
+                    domain_breakers.release(domain)
+                if not isinstance(e, DeadlineExceeded) and self._can_retry(retry_count):
                     retry_count += 1
                     continue
                 else:
@@ -189,7 +394,144 @@ class ScrapingWorkflow:
 
         return scrape_result
 
+    async def _fetch_stage(
+        self,
+        request: ScrapeRequest,
+        strategy: ScrapingStrategy,
+        domain: str
+    ) -> Tuple[ScrapeResult, Optional[GateVerdict], Optional[StageFailure]]:
+        """
+        Fetch the page, get past anti-bot blocks and check it is a content page
+
+        Returns:
+            Tuple of (scrape result, content gate verdict, failure or None)
+        """
+        # Step 2: Scrape - Execute scraping
+        check_deadline("scraping")
+        logger.info(f"[2/5] Scraping with {strategy.engine.value}")
+        scrape_result = await self._execute_scraping(request.url, strategy)
+
+        if scrape_result.status == TaskStatus.FAILED:
+            logger.error(f"Scraping failed: {scrape_result.error}")
+            if settings.domain_breaker_enabled:
+                domain_breakers.release(domain)
+            return scrape_result, None, StageFailure(
+                WorkflowStage.FETCH, scrape_result.error or "Scraping failed", result=scrape_result
+            )
+
+        # Step 3: Anti-Bot Check
+        logger.info("[3/5] Checking for anti-bot blocks")
+        block_analysis = await antibot_agent.analyze(
+            html=scrape_result.html or "",
+            status_code=scrape_result.status_code or 200,
+            headers=scrape_result.response_headers,
+            url=request.url,
+            engine=strategy.engine
+        )
+
+        if not block_analysis.is_blocked:
+            if settings.domain_breaker_enabled:
+                domain_breakers.record(domain, blocked=False)
+        else:
+            logger.warning(
+                f"Block detected: {block_analysis.block_type.value} "
+                f"(confidence: {block_analysis.confidence:.2f})"
+            )
+
+            # Try evasion
+            if block_analysis.suggested_tactics and settings.evasion_hedging_enabled:
+                evasion_result = await antibot_agent.evade_hedged(
+                    url=request.url,
+                    block_type=block_analysis.block_type,
+                    current_strategy=strategy,
+                    tactics=block_analysis.suggested_tactics
+                )
+            elif block_analysis.suggested_tactics:
+                tactic = block_analysis.suggested_tactics[0]
+                logger.info(f"Attempting evasion tactic: {tactic.get('tactic')}")
+
+                evasion_result = await antibot_agent.evade(
+                    url=request.url,
+                    block_type=block_analysis.block_type,
+                    current_strategy=strategy,
+                    tactic=tactic
+                )
+            else:
+                evasion_result = None
+
+            evaded = (
+                evasion_result is not None
+                and evasion_result.success and bool(evasion_result.html)
+            )
+            if settings.domain_breaker_enabled:
+                domain_breakers.record(domain, blocked=not evaded)
+
+            if evasion_result is not None:
+                if evaded:
+                    # Update scrape result with evaded content
+                    scrape_result.html = evasion_result.html
+                    logger.info("Evasion successful!")
+                else:
+                    logger.error(f"Evasion failed: {evasion_result.message}")
+                    # Re-dispatch for a fresh proxy and headers
+                    return scrape_result, None, StageFailure(
+                        WorkflowStage.DISPATCH,
+                        f"Blocked and evasion failed: {evasion_result.message}"
+                    )
+
+        # Step 3b: Content gate - don't pay the LLM for pages that aren't content
+        gate = None
+        if settings.content_gate_enabled:
+            gate = content_gate.check(
+                domain, scrape_result.html or "", request.schema, request.mode,
+                status_code=scrape_result.status_code
+            )
+            if not gate.passed:
+                logger.warning(f"Not a content page: {gate.reason}")
+                engine = (
+                    ScrapingEngine.PLAYWRIGHT
+                    if gate.action == "escalate" and strategy.engine != ScrapingEngine.PLAYWRIGHT
+                    else None
+                )
+                return scrape_result, gate, StageFailure(
+                    WorkflowStage.FETCH,
+                    f"Not a content page: {gate.reason}",
+                    retryable=gate.action != "fail",
+                    engine=engine
+                )
+
+        return scrape_result, gate, None
+
+    def _can_retry(self, retry_count: int) -> bool:
+        """Whether another attempt is allowed by the retry limit and the time left"""
+        if retry_count >= self.max_retries:
+            return False
+
+        remaining = remaining_time()
+        if remaining is not None and remaining < settings.retry_min_remaining:
+            logger.warning(f"Only {remaining:.1f}s left before deadline, not retrying")
+            return False
+
+        return True
+
+    def _needs_retry(self, validation_result: ValidationResult) -> bool:
+        """Whether validation results warrant another attempt"""
+        return not validation_result.valid or validation_result.overall_confidence < 0.6
+
     async def _execute_scraping(self, url: str, strategy) -> ScrapeResult:
+        """Execute scraping, coalescing identical in-flight fetches"""
+        key = (
+            f"{strategy.engine.value}:{int(strategy.javascript_enabled)}:"
+            f"{int(strategy.screenshot)}:{normalize_url(url)}"
+        )
+        result = await self.fetch_singleflight.do(
+            key, lambda: self._fetch(url, strategy)
+        )
+
+        # Callers mutate the result (html, data), so each gets its own copy
+        return result.model_copy(deep=True)
+
+    async def _fetch(self, url: str, strategy) -> ScrapeResult:
         """Execute scraping with selected engine"""
         if strategy.engine == ScrapingEngine.PLAYWRIGHT:
             return await playwright_engine.scrape(url, strategy)
@@ -0,0 +1,145 @@
+"""
+Unit tests for hedged evasion
+"""
+import asyncio
+import time
+import pytest
+from src.agents.antibot import AntiBotAgent
+from src.models.base import BlockType, ScrapingEngine
+from src.models.scraping import EvasionResult, ScrapingStrategy
+
+
+class TestHedgedEvasion:
+    """Test concurrent tactics with first-success-wins"""
+
+    @pytest.fixture
+    def agent(self, monkeypatch):
+        """Agent whose tactics are simulated with fixed delays and outcomes"""
+        monkeypatch.setattr("src.agents.antibot.settings.tactic_bandit_enabled", False)
+        monkeypatch.setattr("src.agents.antibot.settings.evasion_hedge_max_parallel", 2)
+        monkeypatch.setattr("src.agents.antibot.settings.evasion_hedge_max_tactics", 3)
+        monkeypatch.setattr("src.agents.antibot.settings.evasion_expensive_delay", 0.2)
+
+        agent = AntiBotAgent()
+        agent.outcomes = {}
+        agent.started = []
+        agent.cancelled = []
+
+        async def fake_execute(url, block_type, current_strategy, tactic):
+            name = tactic["tactic"]
+            delay, html = agent.outcomes[name]
+            agent.started.append((name, time.monotonic()))
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                agent.cancelled.append(name)
+                raise
+            return EvasionResult(success=html is not None, html=html, message=name)
+
+        monkeypatch.setattr(agent, "_execute_tactic", fake_execute)
+        return agent
+
+    @staticmethod
+    async def run(agent, *names):
+        return await agent.evade_hedged(
+            "https://shop.example/p/1",
+            BlockType.CLOUDFLARE,
+            ScrapingStrategy(engine=ScrapingEngine.SCRAPY),
+            [{"tactic": name} for name in names]
+        )
+
+    async def test_first_success_wins_and_rest_cancelled(self, agent):
+        """Test the fastest unblocked response is returned and slower tactics cancelled"""
+        agent.outcomes = {
+            "rotate_proxy": (0.5, "<html>slow</html>"),
+            "change_headers": (0.01, "<html>fast</html>"),
+        }
+
+        result = await self.run(agent, "rotate_proxy", "change_headers")
+
+        assert result.success
+        assert result.html == "<html>fast</html>"
+        assert agent.cancelled == ["rotate_proxy"]
+
+    async def test_challenge_page_is_not_a_success(self, agent):
+        """Test a 200 response that is still a challenge page does not win"""
+        agent.outcomes = {
+            "change_headers": (0.01, "<html>Just a moment...</html>"),
+            "rotate_proxy": (0.05, "<html>product</html>"),
+        }
+
+        result = await self.run(agent, "change_headers", "rotate_proxy")
+
+        assert result.html == "<html>product</html>"
+
+    async def test_expensive_tactic_delayed(self, agent):
+        """Test an expensive tactic waits for the delay while cheap ones are running"""
+        agent.outcomes = {
+            "rotate_proxy": (0.5, None),
+            "stealth_browser": (0.01, "<html>browser</html>"),
+        }
+
+        started = time.monotonic()
+        result = await self.run(agent, "rotate_proxy", "stealth_browser")
+
+        assert result.html == "<html>browser</html>"
+        browser_start = dict(agent.started)["stealth_browser"] - started
+        assert 0.15 <= browser_start < 0.45
+        assert agent.cancelled == ["rotate_proxy"]
+
+    async def test_cheap_tactic_not_held_behind_expensive_one(self, agent):
+        """Test a cheap tactic ranked below a deferred expensive one takes the free slot"""
+        agent.outcomes = {
+            "rotate_proxy": (0.5, None),
+            "stealth_browser": (0.01, None),
+            "change_headers": (0.05, "<html>headers</html>"),
+        }
+
+        started = time.monotonic()
+        result = await self.run(agent, "rotate_proxy", "stealth_browser", "change_headers")
+
+        assert result.html == "<html>headers</html>"
+        assert dict(agent.started)["change_headers"] - started < 0.1
+        assert "stealth_browser" not in dict(agent.started)
+
+    async def test_expensive_tactic_ranked_first_still_delayed(self, agent):
+        """Test an expensive tactic ranked first waits while a cheap one runs"""
+        agent.outcomes = {
+            "stealth_browser": (0.01, "<html>browser</html>"),
+            "change_headers": (0.5, None),
+        }
+
+        started = time.monotonic()
+        result = await self.run(agent, "stealth_browser", "change_headers")
+
+        assert result.html == "<html>browser</html>"
+        assert dict(agent.started)["change_headers"] - started < 0.1
+        assert 0.15 <= dict(agent.started)["stealth_browser"] - started < 0.45
+
+    async def test_expensive_tactic_starts_early_when_cheap_ones_fail(self, agent):
+        """Test an expensive tactic starts at once when nothing else is running"""
+        agent.outcomes = {
+            "change_headers": (0.01, None),
+            "stealth_browser": (0.01, "<html>browser</html>"),
+        }
+
+        started = time.monotonic()
+        result = await self.run(agent, "change_headers", "stealth_browser")
+
+        assert result.success
+        assert dict(agent.started)["stealth_browser"] - started < 0.15
+
+    async def test_all_fail(self, agent):
+        """Test failures are reported once every tactic has failed"""
+        agent.outcomes = {
+            "rotate_proxy": (0.01, None),
+            "change_headers": (0.02, None),
+            "wait": (0.01, None),
+            "solve_captcha": (0.01, "<html>never started</html>"),
+        }
+
+        result = await self.run(agent, "rotate_proxy", "change_headers", "wait", "solve_captcha")
+
+        assert not result.success
+        assert "rotate_proxy" in result.message and "wait" in result.message
+        assert "solve_captcha" not in [name for name, _ in agent.started]
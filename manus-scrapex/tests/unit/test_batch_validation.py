@@ -0,0 +1,79 @@
+"""
+Unit tests for vectorised batch validation
+"""
+import numpy as np
+import pytest
+from src.agents.validator import ValidatorAgent
+from src.models.scraping import FieldDefinition
+from src.utils.batch_validation import columns_from_records
+from src.utils.schema_compiler import schema_compiler
+
+
+class TestBatchValidation:
+    """Test columnar validation against the per-record checks"""
+
+    @pytest.fixture
+    def agent(self):
+        """Create validator agent instance"""
+        return ValidatorAgent()
+
+    @pytest.fixture
+    def schema(self):
+        """Sample product schema"""
+        return {
+            "title": FieldDefinition(type="string", description="Product title", required=True),
+            "price": FieldDefinition(type="float", description="Product price", required=True),
+            "discount_price": FieldDefinition(type="float", description="Sale price"),
+            "reviews": FieldDefinition(type="int", description="Review count", range=[0, 1000]),
+            "sku": FieldDefinition(
+                type="string", description="Product SKU", pattern=r"^[A-Z]-\d+$"
+            ),
+            "product_url": FieldDefinition(type="string", description="Product link")
+        }
+
+    @pytest.fixture
+    def records(self):
+        """Records exercising every check"""
+        return [
+            {"title": "Widget", "price": 9.99, "discount_price": 7.5, "reviews": 10,
+             "sku": "A-1", "product_url": "https://shop.example/p/1"},
+            {"title": None, "price": "9.99", "reviews": 5000, "sku": "", "product_url": "/p/2"},
+            {"title": "Gadget", "price": -1, "discount_price": 3, "reviews": 2.5, "sku": "b-2"},
+            {"price": 2000000.0, "discount_price": 2500000, "reviews": None, "sku": None},
+        ]
+
+    def test_matches_per_record_validation(self, agent, schema, records):
+        """Test masks agree with CompiledSchema.validate row by row"""
+        result = agent.validate_batch(columns_from_records(records, schema), schema)
+        plan = schema_compiler.compile(schema)
+
+        for row, record in enumerate(records):
+            # Columns have no "missing", absent keys are null
+            errors, warnings = plan.validate({field: record.get(field) for field in schema})
+            issues = result.row_issues(row)
+            assert sorted(issues["errors"]) == sorted(f"{e.field}:{e.error_type}" for e in errors)
+            assert len(issues["warnings"]) == len(warnings)
+            assert bool(result.valid[row]) == (not errors)
+
+        assert result.valid.tolist() == [True, False, False, False]
+        assert result.get_summary()["warnings"]["sku:pattern"] == 2
+
+    def test_numeric_columns(self, agent, schema):
+        """Test typed NumPy columns, with NaN as null"""
+        columns = {
+            "title": np.array(["A", "B", "C"]),
+            "price": np.array([1.5, np.nan, 0.0]),
+            "reviews": np.array([3.0, np.nan, 4.5]),
+        }
+
+        result = agent.validate_batch(columns, schema)
+
+        assert result.error_masks["price:required_null"].tolist() == [False, True, False]
+        assert result.error_masks["price:invalid_value"].tolist() == [False, False, True]
+        assert result.error_masks["reviews:type_mismatch"].tolist() == [False, False, True]
+        assert result.valid.tolist() == [True, False, False]
+
+    def test_length_mismatch(self, agent, schema):
+        """Test columns of different lengths are rejected"""
+        with pytest.raises(ValueError):
+            agent.validate_batch({"title": ["A", "B"], "price": [1.0]}, schema)
@@ -0,0 +1,181 @@
+"""
+Unit tests for header-first and streamed block detection
+"""
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from src.engines.scrapy_engine import ScrapyEngine
+from src.models.base import BlockType, ScrapingEngine
+from src.models.scraping import ScrapingStrategy
+from src.utils.block_detection import StreamingBlockDetector, detect_block
+
+CHALLENGE = b"<html><title>Just a moment...</title><div id='cf-browser-verification'></div>"
+PRODUCT = b"<html><h1>Widget</h1><span class='price'>$19.99</span>"
+CDNJS_PRODUCT = (
+    b"<html><head><script src='https://cdnjs.cloudflare.com/ajax/libs/jquery/3.7.1/jquery.min.js'>"
+    b"</script></head><body><h1>Widget</h1><span class='price'>$19.99</span>"
+)
+CONTACT_FORM = b"<form id='contact'><div class='g-recaptcha' data-sitekey='k'></div></form>"
+
+
+class TestBlockDetection:
+    """Test block verdicts from headers and the head of the body"""
+
+    def test_cloudflare_headers_need_challenge_status(self):
+        """Test cf-ray on a normal page is not a block, but a 403 or cf-mitigated is"""
+        headers = {"Server": "cloudflare", "CF-RAY": "8a1b2c"}
+
+        assert detect_block(PRODUCT.decode(), 200, headers)[0] == BlockType.NONE
+        assert detect_block("", 403, headers)[0] == BlockType.CLOUDFLARE
+        assert detect_block("", 200, {"cf-mitigated": "challenge"})[0] == BlockType.CLOUDFLARE
+        assert detect_block("", 403, {})[0] == BlockType.IP_BLOCK
+
+    def test_streaming_detector_decides_on_prefix(self):
+        """Test the verdict comes once sniff_bytes are read and only once"""
+        detector = StreamingBlockDetector(200, {}, sniff_bytes=len(CHALLENGE) + 10)
+
+        assert detector.check_headers() is None
+        assert detector.feed(CHALLENGE) is None
+        verdict = detector.feed(b" " * 20)
+        assert verdict[0] == BlockType.CLOUDFLARE
+        assert detector.feed(CHALLENGE) is None
+
+    def test_streaming_detector_passes_real_page(self):
+        """Test a real page is not flagged and stops being inspected"""
+        detector = StreamingBlockDetector(200, {"Server": "cloudflare"}, sniff_bytes=32)
+
+        assert detector.feed(PRODUCT) is None
+        assert detector.decided
+        assert detector.feed(CHALLENGE) is None
+
+    def test_streaming_detector_ignores_loose_markers_on_real_pages(self):
+        """Test a cdnjs.cloudflare.com script or a contact form captcha doesn't abort a 200"""
+        for body in (CDNJS_PRODUCT, PRODUCT + CONTACT_FORM):
+            detector = StreamingBlockDetector(200, {}, sniff_bytes=4096)
+            assert detector.feed(body + b" " * 8192) is None
+            assert detector.decided
+
+        # detect_block still reports them to the anti-bot agent on the full page
+        assert detect_block(CDNJS_PRODUCT.decode(), 200, {})[0] == BlockType.CLOUDFLARE
+
+    def test_streaming_detector_captcha_on_short_page(self):
+        """Test a captcha widget counts once the whole (short) body is known"""
+        detector = StreamingBlockDetector(200, {}, sniff_bytes=4096)
+        assert detector.feed(CONTACT_FORM) is None
+        assert detector.finish()[0] == BlockType.RECAPTCHA
+
+        # Non-2xx responses keep the loose body markers
+        detector = StreamingBlockDetector(404, {}, sniff_bytes=64)
+        assert detector.feed(CONTACT_FORM + b" " * 64)[0] == BlockType.RECAPTCHA
+
+    @pytest.fixture
+    async def server(self):
+        async def challenge(request):
+            return web.Response(body=CHALLENGE + b"x" * 500_000, content_type="text/html")
+
+        async def forbidden(request):
+            return web.Response(
+                status=403, body=b"x" * 500_000, headers={"Server": "cloudflare", "CF-RAY": "1"}
+            )
+
+        async def product(request):
+            return web.Response(body=PRODUCT + b"y" * 50_000, content_type="text/html")
+
+        async def contact(request):
+            body = CDNJS_PRODUCT + CONTACT_FORM + b"y" * 50_000
+            return web.Response(body=body, content_type="text/html")
+
+        async def legacy(request):
+            # No declared charset: windows-1252 body, and ISO-8859-1 named in a <meta> tag
+            if request.query.get("meta"):
+                body = "<html><head><meta charset='iso-8859-1'></head><h1>Caf\u00e9</h1>"
+                return web.Response(body=body.encode("latin-1"), content_type="text/html")
+            body = "<html><h1>Cr\u00e8me br\u00fbl\u00e9e \u2013 \u20ac4</h1>".encode("cp1252")
+            return web.Response(body=body, content_type="text/html")
+
+        app = web.Application()
+        app.router.add_get("/legacy", legacy)
+        app.router.add_get("/challenge", challenge)
+        app.router.add_get("/forbidden", forbidden)
+        app.router.add_get("/product", product)
+        app.router.add_get("/contact", contact)
+
+        server = TestServer(app)
+        await server.start_server()
+        yield server
+        await server.close()
+
+    async def test_engine_aborts_challenge_download(self, server, monkeypatch):
+        """Test the engine stops reading a challenge page and reports response metadata"""
+        monkeypatch.setattr("src.engines.scrapy_engine.settings.early_block_sniff_bytes", 4096)
+        engine = ScrapyEngine()
+        strategy = ScrapingStrategy(engine=ScrapingEngine.SCRAPY)
+
+        try:
+            challenge = await engine.scrape(str(server.make_url("/challenge")), strategy)
+            forbidden = await engine.scrape(str(server.make_url("/forbidden")), strategy)
+            product = await engine.scrape(str(server.make_url("/product")), strategy)
+            contact = await engine.scrape(str(server.make_url("/contact")), strategy)
+        finally:
+            await engine.close()
+
+        assert challenge.aborted_early
+        assert challenge.status_code == 200
+        assert challenge.bytes_received < 100_000
+        assert "Just a moment" in challenge.html
+
+        assert forbidden.aborted_early
+        assert forbidden.status_code == 403
+        assert forbidden.bytes_received == 0
+        assert forbidden.response_headers["Server"] == "cloudflare"
+
+        assert not product.aborted_early
+        assert product.bytes_received == len(PRODUCT) + 50_000
+        assert product.html.startswith(PRODUCT.decode())
+        assert product.time_to_first_byte is not None
+
+        # Loose markers on a 200 page: the full page is kept
+        assert not contact.aborted_early
+        assert contact.bytes_received == len(CDNJS_PRODUCT + CONTACT_FORM) + 50_000
+
+    async def test_engine_decodes_undeclared_charsets(self, server, monkeypatch):
+        """Test bodies without a declared charset are not garbled and TTFB excludes backoff"""
+        import asyncio
+
+        async def slow_backoff(domain, via=None):
+            await asyncio.sleep(0.3)
+
+        monkeypatch.setattr("src.engines.scrapy_engine.domain_backoff.wait", slow_backoff)
+        engine = ScrapyEngine()
+        strategy = ScrapingStrategy(engine=ScrapingEngine.SCRAPY)
+
+        try:
+            legacy = await engine.scrape(str(server.make_url("/legacy")), strategy)
+            meta = await engine.scrape(str(server.make_url("/legacy?meta=1")), strategy)
+        finally:
+            await engine.close()
+
+        assert "Cr\u00e8me br\u00fbl\u00e9e \u2013 \u20ac4" in legacy.html
+        assert "Caf\u00e9" in meta.html
+        assert legacy.time_to_first_byte < 0.3 <= legacy.execution_time
+
+    async def test_browser_detects_challenge_on_large_dom(self, monkeypatch):
+        """Test a challenge DOM longer than the sniff window is still caught"""
+        from types import SimpleNamespace
+        from src.engines.playwright_engine import PlaywrightEngine
+
+        monkeypatch.setattr("src.engines.playwright_engine.settings.early_block_sniff_bytes", 4096)
+        dom = (CHALLENGE + b"x" * 20_000).decode()
+
+        async def wait_for_load_state(state, timeout):
+            pass
+
+        async def content():
+            return dom
+
+        page = SimpleNamespace(wait_for_load_state=wait_for_load_state, content=content)
+        block = await PlaywrightEngine()._load_content(
+            page, ScrapingStrategy(engine=ScrapingEngine.PLAYWRIGHT), 200, {}
+        )
+
+        assert block is not None and block[0] == BlockType.CLOUDFLARE
@@ -0,0 +1,135 @@
+"""
+Unit tests for cache backends and the extraction cache
+"""
+import pytest
+from src.services.cache import MemoryCacheBackend, DiskCacheBackend
+from src.services.extraction_cache import ExtractionCache
+from src.models.scraping import FieldDefinition
+
+
+class TestCacheBackends:
+    """Test cache backend behaviour"""
+
+    async def test_memory_lru_eviction(self):
+        """Test least recently used entry is evicted at the size cap"""
+        cache = MemoryCacheBackend("test", max_entries=2, ttl=None)
+        await cache.set("a", "1")
+        await cache.set("b", "2")
+        assert await cache.get("a") == "1"
+
+        await cache.set("c", "3")
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == "1"
+        assert await cache.get("c") == "3"
+
+    async def test_memory_ttl_expiry(self, monkeypatch):
+        """Test entries expire after their TTL"""
+        import src.services.cache as cache_module
+
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+
+        cache = MemoryCacheBackend("test", max_entries=10, ttl=60)
+        await cache.set("a", "1")
+        now[0] += 61
+
+        assert await cache.get("a") is None
+        assert cache.get_stats()["misses"] == 1
+
+    async def test_disk_roundtrip(self, tmp_path):
+        """Test disk backend persists across instances"""
+        path = str(tmp_path / "cache.sqlite3")
+        cache = DiskCacheBackend("test", max_entries=10, ttl=None, path=path)
+        await cache.set("a", "1")
+
+        reopened = DiskCacheBackend("test", max_entries=10, ttl=None, path=path)
+        assert await reopened.get("a") == "1"
+
+        other_namespace = DiskCacheBackend("other", max_entries=10, ttl=None, path=path)
+        assert await other_namespace.get("a") is None
+
+
+class TestExtractionCache:
+    """Test extraction cache lookups"""
+
+    @pytest.fixture
+    def cache(self):
+        """Fresh in-memory extraction cache"""
+        return ExtractionCache()
+
+    @pytest.fixture
+    def schema(self):
+        """Sample schema"""
+        return {
+            "title": FieldDefinition(type="string", description="Title", required=True),
+            "price": FieldDefinition(type="float", description="Price"),
+        }
+
+    @staticmethod
+    def page(price: str, timestamp: str, csrf: str) -> str:
+        """Product page with volatile parts"""
+        description = " ".join(f"word{i}" for i in range(2000))
+        return (
+            f'<html><body><form><input type="hidden" name="csrf" value="{csrf}"></form>'
+            f'<h1>Blue Widget</h1><span class="price">${price}</span>'
+            f'<p>{description}</p><div class="ad-slot">Buy {csrf[:6]} now</div>'
+            f'<footer>Generated at {timestamp}</footer></body></html>'
+        )
+
+    async def test_exact_hit_ignores_volatile_content(self, cache, schema):
+        """Test timestamps, CSRF tokens and ad slots don't change the key"""
+        data = {"title": "Blue Widget", "price": 19.99}
+        first = cache.fingerprint(self.page("19.99", "2025-01-01T10:00:00Z", "a" * 32))
+        await cache.set(first, schema, data)
+
+        second = cache.fingerprint(self.page("19.99", "2025-01-02T11:30:00Z", "b" * 32))
+
+        assert second.content_hash == first.content_hash
+        assert await cache.get(second, schema) == data
+
+    async def test_exact_hit_with_changed_date_or_image_misses(self, cache):
+        """Test values the hash ignores (dates, attributes) are checked on exact hits"""
+        schema = {
+            "title": FieldDefinition(type="string", description="Title"),
+            "published": FieldDefinition(type="string", description="Publish date"),
+            "image": FieldDefinition(type="string", description="Image URL"),
+        }
+
+        def article(date: str, image: str) -> str:
+            return (
+                f'<html><body><h1>Launch notes</h1><time datetime="{date}">{date}</time>'
+                f'<img src="{image}" alt="Launch"><p>The release ships today.</p></body></html>'
+            )
+
+        data = {"title": "Launch notes", "published": "2025-03-01", "image": "/img/v1.png"}
+        await cache.set(cache.fingerprint(article("2025-03-01", "/img/v1.png")), schema, data)
+
+        same = cache.fingerprint(article("2025-03-01", "/img/v1.png"))
+        assert await cache.get(same, schema) == data
+
+        redated = cache.fingerprint(article("2025-04-01", "/img/v1.png"))
+        new_image = cache.fingerprint(article("2025-03-01", "/img/v2.png"))
+        assert redated.content_hash == new_image.content_hash
+        assert await cache.get(redated, schema) is None
+        assert await cache.get(new_image, schema) is None
+
+    async def test_near_duplicate_hit(self, cache, schema):
+        """Test near-identical page hits when cached values are still present"""
+        data = {"title": "Blue Widget", "price": 19.99}
+        await cache.set(cache.fingerprint(self.page("19.99", "", "a" * 32)), schema, data)
+
+        changed = self.page("19.99", "", "a" * 32).replace("word17 ", "word17x ")
+        fingerprint = cache.fingerprint(changed)
+
+        assert await cache.get(fingerprint, schema) == data
+        assert cache.near_hits == 1
+
+    async def test_changed_price_misses(self, cache, schema):
+        """Test a near-duplicate with a changed value is not served stale"""
+        data = {"title": "Blue Widget", "price": 19.99}
+        await cache.set(cache.fingerprint(self.page("19.99", "", "a" * 32)), schema, data)
+
+        fingerprint = cache.fingerprint(self.page("24.99", "", "a" * 32))
+
+        assert await cache.get(fingerprint, schema) is None
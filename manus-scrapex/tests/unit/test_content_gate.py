@@ -0,0 +1,137 @@
+"""
+Unit tests for the pre-extraction content gate
+"""
+import pytest
+from src.models.scraping import FieldDefinition
+from src.services.content_gate import ContentGate, page_features, schema_hints
+
+SCHEMA = {
+    "title": FieldDefinition(type="string", description="Product title"),
+    "price": FieldDefinition(type="float", description="Current price"),
+    "availability": FieldDefinition(type="string", description="Stock status"),
+}
+
+
+def product_page(index: int) -> str:
+    reviews = "".join(
+        f"<li class='review'>Review {n}: solid build, arrived quickly, would buy again.</li>"
+        for n in range(8)
+    )
+    return (
+        f"<html><head><title>Widget {index} | Shop</title></head><body>"
+        f"<nav class='menu'><a href='/'>Home</a><a href='/c'>Catalog</a></nav>"
+        f"<main class='product'><h1>Widget {index}</h1>"
+        f"<div class='price'>Price: ${10 + index}.99</div>"
+        f"<div class='stock'>Availability: in stock</div>"
+        f"<p class='description'>A dependable widget for everyday tasks, number {index}, "
+        f"machined from aluminium and tested for durability in demanding conditions.</p>"
+        f"<ul class='reviews'>{reviews}</ul></main>"
+        f"<footer class='footer'>Copyright Shop Ltd. All rights reserved.</footer></body></html>"
+    )
+
+
+class TestContentGate:
+    """Test absolute checks and the per-domain baseline"""
+
+    @pytest.fixture
+    def gate(self, monkeypatch):
+        monkeypatch.setattr("src.services.content_gate.settings.content_gate_min_samples", 10)
+        return ContentGate()
+
+    def test_features(self):
+        """Test text, DOM and schema hint features come from one parse"""
+        features = page_features(product_page(1), schema_hints(SCHEMA))
+
+        assert features.heading == "Widget 1"
+        assert features.dom_nodes > 20
+        # "title" is a field name but not a word on the page
+        assert features.hint_rate == pytest.approx(2 / 3)
+        assert "<" not in features.text
+
+    def test_absolute_rejections(self, gate):
+        """Test empty shells, soft 404s and consent walls are rejected without a baseline"""
+        shell = gate.check(
+            "shop.example",
+            "<html><body><div id='root'></div><script>app()</script></body></html>",
+            SCHEMA
+        )
+        assert not shell.passed and shell.action == "escalate"
+
+        missing = gate.check(
+            "shop.example",
+            "<html><head><title>Page not found</title></head><body><h1>Sorry</h1>"
+            + "<p>Try searching our catalog for similar products instead.</p>" * 5
+            + "</body></html>",
+            SCHEMA
+        )
+        assert not missing.passed and missing.action == "fail"
+
+        consent = gate.check(
+            "shop.example",
+            "<html><body><h1>Before you continue</h1><p>We value your privacy. "
+            + "We and our partners use cookies to personalise content. " * 4
+            + "</p><button>Accept all cookies</button></body></html>",
+            SCHEMA
+        )
+        assert not consent.passed and consent.reason == "consent wall"
+
+        gone = gate.check("shop.example", product_page(1), SCHEMA, status_code=404)
+        assert not gone.passed and gone.action == "fail"
+
+        assert gate.check("shop.example", product_page(1), SCHEMA).passed
+        assert gate.get_stats()["rejected"] == 4
+
+    def test_not_found_words_and_cookie_banner_on_content_pages(self, gate):
+        """Test a "404" in a product name and a cookie banner on a short page are let through"""
+        peugeot = product_page(1).replace("Widget 1", "Peugeot 404 wheel cap")
+        assert gate.check("shop.example", peugeot, SCHEMA).passed
+
+        banner = (
+            "<div class='cookies'>We use cookies to improve your experience. "
+            "<button>Accept all cookies</button></div>"
+        )
+        short_page = (
+            "<html><head><title>Desk Lamp | Shop</title></head><body>"
+            "<main><h1>Desk Lamp</h1><div class='price'>Price: $24.99</div>"
+            "<div class='stock'>Availability: in stock, ships in 2 days</div>"
+            "<p>" + "Adjustable arm, warm LED, touch dimmer and a weighted base. " * 8 + "</p>"
+            "</main>" + banner + "</body></html>"
+        )
+        features = page_features(short_page, schema_hints(SCHEMA))
+        assert 500 < features.text_length < 2000
+        assert gate.check("shop.example", short_page, SCHEMA).passed
+
+        # The same banner on a page without the schema's words is a consent wall
+        wall = (
+            "<html><body><h1>Before you continue</h1>"
+            "<p>" + "Sign in to see this content and more from our community. " * 5 + "</p>"
+            + banner + "</body></html>"
+        )
+        assert gate.check("shop.example", wall, SCHEMA).reason == "consent wall"
+
+    def test_baseline_rejects_pages_unlike_the_domain(self, gate):
+        """Test a page differing on several features is rejected once a baseline exists"""
+        odd_page = (
+            "<html><body><table><tr><td>"
+            + "Our offices are closed for the holidays and will reopen next week. " * 4
+            + "</td></tr></table></body></html>"
+        )
+
+        # No baseline yet: only absolute checks apply
+        assert gate.check("shop.example", odd_page, SCHEMA).passed
+
+        for index in range(12):
+            verdict = gate.check("shop.example", product_page(index), SCHEMA)
+            assert verdict.passed
+            gate.learn("shop.example", verdict.features)
+
+        assert gate.check("shop.example", product_page(99), SCHEMA).passed
+
+        verdict = gate.check("shop.example", odd_page, SCHEMA)
+        assert not verdict.passed
+        assert verdict.action == "retry"
+        assert "unfamiliar page template" in verdict.reason
+
+        # Baselines are per domain and mode
+        assert gate.check("other.example", odd_page, SCHEMA).passed
+        assert gate.check("shop.example", odd_page, SCHEMA, mode="list").passed
@@ -0,0 +1,92 @@
+"""
+Unit tests for memoized retry and evasion decisions
+"""
+import json
+import pytest
+from src.agents.antibot import AntiBotAgent
+from src.agents.validator import ValidatorAgent
+from src.models.base import ScrapingEngine
+from src.models.scraping import ScrapingStrategy, ValidationError, ValidationResult
+from src.services.decision_cache import DecisionCache
+from src.services.llm_service import llm_service
+
+
+class TestDecisionCache:
+    """Test decision reuse and outcome ranking"""
+
+    @pytest.fixture
+    def cache(self, monkeypatch):
+        """Fresh decision cache used by the agents"""
+        cache = DecisionCache(ttl=60)
+        monkeypatch.setattr("src.agents.antibot.decision_cache", cache)
+        monkeypatch.setattr("src.agents.validator.decision_cache", cache)
+        # Keep the cached order deterministic
+        monkeypatch.setattr("src.agents.antibot.settings.tactic_bandit_enabled", False)
+        return cache
+
+    def test_outcomes_rerank_and_exhaust(self, cache):
+        """Test failing options are demoted and an all-failing decision is dropped"""
+        cache.put("k", {"a": "A", "b": "B"})
+        assert cache.get("k") == ["A", "B"]
+
+        cache.record("k", "a", success=False)
+        assert cache.get("k") == ["B", "A"]
+
+        cache.record("k", "b", success=False)
+        assert cache.get("k") is None
+        assert cache.get_stats()["entries"] == 0
+
+    async def test_tactics_reused_per_domain(self, cache, monkeypatch):
+        """Test the LLM is asked once per domain and block type"""
+        calls = []
+
+        async def fake_complete(prompt, **kwargs):
+            calls.append(prompt)
+            return json.dumps({"tactics": [
+                {"tactic": "change_headers", "priority": 1},
+                {"tactic": "rotate_proxy", "priority": 2},
+            ]})
+
+        monkeypatch.setattr(llm_service, "complete", fake_complete)
+        agent = AntiBotAgent()
+
+        for page in range(3):
+            analysis = await agent.analyze(
+                "<html>cf-browser-verification</html>", 200, {},
+                url=f"https://shop.example/p/{page}", engine=ScrapingEngine.SCRAPY
+            )
+            assert analysis.suggested_tactics[0]["tactic"] == "change_headers"
+
+        assert len(calls) == 1
+
+        key = agent._decision_key(
+            "https://shop.example/p/9", analysis.block_type, ScrapingEngine.SCRAPY
+        )
+        cache.record(key, "change_headers", success=False)
+        analysis = await agent.analyze(
+            "<html>cf-browser-verification</html>", 200, {},
+            url="https://shop.example/p/4", engine=ScrapingEngine.SCRAPY
+        )
+        assert analysis.suggested_tactics[0]["tactic"] == "rotate_proxy"
+        assert len(calls) == 1
+
+    async def test_retry_strategy_reranked(self, cache):
+        """Test a retry strategy that keeps failing gives way to the next candidate"""
+        agent = ValidatorAgent()
+        strategy = ScrapingStrategy(engine=ScrapingEngine.SCRAPY)
+        result = ValidationResult(
+            valid=False,
+            errors=[ValidationError(field="price", error_type="type_mismatch", message="bad")],
+            overall_confidence=0.65
+        )
+
+        first = await agent.suggest_retry_strategy(result, strategy, domain="shop.example")
+        assert first.action == "re_extract"
+        assert first.decision_key
+        assert "decision_key" not in first.model_dump()
+
+        agent.record_retry_outcome(first, success=False)
+        second = await agent.suggest_retry_strategy(result, strategy, domain="shop.example")
+        assert second.action == "retry"
+
+        assert (await agent.suggest_retry_strategy(result, strategy)).action == "re_extract"
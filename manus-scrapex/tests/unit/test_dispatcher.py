@@ -129,3 +129,20 @@ class TestDispatcherAgent:
         assert "Accept" in headers
         assert "Accept-Language" in headers
         assert len(headers["User-Agent"]) > 0
+
+    async def test_analysis_stops_at_deadline(self, agent, monkeypatch):
+        """Test a backoff outlasting the deadline stops analysis instead of using defaults"""
+        import time
+        from src.services.domain_backoff import DomainBackoff
+        from src.utils.request_context import DeadlineExceeded, request_deadline
+
+        backoff = DomainBackoff()
+        await backoff.note_response("example.com", 429, {"Retry-After": "60"})
+        monkeypatch.setattr("src.agents.dispatcher.domain_backoff", backoff)
+
+        token = request_deadline.set(time.monotonic() + 5)
+        try:
+            with pytest.raises(DeadlineExceeded):
+                await agent._analyze_url("https://example.com")
+        finally:
+            request_deadline.reset(token)
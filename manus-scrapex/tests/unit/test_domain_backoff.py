@@ -0,0 +1,115 @@
+"""
+Unit tests for Retry-After and rate-limit header aware backoff
+"""
+import time
+import pytest
+from email.utils import formatdate
+from src.services.domain_backoff import DomainBackoff, parse_backoff
+from src.utils.request_context import DeadlineExceeded, request_deadline
+
+
+class TestDomainBackoff:
+    """Test header parsing and per-domain waits"""
+
+    def test_parse_retry_after(self):
+        """Test Retry-After as seconds and as an HTTP date"""
+        now = 1_700_000_000.0
+
+        assert parse_backoff(429, {"Retry-After": "12"}, now) == 12
+        http_date = {"retry-after": formatdate(now + 40, usegmt=True)}
+        assert parse_backoff(503, http_date, now) == pytest.approx(40)
+        # Retry-After on a normal response is not a backoff
+        assert parse_backoff(200, {"Retry-After": "12"}, now) is None
+
+    def test_parse_rate_limit_headers(self):
+        """Test reset headers count only once the quota is exhausted"""
+        now = 1_700_000_000.0
+
+        def reset(remaining, value):
+            return {"X-RateLimit-Remaining": remaining, "X-RateLimit-Reset": value}
+
+        assert parse_backoff(200, reset("5", "30"), now) is None
+        assert parse_backoff(200, reset("0", "30"), now) == 30
+        assert parse_backoff(200, reset("0", str(now + 20)), now) == 20
+        epoch_ms = {"X-Rate-Limit-Reset": str(int((now + 15) * 1000))}
+        assert parse_backoff(429, epoch_ms, now) == pytest.approx(15)
+        assert parse_backoff(200, {"RateLimit": "limit=100, remaining=0, reset=8"}, now) == 8
+        assert parse_backoff(200, {"RateLimit": '"default";r=0;t=9'}, now) == 9
+
+    def test_parse_defaults_and_cap(self, monkeypatch):
+        """Test a bare 429 uses the default delay and huge delays are capped"""
+        monkeypatch.setattr("src.services.domain_backoff.settings.backoff_default_delay", 30.0)
+        monkeypatch.setattr("src.services.domain_backoff.settings.backoff_max_delay", 600.0)
+
+        assert parse_backoff(429, {}) == 30.0
+        assert parse_backoff(429, {"Retry-After": "86400"}) == 600.0
+        assert parse_backoff(200, {}) is None
+
+    async def test_wait_per_domain_and_egress(self, monkeypatch):
+        """Test requests wait for their domain and egress only"""
+        slept = []
+
+        async def fake_sleep(seconds):
+            slept.append(seconds)
+
+        monkeypatch.setattr("src.services.domain_backoff.asyncio.sleep", fake_sleep)
+        backoff = DomainBackoff()
+
+        await backoff.note_response("shop.example", 429, {"Retry-After": "20"})
+        await backoff.wait("shop.example")
+        await backoff.wait("shop.example", via="proxy-7.example")
+        await backoff.wait("other.example")
+
+        assert len(slept) == 1
+        assert 19 < slept[0] <= 20
+
+    async def test_wait_beyond_deadline_raises(self):
+        """Test a backoff longer than the request's remaining time fails fast"""
+        backoff = DomainBackoff()
+        await backoff.note_response("shop.example", 429, {"Retry-After": "60"})
+
+        token = request_deadline.set(time.monotonic() + 5)
+        try:
+            with pytest.raises(DeadlineExceeded):
+                await backoff.wait("shop.example")
+        finally:
+            request_deadline.reset(token)
+
+    async def test_deadline_reaches_the_workflow(self, monkeypatch):
+        """Test engines and evasion tactics don't turn DeadlineExceeded into a retryable failure"""
+        from src.agents.antibot import AntiBotAgent
+        from src.engines.scrapy_engine import ScrapyEngine
+        from src.models.base import BlockType, ScrapingEngine
+        from src.models.scraping import ScrapingStrategy
+
+        backoff = DomainBackoff()
+        await backoff.note_response("shop.example", 429, {"Retry-After": "60"})
+        monkeypatch.setattr("src.engines.scrapy_engine.domain_backoff", backoff)
+        monkeypatch.setattr("src.agents.antibot.domain_backoff", backoff)
+        monkeypatch.setattr("src.agents.antibot.settings.tactic_bandit_enabled", False)
+
+        url = "https://shop.example/p/1"
+        strategy = ScrapingStrategy(engine=ScrapingEngine.SCRAPY)
+        token = request_deadline.set(time.monotonic() + 5)
+        try:
+            with pytest.raises(DeadlineExceeded):
+                await ScrapyEngine().scrape(url, strategy)
+            with pytest.raises(DeadlineExceeded):
+                await AntiBotAgent().evade(
+                    url, BlockType.RATE_LIMIT, strategy, {"tactic": "change_headers"}
+                )
+        finally:
+            request_deadline.reset(token)
+
+    async def test_backoff_shared_between_workers(self, tmp_path, monkeypatch):
+        """Test a backoff noted by one worker is honoured by another"""
+        monkeypatch.setattr(
+            "src.services.cache.settings.cache_path", str(tmp_path / "shared.sqlite3")
+        )
+        worker_a = DomainBackoff(backend="disk")
+        worker_b = DomainBackoff(backend="disk")
+
+        await worker_a.note_response("shop.example", 429, {"Retry-After": "30"})
+
+        assert 29 < await worker_b.delay("shop.example") <= 30
+        assert await worker_b.delay("other.example") == 0.0
@@ -0,0 +1,78 @@
+"""
+Unit tests for per-domain block-rate circuit breakers
+"""
+import pytest
+from src.services.domain_breaker import BlockRateBreaker, DomainBreakers
+from src.utils.circuit_breaker import CircuitState
+
+
+class TestDomainBreaker:
+    """Test block-rate tripping, single half-open probe and stats"""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Controllable monotonic clock"""
+        clock = [1000.0]
+        monkeypatch.setattr("src.utils.circuit_breaker.time.monotonic", lambda: clock[0])
+        monkeypatch.setattr("src.services.domain_breaker.time.monotonic", lambda: clock[0])
+        return clock
+
+    def test_opens_on_block_rate(self, clock):
+        """Test the circuit opens once the windowed block rate reaches the threshold"""
+        breaker = BlockRateBreaker("shop", block_rate=0.6, window=5, min_requests=5)
+
+        for blocked in (True, False, True, False):
+            breaker.record_failure() if blocked else breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED  # Too few samples
+
+        breaker.record_failure()  # 3/5 blocked
+        assert breaker.state == CircuitState.OPEN
+        assert not breaker.allow_request()
+        assert breaker.retry_in() == pytest.approx(120.0)
+
+    def test_single_half_open_probe(self, clock):
+        """Test only one probe is admitted and its outcome decides the state"""
+        breakers = DomainBreakers()
+        breaker = breakers.breaker("shop.example")
+        breaker.min_requests = 2
+        breakers.record("shop.example", blocked=True)
+        breakers.record("shop.example", blocked=True)
+
+        assert breakers.acquire("shop.example") == pytest.approx(120.0)
+
+        clock[0] += 121
+        assert breakers.acquire("shop.example") is None  # The probe
+        assert breakers.acquire("shop.example") == pytest.approx(120.0)  # Parked behind it
+
+        breakers.record("shop.example", blocked=True)
+        assert breaker.state == CircuitState.OPEN
+
+        clock[0] += 121
+        assert breakers.acquire("shop.example") is None
+        breakers.record("shop.example", blocked=False)
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.current_block_rate == 0.0
+        assert breakers.acquire("shop.example") is None
+
+    def test_release_frees_probe(self, clock):
+        """Test a probe whose fetch failed lets the next request probe"""
+        breakers = DomainBreakers()
+        breaker = breakers.breaker("shop.example")
+        breaker._open()
+        clock[0] += 121
+
+        assert breakers.acquire("shop.example") is None
+        breakers.release("shop.example")
+        assert breakers.acquire("shop.example") is None
+
+    def test_stats_list_open_domains(self, clock):
+        """Test tripped domains are reported and closed ones evicted first"""
+        breakers = DomainBreakers(max_domains=2)
+        breakers.breaker("blocked.example")._open()
+        breakers.record("a.example", blocked=False)
+        breakers.record("b.example", blocked=False)
+
+        stats = breakers.get_stats()
+        assert stats["domains"] == 2
+        assert list(stats["open"]) == ["blocked.example"]
+        assert stats["states"]["open"] == 1
@@ -0,0 +1,305 @@
+"""
+Unit tests for Extractor Agent
+"""
+import asyncio
+import json
+import pytest
+from src.agents.extractor import ExtractorAgent
+from src.models.scraping import FieldDefinition
+from src.services.llm_service import LLMProvider, llm_service
+
+
+class TestExtractorAgent:
+    """Test Extractor Agent functionality"""
+
+    @pytest.fixture(autouse=True)
+    def no_streaming(self, monkeypatch):
+        """Tests fake llm_service.complete, so use non-streaming extraction by default"""
+        monkeypatch.setattr("src.agents.extractor.settings.extraction_streaming", False)
+
+    @pytest.fixture
+    def agent(self):
+        """Create extractor agent instance"""
+        return ExtractorAgent()
+
+    @pytest.fixture
+    def schema(self):
+        """Sample product schema"""
+        return {
+            "title": FieldDefinition(
+                type="string",
+                description="Product title",
+                required=True
+            ),
+            "price": FieldDefinition(
+                type="float",
+                description="Product price",
+                required=True
+            ),
+            "sku": FieldDefinition(
+                type="string",
+                description="Product SKU"
+            )
+        }
+
+    def test_split_into_chunks_covers_page(self, agent):
+        """Test chunks overlap and cover the whole page"""
+        html = "".join(f"<p>paragraph {i}</p>" for i in range(500))
+        chunks = agent._split_into_chunks(html, chunk_tokens=200, overlap_tokens=20)
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 200 * 4 for chunk in chunks)
+        assert chunks[0].startswith("<p>")
+        assert html.endswith(chunks[-1])
+        # Every paragraph appears in at least one chunk
+        for i in range(500):
+            assert any(f"paragraph {i}<" in chunk for chunk in chunks)
+
+    def test_split_into_chunks_small_page(self, agent):
+        """Test small page yields a single chunk"""
+        html = "<div>small</div>"
+        assert agent._split_into_chunks(html, 200, 20) == [html]
+
+    def test_merge_chunk_results_majority(self, agent, schema):
+        """Test merge picks the majority value with confidence"""
+        partials = [
+            {"title": "Widget", "price": None, "sku": None},
+            {"title": "Widget", "price": 9.99, "sku": "A1"},
+            {"title": "Other", "price": 9.99, "sku": None},
+        ]
+        result = agent._merge_chunk_results(partials, schema)
+
+        assert result.data == {"title": "Widget", "price": 9.99, "sku": "A1"}
+        assert result.confidence_scores["title"] == pytest.approx(2 / 3)
+        assert result.confidence_scores["price"] == 1.0
+
+    def test_merge_chunk_results_tie_prefers_earlier(self, agent, schema):
+        """Test earlier chunks win ties"""
+        partials = [{"title": "First"}, {"title": "Second"}]
+        result = agent._merge_chunk_results(partials, schema)
+        assert result.data["title"] == "First"
+        assert result.data["sku"] is None
+
+    async def test_extract_chunked_stops_early(self, agent, schema, monkeypatch):
+        """Test chunked extraction stops once required fields are filled"""
+        calls = []
+
+        async def fake_complete(prompt, **kwargs):
+            calls.append(prompt)
+            await asyncio.sleep(0.01)
+            return json.dumps({"title": "Widget", "price": 9.99, "sku": None})
+
+        monkeypatch.setattr(llm_service, "complete", fake_complete)
+        monkeypatch.setattr("src.agents.extractor.settings.extraction_max_parallel_chunks", 1)
+
+        html = "".join(f"<p>paragraph {i}</p>" for i in range(2000))
+        result = await agent.extract_chunked(html, schema)
+
+        assert result.data["title"] == "Widget"
+        assert result.data["price"] == 9.99
+        assert result.chunks_processed == 1
+        assert result.chunks_total > 1
+        # Pending chunks were cancelled before calling the LLM
+        assert len(calls) < result.chunks_total
+
+    async def test_extract_chunked_stops_at_deadline(self, agent, schema, monkeypatch):
+        """Test an expired deadline aborts chunked extraction instead of merging empty chunks"""
+        import time
+        from src.utils.request_context import DeadlineExceeded, request_deadline
+
+        async def fake_complete(prompt, **kwargs):
+            return json.dumps({"title": None, "price": None, "sku": None})
+
+        monkeypatch.setattr(llm_service, "complete", fake_complete)
+
+        html = "".join(f"<p>paragraph {i}</p>" for i in range(2000))
+        token = request_deadline.set(time.monotonic() - 1)
+        try:
+            with pytest.raises(DeadlineExceeded):
+                await agent.extract_chunked(html, schema)
+        finally:
+            request_deadline.reset(token)
+
+    @pytest.fixture
+    def listing_html(self):
+        """Category page with a nav menu and a product grid"""
+        nav = "".join(f'<li><a href="/c{i}">Cat {i}</a></li>' for i in range(8))
+        cards = "".join(
+            f'<div class="card"><h3 class="name">Product {i}</h3>'
+            f'<span class="price">${i}.99</span><a href="/p/{i}">View</a></div>'
+            for i in range(1, 13)
+        )
+        return (
+            f'<html><body><ul class="nav">{nav}</ul>'
+            f'<div class="grid">{cards}</div></body></html>'
+        )
+
+    def test_detect_repeated_items(self, agent, listing_html):
+        """Test product cards are preferred over navigation links"""
+        from bs4 import BeautifulSoup
+
+        items = agent._detect_repeated_items(BeautifulSoup(listing_html, "lxml"))
+        assert len(items) == 12
+        assert all("card" in item.get("class", []) for item in items)
+
+    def test_parse_selector_attr(self, agent):
+        """Test Scrapy-style attribute selectors"""
+        assert agent._parse_selector("a.link::attr(href)") == ("a.link", "href")
+        assert agent._parse_selector("h3.name::text") == ("h3.name", None)
+        assert agent._parse_selector("h3.name") == ("h3.name", None)
+
+    async def test_iter_list_items_with_selectors(self, agent, listing_html, monkeypatch):
+        """Test one selector-generation call extracts every item"""
+        calls = []
+
+        async def fake_complete(prompt, **kwargs):
+            calls.append(prompt)
+            return json.dumps({
+                "title": "h3.name",
+                "price": "span.price",
+                "sku": "a::attr(href)"
+            })
+
+        monkeypatch.setattr(llm_service, "complete", fake_complete)
+
+        items = [item async for item in agent.iter_list_items(listing_html, {
+            "title": FieldDefinition(type="string", description="Name", required=True),
+            "price": FieldDefinition(type="float", description="Price", required=True),
+            "sku": FieldDefinition(type="string", description="Link"),
+        })]
+
+        assert len(calls) == 1
+        assert len(items) == 12
+        assert items[0] == {"title": "Product 1", "price": 1.99, "sku": "/p/1"}
+
+    async def test_list_duplicates_dropped_only_across_overlap(self, agent, schema, monkeypatch):
+        """Test identical listings are kept unless repeated by an overlapping chunk"""
+        variant = {"title": "Tee", "price": 9.99, "sku": None}
+        other = {"title": "Cap", "price": 4.99, "sku": None}
+
+        async def fake_group(html, schema):
+            return {"a": [variant, variant], "b": [variant, other]}[html]
+
+        monkeypatch.setattr(agent, "_extract_item_group", fake_group)
+
+        disjoint = [r async for r in agent._extract_items_with_llm(["a", "b"], schema)]
+        assert disjoint == [variant, variant, variant, other]
+
+        overlapping = [
+            r async for r in agent._extract_items_with_llm(["a", "b"], schema, overlapping=True)
+        ]
+        assert overlapping == [variant, variant, other]
+
+    async def test_reextract_fields_merges_only_failed(self, agent, schema, monkeypatch):
+        """Test targeted re-extraction sends a focused prompt to the extraction model"""
+        prompts = []
+        models = []
+
+        async def fake_complete(prompt, **kwargs):
+            prompts.append(prompt)
+            models.append(kwargs["model"])
+            return json.dumps({"price": 19.99, "title": "Ignored"})
+
+        monkeypatch.setattr(llm_service, "complete", fake_complete)
+        monkeypatch.setattr("src.agents.extractor.settings.feature_deepseek_primary", False)
+
+        filler = "".join(f"<p>Filler paragraph {i}</p>" for i in range(300))
+        html = (
+            f"<html><body><h1>Widget</h1>{filler}"
+            f'<div class="buy"><span class="price">$19.99</span></div></body></html>'
+        )
+        data = {"title": "Widget", "price": "abc", "sku": None}
+
+        result = await agent.reextract_fields(
+            html, schema, data, ["price"], issues={"price": "Expected type float"}
+        )
+
+        assert result == {"title": "Widget", "price": 19.99, "sku": None}
+        assert len(prompts) == 1
+        assert models == [LLMProvider.GPT4]
+        assert "$19.99" in prompts[0]
+        assert "Filler paragraph 150" not in prompts[0]
+
+    async def test_strict_extraction_skips_default_prompt(self, agent, schema, monkeypatch):
+        """Test a strict retry goes straight to the strict prompt"""
+        monkeypatch.setattr("src.agents.extractor.settings.extraction_cache_enabled", False)
+        used = []
+
+        async def fake_default(html, schema):
+            used.append("default")
+            return {"title": "Widget", "price": 19.99, "sku": None}
+
+        async def fake_strict(html, schema):
+            used.append("strict")
+            return {"title": "Widget", "price": 19.99, "sku": "W-1"}
+
+        monkeypatch.setattr(agent, "_extract_with_llm", fake_default)
+        monkeypatch.setattr(agent, "_extract_with_llm_strict", fake_strict)
+
+        await agent.extract_result("<h1>Widget</h1>", schema, scored=False)
+        result = await agent.extract_result("<h1>Widget</h1>", schema, scored=False, strict=True)
+
+        assert used == ["default", "strict"]
+        assert result.data["sku"] == "W-1"
+
+    async def test_stream_fields_stops_generation(self, agent, schema, monkeypatch):
+        """Test streaming extraction yields fields early and stops once all are parsed"""
+        produced = []
+        closed = []
+
+        async def fake_stream(prompt, **kwargs):
+            pieces = [
+                '```json\n{"title": "Wid', 'get, \\"XL\\"", "pri', 'ce": 9.99,', ' "sku": "A1",',
+                ' "notes": "' + "x" * 50, '"}'
+            ]
+            try:
+                for piece in pieces:
+                    produced.append(piece)
+                    yield piece
+            finally:
+                closed.append(True)
+
+        monkeypatch.setattr(llm_service, "complete_stream", fake_stream)
+        monkeypatch.setattr("src.agents.extractor.settings.extraction_streaming", True)
+
+        fields = [item async for item in agent.stream_fields("<p>Widget</p>", schema)]
+
+        assert fields == [("title", 'Widget, "XL"'), ("price", 9.99), ("sku", "A1")]
+        assert len(produced) == 4
+        assert closed == [True]
+
+        data = await agent._extract_with_llm("<p>Widget</p>", schema)
+        assert data == {"title": 'Widget, "XL"', "price": 9.99, "sku": "A1"}
+
+    async def test_scored_extraction_replaces_llm_validation(self, agent, schema, monkeypatch):
+        """Test scored extraction is validated from its own evidence in one LLM call"""
+        from src.agents.validator import validator_agent
+
+        calls = []
+
+        async def fake_complete(prompt, **kwargs):
+            calls.append(kwargs.get("system_message") or "")
+            return json.dumps({
+                "title": {"value": "Widget XL", "confidence": 0.9, "evidence": "Widget  XL"},
+                "price": {"value": 9.99, "confidence": 0.95, "evidence": "Only $9.99 today"},
+                "sku": {"value": "A1", "confidence": 0.8, "evidence": "SKU: Z9"},
+            })
+
+        monkeypatch.setattr(llm_service, "complete", fake_complete)
+        monkeypatch.setattr("src.agents.extractor.settings.extraction_cache_enabled", False)
+
+        html = "<html><body><h1>Widget XL</h1><p>Only $9.99 today</p><p>SKU: A1</p></body></html>"
+        extraction = await agent.extract_result(html, schema, scored=True)
+
+        assert extraction.scored
+        assert extraction.data == {"title": "Widget XL", "price": 9.99, "sku": "A1"}
+
+        result = await validator_agent.validate(
+            extraction.data, schema, html=html, extraction=extraction
+        )
+
+        assert len(calls) == 1
+        assert "confidence" in calls[0]
+        assert [error.field for error in result.errors] == ["sku"]
+        assert result.confidence_scores["title"] == 0.9
+        assert result.confidence_scores["sku"] == 0.3
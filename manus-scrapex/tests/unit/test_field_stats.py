@@ -0,0 +1,65 @@
+"""
+Unit tests for per-domain field statistics
+"""
+import random
+import pytest
+from src.services.field_stats import FieldStatsStore, P2Quantile
+
+
+class TestFieldStats:
+    """Test streaming statistics and outlier flags"""
+
+    @pytest.fixture
+    def store(self):
+        """Store warmed with typical product records for one domain"""
+        store = FieldStatsStore()
+        rng = random.Random(7)
+        for i in range(200):
+            store.update("shop.example", {
+                "title": f"Widget model {i} " + "x" * rng.randint(0, 20),
+                "price": round(rng.uniform(20, 80), 2),
+                "availability": rng.choice(["In stock", "Out of stock"]),
+                "sku": f"W-{i}",
+            })
+        return store
+
+    def test_p2_quantile(self):
+        """Test the P² estimate tracks the true quantile"""
+        rng = random.Random(1)
+        values = [rng.gauss(100, 15) for _ in range(5000)]
+        estimate = P2Quantile(0.75)
+        for value in values:
+            estimate.add(value)
+
+        exact = sorted(values)[int(0.75 * len(values))]
+        assert estimate.value == pytest.approx(exact, rel=0.02)
+
+    def test_typical_record(self, store):
+        """Test an ordinary record has no anomalies"""
+        result = store.check("shop.example", {
+            "title": "Widget model 999 xxxx",
+            "price": 35.0,
+            "availability": "In Stock",
+            "sku": "W-999",
+        })
+
+        assert result == {"title": None, "price": None, "availability": None, "sku": None}
+
+    def test_outliers_flagged(self, store):
+        """Test numeric, categorical, length and null outliers"""
+        result = store.check("shop.example", {
+            "title": "W" * 400,
+            "price": 4999.0,
+            "availability": "Ships in 3 weeks",
+            "sku": None,
+        })
+
+        assert "unusual length" in result["title"]
+        assert "outside usual range" in result["price"]
+        assert "usual values" in result["availability"]
+        assert result["sku"] == "usually present, got null"
+        assert store.get_stats()["anomalies"] == 4
+
+    def test_unknown_domain_not_judged(self, store):
+        """Test fields without enough history are omitted"""
+        assert store.check("other.example", {"price": 1.0}) == {}
@@ -0,0 +1,39 @@
+"""
+Unit tests for incremental JSON parsing
+"""
+from src.utils.json_stream import IncrementalJSONParser, parse_json_object
+
+
+class TestIncrementalJSONParser:
+    """Test streamed JSON object parsing"""
+
+    def test_members_emitted_as_completed(self):
+        """Test each member is emitted once the following delimiter arrives"""
+        parser = IncrementalJSONParser()
+
+        assert parser.feed('{"title": "Wid') == {}
+        assert parser.feed('get", "tags": ["a", ') == {"title": "Widget"}
+        assert parser.feed('"b"], "specs": {"w": 1, "h": 2}') == {"tags": ["a", "b"]}
+        assert parser.feed('}') == {"specs": {"w": 1, "h": 2}}
+        assert parser.done
+
+    def test_delimiters_inside_strings(self):
+        """Test braces, commas and escaped quotes in strings don't split members"""
+        parser = IncrementalJSONParser()
+        text = '{"a": "x, {y} \\"z\\"", "b": null}'
+
+        for char in text:
+            parser.feed(char)
+
+        assert parser.fields == {"a": 'x, {y} "z"', "b": None}
+
+    def test_parse_json_object_not_greedy(self):
+        """Test surrounding text and later objects are ignored"""
+        text = 'Here you go:\n```json\n{"price": 9.99}\n```\nOr maybe {"price": 1}'
+        assert parse_json_object(text) == {"price": 9.99}
+
+    def test_truncated_and_malformed_members(self):
+        """Test good members survive truncation and malformed neighbours"""
+        assert parse_json_object('{"a": 1, "b": oops, "c": "ok", "d": [1, 2') == {"a": 1, "c": "ok"}
+        assert parse_json_object('{"a": 1, "b": 2') == {"a": 1, "b": 2}
+        assert parse_json_object("no json here") == {}
@@ -0,0 +1,117 @@
+"""
+Unit tests for LLM routing, hedging and circuit breaking
+"""
+import asyncio
+import pytest
+from src.services.key_pool import APIKeyPool
+from src.services.llm_service import LLMService
+from src.models.base import LLMProvider
+from src.utils.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+
+
+class TestLLMRouter:
+    """Test hedged routing between providers"""
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        """LLM service with both providers configured and scripted latencies"""
+        service = LLMService()
+        service.key_pools["deepseek"] = APIKeyPool("deepseek", ["sk-test-deepseek"])
+        service.key_pools["openai"] = APIKeyPool("openai", ["sk-test-openai"])
+        service.delays = {LLMProvider.DEEPSEEK_V3: 0.0, LLMProvider.GPT4: 0.0}
+        service.started = []
+        service.cancelled = []
+
+        async def fake_complete(prompt, model, **kwargs):
+            service.started.append(model)
+            try:
+                await asyncio.sleep(service.delays[model])
+            except asyncio.CancelledError:
+                service.cancelled.append(model)
+                raise
+            return f'{{"model": "{model.value}"}}'
+
+        service.complete = fake_complete
+        monkeypatch.setattr("src.services.llm_router.settings.llm_hedge_default_delay", 0.05)
+        return service
+
+    async def test_fast_primary_not_hedged(self, service):
+        """Test the secondary is never called when the primary answers in time"""
+        result = await service.complete_with_fallback("prompt")
+
+        assert "deepseek" in result
+        assert service.started == [LLMProvider.DEEPSEEK_V3]
+        assert service.router.hedged == 0
+
+    async def test_slow_primary_hedged_and_cancelled(self, service):
+        """Test a slow primary is hedged and the loser cancelled"""
+        service.delays[LLMProvider.DEEPSEEK_V3] = 1.0
+
+        result = await service.complete_with_fallback("prompt")
+
+        assert "gpt" in result
+        assert service.started == [LLMProvider.DEEPSEEK_V3, LLMProvider.GPT4]
+        await asyncio.sleep(0)
+        assert service.cancelled == [LLMProvider.DEEPSEEK_V3]
+        assert service.router.hedge_wins == 1
+
+    async def test_invalid_json_triggers_hedge(self, service):
+        """Test an invalid primary response is not accepted in JSON mode"""
+        async def fake_complete(prompt, model, **kwargs):
+            return "not json" if model == LLMProvider.DEEPSEEK_V3 else '{"ok": true}'
+
+        service.complete = fake_complete
+
+        result = await service.complete_with_fallback(
+            "prompt", response_format={"type": "json_object"}
+        )
+        assert result == '{"ok": true}'
+
+    async def test_open_circuit_skips_provider(self, service):
+        """Test sustained failures open the primary's circuit"""
+        for _ in range(5):
+            service.router.record(LLMProvider.DEEPSEEK_V3, 1.0, success=False)
+
+        result = await service.complete_with_fallback("prompt")
+
+        assert "gpt" in result
+        assert service.started == [LLMProvider.GPT4]
+
+        for _ in range(5):
+            service.router.record(LLMProvider.GPT4, 1.0, success=False)
+        with pytest.raises(CircuitOpenError):
+            await service.complete_with_fallback("prompt")
+
+    def test_hedge_delay_uses_p95(self, service):
+        """Test the hedge delay follows the primary's latency distribution"""
+        for i in range(100):
+            service.router.record(LLMProvider.DEEPSEEK_V3, 1.0 + i / 10, success=True)
+
+        assert service.router.hedge_delay(LLMProvider.DEEPSEEK_V3) == pytest.approx(10.5)
+
+    def test_circuit_breaker_half_open(self, monkeypatch):
+        """Test the breaker recovers through half-open"""
+        clock = [100.0]
+        monkeypatch.setattr("src.utils.circuit_breaker.time.monotonic", lambda: clock[0])
+
+        breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=10)
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+        assert not breaker.allow_request()
+
+        clock[0] += 10
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow_request()  # The probe
+        assert not breaker.allow_request()  # Concurrent callers wait for it
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+
+        clock[0] += 10
+        assert breaker.allow_request()
+        breaker.release()  # Probe never reached the provider
+        assert breaker.allow_request()
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.allow_request() and breaker.allow_request()
@@ -0,0 +1,279 @@
+"""
+Unit tests for LLM Service
+"""
+from types import SimpleNamespace
+import pytest
+from src.services.key_pool import APIKeyPool
+from src.services.llm_service import LLMService
+from src.models.base import LLMProvider
+
+
+def make_response(content: str, tokens: int = 100):
+    """Build an OpenAI-style completion response"""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(total_tokens=tokens)
+    )
+
+
+class TestLLMService:
+    """Test LLM Service functionality"""
+
+    @pytest.fixture
+    def service(self):
+        """LLM service with a fake DeepSeek client"""
+        service = LLMService()
+        service.calls = []
+
+        async def fake_call(**kwargs):
+            service.calls.append(kwargs)
+            return make_response(f"response {len(service.calls)}")
+
+        service.key_pools["deepseek"] = APIKeyPool("deepseek", ["sk-test-key-1"])
+        service._call_deepseek = fake_call
+        return service
+
+    async def test_identical_calls_hit_cache(self, service):
+        """Test byte-identical deterministic calls reach the provider once"""
+        first = await service.complete("extract this", temperature=0)
+        second = await service.complete("extract this", temperature=0)
+
+        assert first == second == "response 1"
+        assert len(service.calls) == 1
+
+        summary = service.metrics.get_summary()
+        assert summary["cache_hits"] == 1
+        assert summary["cache_misses"] == 1
+        assert summary["model_stats"][LLMProvider.DEEPSEEK_V3.value]["cache_hits"] == 1
+
+    async def test_cache_key_includes_params(self, service):
+        """Test different system message or params miss the cache"""
+        await service.complete("extract this")
+        await service.complete("extract this", system_message="be strict")
+        await service.complete("extract this", max_tokens=100)
+
+        assert len(service.calls) == 3
+
+    async def test_sampled_calls_not_cached(self, service):
+        """Test calls with temperature above the cache limit always call the provider"""
+        await service.complete("suggest tactics", temperature=0.7)
+        await service.complete("suggest tactics", temperature=0.7)
+
+        assert len(service.calls) == 2
+
+    async def test_cache_bypass(self, service):
+        """Test use_cache=False skips the cache"""
+        await service.complete("extract this")
+        await service.complete("extract this", use_cache=False)
+
+        assert len(service.calls) == 2
+
+    async def test_invalid_json_not_cached(self, service):
+        """Test JSON-mode responses that don't parse are not cached"""
+        json_mode = {"type": "json_object"}
+        await service.complete("extract this", response_format=json_mode)
+        await service.complete("extract this", response_format=json_mode)
+
+        assert len(service.calls) == 2
+
+    async def test_cache_refresh_replaces_entry(self, service):
+        """Test a retry after a rejected result asks again and caches the new answer"""
+        from src.utils.request_context import llm_cache_refresh
+
+        assert await service.complete("extract this") == "response 1"
+
+        token = llm_cache_refresh.set(True)
+        try:
+            assert await service.complete("extract this") == "response 2"
+        finally:
+            llm_cache_refresh.reset(token)
+
+        assert await service.complete("extract this") == "response 2"
+        assert len(service.calls) == 2
+
+    async def test_concurrent_identical_calls_coalesced(self, service):
+        """Test identical in-flight calls share one provider request"""
+        import asyncio
+
+        async def slow_call(**kwargs):
+            service.calls.append(kwargs)
+            await asyncio.sleep(0.01)
+            return make_response("shared")
+
+        service._call_deepseek = slow_call
+
+        results = await asyncio.gather(*[
+            service.complete("suggest tactics", temperature=0.5) for _ in range(3)
+        ])
+
+        assert results == ["shared"] * 3
+        assert len(service.calls) == 1
+        assert service.singleflight.get_stats()["coalesced"] == 2
+
+    async def test_calls_spread_across_keys(self, service):
+        """Test concurrent calls go to the least-loaded key"""
+        import asyncio
+
+        service.key_pools["deepseek"] = APIKeyPool(
+            "deepseek", ["sk-test-key-1", "sk-test-key-2"], max_concurrency=4
+        )
+
+        async def slow_call(client, **kwargs):
+            service.calls.append(client)
+            await asyncio.sleep(0.01)
+            return make_response("ok")
+
+        service._call_deepseek = slow_call
+
+        await asyncio.gather(*[
+            service.complete(f"prompt {i}", use_cache=False) for i in range(4)
+        ])
+
+        keys = service.key_pools["deepseek"].keys
+        assert service.calls.count(keys[0].client) == 2
+        assert service.calls.count(keys[1].client) == 2
+
+    def test_rate_limited_key_quarantined(self):
+        """Test 429 and 401 responses take keys out of rotation"""
+        pool = APIKeyPool("deepseek", ["sk-test-key-1", "sk-test-key-2", "sk-test-key-3"])
+        first, second, third = pool.keys
+
+        rate_limited = Exception("rate limited")
+        rate_limited.status_code = 429
+        rate_limited.response = SimpleNamespace(headers={"retry-after": "30"})
+        pool.report_failure(first, rate_limited)
+
+        unauthorized = Exception("bad key")
+        unauthorized.status_code = 401
+        pool.report_failure(second, unauthorized)
+
+        assert not first.available
+        assert 25 < first.get_stats()["quarantined_for"] <= 30
+        assert second.get_stats()["quarantined_for"] > 3000
+        assert pool.select() is third
+
+        # Every key out: the rate-limited key back soonest, never the rejected one
+        rate_limited.response = SimpleNamespace(headers={"retry-after": "10"})
+        pool.report_failure(third, rate_limited)
+        assert pool.select() is third
+
+        stats = pool.get_stats()
+        assert stats["available"] == 0
+        assert stats["per_key"]["deepseek#1"]["auth_failures"] == 1
+        assert "sk-test" not in str(stats)
+
+        rejected = APIKeyPool("deepseek", ["sk-test-key-1"])
+        rejected.report_failure(rejected.keys[0], unauthorized)
+        with pytest.raises(RuntimeError):
+            rejected.select()
+
+    async def test_single_key_waits_out_rate_limit(self, service, monkeypatch):
+        """Test a one-key pool retries after a 429 instead of failing while quarantined"""
+        # Quarantine outlasts the retry backoff, as the 60s default does
+        monkeypatch.setattr("src.services.key_pool.settings.llm_key_rate_limit_quarantine", 0.3)
+        monkeypatch.setattr("src.services.llm_service.settings.llm_retry_base_delay", 0.01)
+
+        async def rate_limited_once(**kwargs):
+            service.calls.append(kwargs)
+            if len(service.calls) == 1:
+                error = Exception("rate limited")
+                error.status_code = 429
+                raise error
+            return make_response("ok")
+
+        service._call_deepseek = rate_limited_once
+
+        assert await service.complete("extract this", use_cache=False) == "ok"
+        assert len(service.calls) == 2
+        assert service.key_pools["deepseek"].keys[0].rate_limited == 1
+
+    async def test_unconfigured_provider_not_retried(self, service):
+        """Test configuration errors fail immediately instead of backing off"""
+        import time
+
+        service.key_pools["openai"] = APIKeyPool("openai", [])
+
+        started = time.monotonic()
+        with pytest.raises(ValueError):
+            await service.complete("extract this", model=LLMProvider.GPT4)
+        assert time.monotonic() - started < 1
+
+    async def test_stream_stopped_early_closes_provider_stream(self, service):
+        """Test breaking out of a stream closes it, frees capacity and skips the cache"""
+        class FakeStream:
+            def __init__(self):
+                self.closed = False
+
+            async def __aiter__(self):
+                for piece in ['{"a": 1,', ' "b": 2,', ' "c": 3}']:
+                    yield SimpleNamespace(
+                        choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))],
+                        usage=None
+                    )
+
+            async def close(self):
+                self.closed = True
+
+        fake_stream = FakeStream()
+
+        async def fake_call(**kwargs):
+            assert kwargs["stream"] is True
+            return fake_stream
+
+        service._call_deepseek = fake_call
+
+        stream = service.complete_stream("extract this")
+        async for delta in stream:
+            break
+        await stream.aclose()
+
+        assert delta == '{"a": 1,'
+        assert fake_stream.closed
+        assert service.key_pools["deepseek"].keys[0].limiter.get_stats()["in_flight"] == 0
+        assert service.metrics.get_summary()["streams_stopped_early"] == 1
+        assert await service.response_cache.get(service._cache_key(
+            "extract this", LLMProvider.DEEPSEEK_V3, 0, 2000, None, None, {}
+        )) is None
+
+    async def test_stream_uses_circuit_breaker(self, service, monkeypatch):
+        """Test failed streams trip the model's breaker and open circuits refuse streams"""
+        from src.utils.circuit_breaker import CircuitOpenError
+
+        monkeypatch.setattr("src.services.llm_router.settings.llm_circuit_failure_threshold", 2)
+
+        async def failing_call(**kwargs):
+            raise ConnectionError("provider down")
+
+        service._call_deepseek = failing_call
+
+        for attempt in range(2):
+            with pytest.raises(ConnectionError):
+                async for _ in service.complete_stream(f"extract page {attempt}"):
+                    pass
+
+        with pytest.raises(CircuitOpenError):
+            async for _ in service.complete_stream("extract this"):
+                pass
+
+        stats = service.router.get_stats()["models"][LLMProvider.DEEPSEEK_V3.value]
+        assert stats["error_rate"] == 1.0
+        assert stats["circuit"]["state"] == "open"
+
+    async def test_cached_prompt_tokens_recorded(self, service):
+        """Test provider-reported prompt cache hits are tracked and priced lower"""
+        async def cached_call(**kwargs):
+            response = make_response("ok", tokens=1200)
+            response.usage.prompt_tokens = 1000
+            response.usage.prompt_cache_hit_tokens = 800
+            return response
+
+        service._call_deepseek = cached_call
+        await service.complete("extract this", system_message="static prefix")
+
+        summary = service.metrics.get_summary()
+        assert summary["prompt_tokens"] == 1000
+        assert summary["cached_prompt_tokens"] == 800
+        assert summary["prompt_cache_hit_rate"] == 0.8
+        assert summary["total_cost_usd"] < service.metrics._estimate_cost(
+            LLMProvider.DEEPSEEK_V3, 1200, prompt_tokens=1000
+        )
@@ -0,0 +1,61 @@
+"""
+Unit tests for prompt templates
+"""
+import pytest
+from src.models.scraping import FieldDefinition
+from src.prompts.registry import prompt_registry
+
+
+class TestPromptRegistry:
+    """Test stable-prefix prompt rendering"""
+
+    @pytest.fixture
+    def schema(self):
+        """Sample product schema"""
+        return {
+            "title": FieldDefinition(type="string", description="Product title", required=True),
+            "price": FieldDefinition(type="float", description="Product price"),
+        }
+
+    def test_prefix_identical_across_pages(self, schema):
+        """Test the system message does not depend on the page"""
+        first = prompt_registry.render("extraction", schema=schema, part_note="", html="<p>A</p>")
+        second = prompt_registry.render(
+            "extraction", schema=schema, part_note="Note: part 2 of 3.\n\n", html="<p>B</p>"
+        )
+
+        assert first.system == second.system
+        assert "`title`: Product title (type: string) **[REQUIRED]**" in first.system
+        assert "<p>" not in first.system
+        assert first.user != second.user
+
+    def test_page_content_last(self, schema):
+        """Test variable content ends the user message with the page"""
+        prompt = prompt_registry.render(
+            "reextraction", schema=schema, previous="- `price`: null", html="<p>$9.99</p>"
+        )
+
+        assert prompt.user.index("- `price`: null") < prompt.user.index("<p>$9.99</p>")
+        assert prompt.user.rstrip().endswith("<p>$9.99</p>\n```")
+
+    def test_prefix_changes_with_schema_and_options(self, schema):
+        """Test different schemas or static options get different prefixes"""
+        other = dict(schema, sku=FieldDefinition(type="string", description="SKU"))
+
+        base = prompt_registry.render("extraction", schema=schema, part_note="", html="")
+        extended = prompt_registry.render("extraction", schema=other, part_note="", html="")
+        assert base.system != extended.system
+
+        page = prompt_registry.render(
+            "selector_generation", schema=schema, options={"scope_note": ""}, html=""
+        )
+        item = prompt_registry.render(
+            "selector_generation", schema=schema, options={"scope_note": "\n- relative"}, html=""
+        )
+        assert page.system != item.system
+        assert '"title": "Product title"' in page.system
+
+    def test_unknown_template(self):
+        """Test unknown template names are rejected"""
+        with pytest.raises(KeyError):
+            prompt_registry.render("missing")
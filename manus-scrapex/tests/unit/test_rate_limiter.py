@@ -0,0 +1,70 @@
+"""
+Unit tests for the LLM rate limiter
+"""
+import asyncio
+import src.services.rate_limiter as rate_limiter_module
+from src.services.rate_limiter import RateLimiter
+
+
+class TestRateLimiter:
+    """Test admission control"""
+
+    async def test_priority_order(self):
+        """Test higher priority waiters are admitted first"""
+        limiter = RateLimiter("test", max_concurrency=1)
+        first = await limiter.acquire(10)
+        order = []
+
+        async def call(name, priority):
+            reservation = await limiter.acquire(10, priority)
+            order.append(name)
+            limiter.release(reservation)
+
+        low = asyncio.create_task(call("low", 1))
+        high = asyncio.create_task(call("high", 9))
+        await asyncio.sleep(0)
+        assert limiter.get_stats()["queued"] == 2
+
+        limiter.release(first)
+        await asyncio.gather(low, high)
+
+        assert order == ["high", "low"]
+
+    async def test_rpm_window(self, monkeypatch):
+        """Test requests beyond the RPM limit wait for the window to slide"""
+        monkeypatch.setattr(rate_limiter_module, "WINDOW_SECONDS", 0.05)
+        limiter = RateLimiter("test", rpm=2)
+
+        for _ in range(2):
+            limiter.release(await limiter.acquire(1))
+
+        start = asyncio.get_running_loop().time()
+        limiter.release(await limiter.acquire(1))
+        waited = asyncio.get_running_loop().time() - start
+
+        assert waited >= 0.03
+        assert limiter.get_stats()["max_wait"] >= 0.03
+
+    async def test_tpm_reconciled_with_actual_usage(self):
+        """Test actual token usage replaces the estimate"""
+        limiter = RateLimiter("test", tpm=1000)
+        reservation = await limiter.acquire(900)
+        limiter.release(reservation, actual_tokens=100)
+
+        assert limiter.get_stats()["tokens_in_window"] == 100
+        # Fits only because the estimate was corrected
+        limiter.release(await asyncio.wait_for(limiter.acquire(800), 0.1))
+
+    async def test_cancelled_waiter_skipped(self):
+        """Test a cancelled waiter does not consume capacity"""
+        limiter = RateLimiter("test", max_concurrency=1)
+        held = await limiter.acquire(1)
+
+        waiter = asyncio.create_task(limiter.acquire(1))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+
+        limiter.release(held)
+        assert limiter.get_stats()["in_flight"] == 0
+        limiter.release(await asyncio.wait_for(limiter.acquire(1), 0.1))
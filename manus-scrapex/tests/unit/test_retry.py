@@ -0,0 +1,95 @@
+"""
+Unit tests for error-classified retries and request deadlines
+"""
+import asyncio
+import time
+import pytest
+from src.utils.request_context import (
+    request_deadline, remaining_time, time_budget, DeadlineExceeded
+)
+from src.utils.retry import is_retryable, retry_async
+
+
+class StatusError(Exception):
+    """Error carrying an HTTP status like provider SDK errors"""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class TestRetry:
+    """Test retry classification and deadline budgets"""
+
+    @pytest.fixture(autouse=True)
+    def reset_deadline(self):
+        """Each test starts without a deadline"""
+        token = request_deadline.set(None)
+        yield
+        request_deadline.reset(token)
+
+    def test_classification(self):
+        """Test only transient errors are retryable"""
+        assert is_retryable(StatusError(429))
+        assert is_retryable(StatusError(503))
+        assert is_retryable(asyncio.TimeoutError())
+        assert is_retryable(ConnectionResetError())
+
+        assert not is_retryable(ValueError("DeepSeek client not configured"))
+        assert not is_retryable(StatusError(400))
+        assert not is_retryable(StatusError(401))
+        assert not is_retryable(DeadlineExceeded())
+
+    async def test_retries_transient_errors(self):
+        """Test transient failures are retried until success"""
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise StatusError(503)
+            return "ok"
+
+        assert await retry_async(flaky, attempts=3, base_delay=0.001) == "ok"
+        assert len(attempts) == 3
+
+    async def test_non_retryable_fails_fast(self):
+        """Test configuration errors are raised on the first attempt"""
+        attempts = []
+
+        async def misconfigured():
+            attempts.append(1)
+            raise ValueError("OpenAI client not configured")
+
+        with pytest.raises(ValueError):
+            await retry_async(misconfigured, attempts=3, base_delay=0.001)
+        assert len(attempts) == 1
+
+    async def test_no_retry_without_budget(self):
+        """Test a retry is skipped when the backoff would overrun the deadline"""
+        request_deadline.set(time.monotonic() + 0.5)
+        attempts = []
+
+        async def rate_limited():
+            attempts.append(1)
+            raise StatusError(429)
+
+        started = time.monotonic()
+        with pytest.raises(StatusError):
+            await retry_async(rate_limited, attempts=3, base_delay=2.0)
+
+        assert len(attempts) == 1
+        assert time.monotonic() - started < 0.5
+
+    def test_time_budget_clamps_timeouts(self):
+        """Test operation timeouts shrink to the time left"""
+        assert time_budget(30) == 30
+        assert remaining_time() is None
+
+        request_deadline.set(time.monotonic() + 5)
+        assert 4 < time_budget(30) <= 5
+        assert time_budget(2) == 2
+
+        request_deadline.set(time.monotonic() - 1)
+        with pytest.raises(DeadlineExceeded):
+            time_budget(30, "fetch")
@@ -0,0 +1,104 @@
+"""
+Unit tests for the schema compiler
+"""
+import pytest
+from src.models.scraping import FieldDefinition
+from src.utils.schema_compiler import SchemaCompiler, parse_number
+
+
+class TestSchemaCompiler:
+    """Test compiled validation and coercion plans"""
+
+    @pytest.fixture
+    def compiler(self):
+        """Create a schema compiler instance"""
+        return SchemaCompiler()
+
+    @pytest.fixture
+    def schema(self):
+        """Sample product schema"""
+        return {
+            "title": FieldDefinition(type="string", description="Product title", required=True),
+            "price": FieldDefinition(type="float", description="Product price", required=True),
+            "reviews": FieldDefinition(type="int", description="Review count", range=[0, 1000]),
+            "sku": FieldDefinition(
+                type="string", description="Product SKU", pattern=r"^[A-Z]-\d+$"
+            ),
+            "in_stock": FieldDefinition(type="bool", description="Availability"),
+            "product_url": FieldDefinition(type="string", description="Product link")
+        }
+
+    def test_plans_are_cached(self, compiler, schema):
+        """Test a schema is compiled once and shared by identical schemas"""
+        plan = compiler.compile(schema)
+        assert compiler.compile(schema) is plan
+        assert compiler.compile(dict(schema)) is plan
+        assert compiler.get_stats()["compiled"] == 1
+
+        changed = {**schema, "sku": FieldDefinition(type="string", description="SKU")}
+        assert compiler.compile(changed) is not plan
+
+    def test_schema_changed_in_place_recompiled(self, compiler, schema):
+        """Test mutating a schema after compiling it doesn't reuse the stale plan"""
+        plan = compiler.compile(schema)
+
+        schema["price"] = FieldDefinition(type="string", description="Price label")
+        changed = compiler.compile(schema)
+        assert changed is not plan
+        assert changed.coerce_record({"price": "$19.99"})["price"] == "$19.99"
+
+        schema["sku"].required = True
+        assert compiler.compile(schema) is not changed
+
+    def test_coerce_by_declared_type(self, compiler, schema):
+        """Test values are converted to the field's type, not guessed"""
+        plan = compiler.compile(schema)
+
+        assert plan.coerce_record({
+            "title": " 123 ",
+            "price": "€1.299,50",
+            "reviews": "1,204 reviews",
+            "in_stock": "Yes",
+            "colour": "42",
+        }) == {
+            "title": "123",
+            "price": 1299.5,
+            "reviews": 1204,
+            "in_stock": True,
+            "colour": 42,
+        }
+        assert plan.coerce("price", "call for price") == "call for price"
+        assert plan.coerce("title", "") is None
+
+    def test_validate(self, compiler, schema):
+        """Test schema and business checks run from the compiled plan"""
+        plan = compiler.compile(schema)
+
+        errors, warnings = plan.validate({
+            "title": None,
+            "price": -5.0,
+            "reviews": 5000,
+            "sku": "abc",
+            "in_stock": "yes",
+            "product_url": "/p/1",
+        })
+
+        assert [(e.field, e.error_type) for e in errors] == [
+            ("title", "required_null"),
+            ("in_stock", "type_mismatch"),
+            ("price", "invalid_value"),
+        ]
+        assert warnings == [
+            "reviews: Value 5000 out of range [0.0, 1000.0]",
+            "sku: Value doesn't match pattern ^[A-Z]-\\d+$",
+            "product_url: URL doesn't start with http(s): /p/1",
+        ]
+
+    def test_parse_number(self):
+        """Test price parsing across separator conventions"""
+        assert parse_number("$1,299.50") == 1299.5
+        assert parse_number("1.299,50 €") == 1299.5
+        assert parse_number("9,99") == 9.99
+        assert parse_number("1 299") == 1299
+        assert parse_number("$19.99 2 for $30") == 19.99
+        assert parse_number("free") is None
@@ -0,0 +1,80 @@
+"""
+Unit tests for singleflight coalescing
+"""
+import asyncio
+import pytest
+from src.services.singleflight import SingleFlight
+from src.utils.urls import normalize_url
+
+
+class TestSingleFlight:
+    """Test singleflight coalescing"""
+
+    async def test_concurrent_calls_share_execution(self):
+        """Test identical concurrent calls run once"""
+        flight = SingleFlight("test")
+        runs = []
+
+        async def work():
+            runs.append(1)
+            await asyncio.sleep(0.01)
+            return "done"
+
+        results = await asyncio.gather(*[flight.do("key", work) for _ in range(5)])
+
+        assert results == ["done"] * 5
+        assert len(runs) == 1
+        assert flight.get_stats()["coalesced"] == 4
+        assert flight.get_stats()["in_flight"] == 0
+
+    async def test_sequential_calls_not_coalesced(self):
+        """Test completed calls are not reused"""
+        flight = SingleFlight("test")
+        runs = []
+
+        async def work():
+            runs.append(1)
+            return len(runs)
+
+        assert await flight.do("key", work) == 1
+        assert await flight.do("key", work) == 2
+
+    async def test_errors_propagate_to_all_callers(self):
+        """Test a failure is delivered to every waiting caller"""
+        flight = SingleFlight("test")
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            flight.do("key", work), flight.do("key", work), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+    async def test_cancelled_leader_does_not_cancel_followers(self):
+        """Test a cancelled caller leaves the shared call running for others"""
+        flight = SingleFlight("test")
+
+        async def work():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        leader = asyncio.create_task(flight.do("key", work))
+        follower = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+
+        assert await follower == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+
+def test_normalize_url():
+    """Test equivalent URLs normalise to the same key"""
+    assert normalize_url("HTTPS://Example.com:443/p?b=2&a=1#top") == \
+        normalize_url("https://example.com/p?a=1&b=2")
+    assert normalize_url("http://example.com") == "http://example.com/"
+    assert normalize_url("http://example.com:8080/x") == "http://example.com:8080/x"
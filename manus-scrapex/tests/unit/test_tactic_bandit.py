@@ -0,0 +1,79 @@
+"""
+Unit tests for bandit-based evasion tactic selection
+"""
+import random
+from collections import Counter
+import pytest
+from src.models.base import BlockType
+from src.services.tactic_bandit import TacticBandit
+
+
+class TestTacticBandit:
+    """Test Thompson sampling over evasion tactics"""
+
+    @pytest.fixture
+    def bandit(self):
+        """Bandit with in-memory persistence and a fixed seed"""
+        return TacticBandit(backend="memory", rng=random.Random(42))
+
+    async def first_choices(self, bandit, domain, tactics, rounds=200):
+        """Count which tactic is ranked first over many samples"""
+        counts = Counter()
+        for _ in range(rounds):
+            ranked = await bandit.rank(domain, tactics)
+            counts[ranked[0]["tactic"]] += 1
+        return counts
+
+    async def test_learns_working_tactic(self, bandit):
+        """Test a tactic that keeps working overtakes the suggested one"""
+        suggested = [{"tactic": "rotate_proxy", "wait_time": 0}]
+
+        for _ in range(10):
+            await bandit.record("shop.example", "rotate_proxy", success=False, latency=4.0)
+            await bandit.record("shop.example", "change_headers", success=True, latency=1.0)
+
+        counts = await self.first_choices(bandit, "shop.example", suggested)
+        assert counts.most_common(1)[0][0] == "change_headers"
+
+        # Other domains are unaffected
+        ranked = await bandit.rank("other.example", suggested)
+        names = {tactic["tactic"] for tactic in ranked}
+        assert names >= {"rotate_proxy", "change_headers", "wait"}
+
+    async def test_suggestions_lead_on_fresh_domain(self, bandit):
+        """Test suggested order is kept without observations and ruled-out tactics are dropped"""
+        suggested = [
+            {"tactic": "rotate_proxy", "wait_time": 0},
+            {"tactic": "wait", "wait_time": 30},
+        ]
+
+        for _ in range(50):
+            ranked = await bandit.rank("new.example", suggested, BlockType.IP_BLOCK)
+            names = [tactic["tactic"] for tactic in ranked]
+            assert names[:2] == ["rotate_proxy", "wait"]
+            assert "change_headers" not in names and "stealth_browser" not in names
+
+        # Other block types still explore the generic tactics
+        ranked = await bandit.rank("new.example", suggested, BlockType.CLOUDFLARE)
+        assert {"change_headers", "stealth_browser"} <= {tactic["tactic"] for tactic in ranked}
+
+    async def test_cost_breaks_ties(self, bandit):
+        """Test equally reliable tactics are ranked by expected cost"""
+        for _ in range(30):
+            await bandit.record("shop.example", "stealth_browser", success=True, latency=20.0)
+            await bandit.record("shop.example", "change_headers", success=True, latency=1.0)
+
+        counts = await self.first_choices(bandit, "shop.example", [])
+        assert counts["change_headers"] > 150
+
+    async def test_persisted_across_instances(self, bandit):
+        """Test statistics are reloaded from the backend"""
+        await bandit.record("shop.example", "change_headers", success=True, latency=1.5)
+
+        restarted = TacticBandit(backend="memory")
+        restarted._backend = bandit.backend
+        await restarted.rank("shop.example", [])
+
+        assert restarted.get_domain_stats("shop.example") == {
+            "change_headers": {"successes": 1, "failures": 0, "latency": 1.5}
+        }
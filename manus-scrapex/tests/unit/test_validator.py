@@ -0,0 +1,110 @@
+"""
+Unit tests for Validator Agent
+"""
+import json
+import pytest
+from src.agents.validator import ValidatorAgent
+from src.models.scraping import FieldDefinition
+from src.services.llm_service import llm_service
+
+
+class TestValidatorAgent:
+    """Test Validator Agent functionality"""
+
+    @pytest.fixture
+    def agent(self):
+        """Create validator agent instance"""
+        return ValidatorAgent()
+
+    @pytest.fixture
+    def schema(self):
+        """Sample product schema"""
+        return {
+            "title": FieldDefinition(type="string", description="Product title", required=True),
+            "price": FieldDefinition(type="float", description="Product price", required=True),
+            "sku": FieldDefinition(type="string", description="Product SKU")
+        }
+
+    @pytest.fixture
+    def llm_calls(self, monkeypatch):
+        """Record LLM validation prompts; the LLM rejects the sku"""
+        calls = []
+
+        async def fake_complete(prompt, **kwargs):
+            calls.append(prompt)
+            return json.dumps({
+                "fields": {"sku": {"confidence": 0.4, "appears_in_html": False, "issues": []}}
+            })
+
+        monkeypatch.setattr(llm_service, "complete", fake_complete)
+        monkeypatch.setattr("src.agents.validator.settings.feature_deepseek_primary", True)
+        return calls
+
+    async def test_conclusive_page_skips_llm(self, agent, schema, llm_calls):
+        """Test values found in the page text are accepted without the LLM"""
+        html = "<html><body><h1>Widget  XL</h1><span>$1,299.00</span><p>SKU: A-1</p></body></html>"
+        data = {"title": "Widget XL", "price": 1299.0, "sku": "A-1"}
+
+        result = await agent.validate(data, schema, html=html)
+
+        assert result.valid
+        assert llm_calls == []
+        assert result.confidence_scores == {"title": 0.9, "price": 0.9, "sku": 0.9}
+        assert agent.get_stats()["tier_hit_rates"]["evidence"] == 1.0
+
+    async def test_only_uncertain_fields_escalated(self, agent, schema, llm_calls):
+        """Test the LLM sees only fields that are not in the page text"""
+        html = "<html><body><h1>Widget</h1><span>19.99</span></body></html>"
+        data = {"title": "Widget", "price": 9.99, "sku": "B-2"}
+
+        result = await agent.validate(data, schema, html=html)
+
+        assert len(llm_calls) == 1
+        assert '"sku"' in llm_calls[0]
+        assert '"title"' not in llm_calls[0]
+        assert [error.field for error in result.errors] == ["sku"]
+        assert result.confidence_scores["sku"] == 0.4
+
+        stats = agent.get_stats()
+        assert stats["llm_pages"] == 1
+        assert stats["fields_evidence"] == 1
+        # "9.99" must not match inside "19.99", so price is escalated too
+        assert stats["fields_llm"] == 2
+
+    def test_number_matching(self, agent):
+        """Test numbers match common renderings but not inside other numbers"""
+        assert agent._value_in_text(1299.5, "now 1.299,50 eur")
+        assert agent._value_in_text(1299.5, "now $1,299.50")
+        assert agent._value_in_text(42, "42 reviews")
+        assert not agent._value_in_text(42, "420 reviews")
+        assert not agent._value_in_text(9.99, "19.99")
+        assert not agent._value_in_text(True, "true")
+
+    async def test_field_statistics_tier(self, agent, schema, llm_calls, monkeypatch):
+        """Test typical values skip the LLM on a known domain and outliers are escalated"""
+        from src.services.field_stats import FieldStatsStore
+
+        store = FieldStatsStore()
+        monkeypatch.setattr("src.agents.validator.field_stats", store)
+        for i in range(50):
+            store.update(
+                "shop.example", {"title": f"Widget {i}", "price": 20.0 + i % 10, "sku": f"C-{i}"}
+            )
+
+        html = "<html><body><h1>Widget 7</h1><span>Sale</span></body></html>"
+
+        result = await agent.validate(
+            {"title": "Widget 7", "price": 25.0, "sku": "C-77"},
+            schema, html=html, domain="shop.example"
+        )
+        assert llm_calls == []
+        assert result.confidence_scores == {"title": 0.9, "price": 0.8, "sku": 0.8}
+
+        result = await agent.validate(
+            {"title": "Widget 7", "price": 2500.0, "sku": "C-78"},
+            schema, html=html, domain="shop.example"
+        )
+        assert len(llm_calls) == 1
+        assert '"price"' in llm_calls[0]
+        assert any("outside usual range" in warning for warning in result.warnings)
+        assert agent.get_stats()["fields_statistics"] == 3
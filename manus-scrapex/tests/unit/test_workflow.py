@@ -0,0 +1,241 @@
+"""
+Unit tests for the scraping workflow state machine
+"""
+from collections import Counter
+from types import SimpleNamespace
+import pytest
+from src.models.base import BlockType, ScrapingEngine, TaskStatus
+from src.models.scraping import (
+    BlockAnalysis, EvasionResult, FieldDefinition, RetryStrategy, ScrapeRequest, ScrapeResult,
+    ScrapingStrategy, ValidationError, ValidationResult
+)
+from src.services.content_gate import GateVerdict
+from src.services.domain_breaker import DomainBreakers
+from src.utils.circuit_breaker import CircuitState
+from src.utils.request_context import DeadlineExceeded, llm_cache_refresh
+from src.workflows import scraping_workflow as workflow_module
+from src.workflows.scraping_workflow import ScrapingWorkflow
+
+PAGE = "<html><body><h1>Espresso Machine</h1><p>Price: $199.00</p></body></html>"
+EVADED = "<html><body><h1>Espresso Machine</h1><p>Price: $189.00</p></body></html>"
+
+VALID = ValidationResult(valid=True, overall_confidence=0.9)
+TYPE_ERROR = ValidationResult(
+    valid=False,
+    overall_confidence=0.7,
+    errors=[ValidationError(field="name", error_type="type_mismatch", message="Not a string")]
+)
+
+
+class FakePipeline:
+    """Agents, engines and content gate with scripted outcomes"""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.engines = []
+        self.blocked = False
+        self.evasions = []
+        self.gate = GateVerdict(True)
+        self.extract_error = None
+        self.validations = [VALID]
+        self.retry_strategy = None
+        self.failed_fields = {}
+        self.extractions = []
+
+    async def dispatch(self, request):
+        self.calls["dispatch"] += 1
+        return ScrapingStrategy(engine=ScrapingEngine.SCRAPY)
+
+    async def scrape(self, url, strategy):
+        self.calls["fetch"] += 1
+        self.engines.append(strategy.engine)
+        return ScrapeResult(url=url, status=TaskStatus.COMPLETED, html=PAGE, status_code=200)
+
+    async def analyze(self, html, status_code, headers, url, engine):
+        blocked = self.blocked and html == PAGE
+        return BlockAnalysis(
+            is_blocked=blocked,
+            block_type=BlockType.IP_BLOCK if blocked else BlockType.NONE,
+            confidence=0.9 if blocked else 0.0,
+            suggested_tactics=[{"tactic": "rotate_proxy"}] if blocked else []
+        )
+
+    async def evade_hedged(self, url, block_type, current_strategy, tactics):
+        self.calls["evade"] += 1
+        return self.evasions.pop(0)
+
+    def check(self, domain, html, schema, mode="single", status_code=None):
+        self.calls["gate"] += 1
+        return self.gate
+
+    async def extract_result(self, html, schema, scored=None, strict=False):
+        self.calls["extract"] += 1
+        # Prompt used and whether the LLM cache was bypassed
+        self.extractions.append((strict, llm_cache_refresh.get()))
+        if self.extract_error is not None:
+            raise self.extract_error
+        return SimpleNamespace(data={"name": "Espresso Machine"})
+
+    async def reextract_fields(self, html, schema, data, fields, issues=None):
+        self.calls["reextract"] += 1
+        return data
+
+    async def validate(self, data, schema, html=None, extraction=None, domain=None):
+        self.calls["validate"] += 1
+        return self.validations.pop(0) if len(self.validations) > 1 else self.validations[0]
+
+    async def suggest_retry_strategy(self, validation_result, current_strategy, domain=None):
+        return self.retry_strategy
+
+    def get_failed_fields(self, validation_result, schema):
+        return self.failed_fields
+
+    async def noop(self, *args, **kwargs):
+        return None
+
+
+class TestScrapingWorkflow:
+    """Test retries resume from the right stage and the domain breaker is kept consistent"""
+
+    @pytest.fixture
+    def pipeline(self, monkeypatch):
+        """Workflow module wired to a FakePipeline"""
+        fake = FakePipeline()
+        monkeypatch.setattr(
+            workflow_module, "dispatcher_agent", SimpleNamespace(dispatch=fake.dispatch)
+        )
+        engine = SimpleNamespace(scrape=fake.scrape)
+        monkeypatch.setattr(workflow_module, "scrapy_engine", engine)
+        monkeypatch.setattr(workflow_module, "playwright_engine", engine)
+        monkeypatch.setattr(workflow_module, "antibot_agent", SimpleNamespace(
+            analyze=fake.analyze, evade_hedged=fake.evade_hedged
+        ))
+        monkeypatch.setattr(workflow_module, "content_gate", SimpleNamespace(
+            check=fake.check, learn=lambda *args: None
+        ))
+        monkeypatch.setattr(workflow_module, "extractor_agent", SimpleNamespace(
+            extract_result=fake.extract_result,
+            reextract_fields=fake.reextract_fields,
+            invalidate_cache=fake.noop
+        ))
+        monkeypatch.setattr(workflow_module, "validator_agent", SimpleNamespace(
+            validate=fake.validate,
+            suggest_retry_strategy=fake.suggest_retry_strategy,
+            get_failed_fields=fake.get_failed_fields,
+            record_retry_outcome=lambda *args: None
+        ))
+        monkeypatch.setattr(workflow_module, "domain_breakers", DomainBreakers())
+        monkeypatch.setattr(workflow_module.settings, "domain_breaker_enabled", True)
+        monkeypatch.setattr(workflow_module.settings, "content_gate_enabled", True)
+        monkeypatch.setattr(workflow_module.settings, "evasion_hedging_enabled", True)
+        return fake
+
+    @pytest.fixture
+    def workflow(self, pipeline):
+        workflow = ScrapingWorkflow()
+        workflow.max_retries = 2
+        return workflow
+
+    @pytest.fixture
+    def request_(self):
+        return ScrapeRequest(
+            url="https://shop.example/item/1",
+            schema={"name": FieldDefinition(type="string", description="Product name")}
+        )
+
+    async def test_probe_released_when_attempt_raises(self, workflow, pipeline, request_):
+        """Test a half-open probe whose attempt raises doesn't keep the domain refused"""
+        breakers = workflow_module.domain_breakers
+        breaker = breakers.breaker("shop.example")
+        breaker._state = CircuitState.HALF_OPEN
+
+        # The probe's outcome is recorded after the anti-bot check; fail before it
+        async def crashing_scrape(url, strategy):
+            raise RuntimeError("engine crashed")
+
+        workflow_module.scrapy_engine.scrape = crashing_scrape
+        result = await workflow.execute(request_)
+
+        assert result.status == TaskStatus.FAILED
+        assert "engine crashed" in result.error
+        assert result.retry_count == 2
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breakers.acquire("shop.example") is None
+
+    async def test_re_extract_reuses_fetched_page(self, workflow, pipeline, request_):
+        """Test a re_extract retry runs the strict prompt on the page already fetched"""
+        pipeline.validations = [TYPE_ERROR, VALID]
+        pipeline.retry_strategy = RetryStrategy(action="re_extract", reason="Type errors")
+
+        result = await workflow.execute(request_)
+
+        assert result.status == TaskStatus.COMPLETED
+        assert result.retry_count == 1
+        assert pipeline.calls["dispatch"] == 1 and pipeline.calls["fetch"] == 1
+        assert pipeline.extractions == [(False, False), (True, True)]
+
+    async def test_failed_fields_reextracted_in_place(self, workflow, pipeline, request_):
+        """Test failed fields are re-extracted without re-running the pipeline"""
+        pipeline.validations = [TYPE_ERROR, VALID]
+        pipeline.retry_strategy = RetryStrategy(action="re_extract", reason="Type errors")
+        pipeline.failed_fields = {"name": "Not a string"}
+
+        result = await workflow.execute(request_)
+
+        assert result.status == TaskStatus.COMPLETED
+        assert pipeline.calls["reextract"] == 1
+        assert pipeline.calls["extract"] == 1
+        assert pipeline.calls["dispatch"] == 1 and pipeline.calls["fetch"] == 1
+
+    async def test_switch_engine_refetches_with_new_engine(self, workflow, pipeline, request_):
+        """Test switch_engine re-fetches with the new engine and keeps the strategy"""
+        pipeline.validations = [TYPE_ERROR, VALID]
+        pipeline.retry_strategy = RetryStrategy(
+            action="switch_engine",
+            reason="Missing required fields",
+            new_engine=ScrapingEngine.PLAYWRIGHT
+        )
+
+        result = await workflow.execute(request_)
+
+        assert result.status == TaskStatus.COMPLETED
+        assert pipeline.engines == [ScrapingEngine.SCRAPY, ScrapingEngine.PLAYWRIGHT]
+        assert pipeline.calls["dispatch"] == 1
+
+    async def test_content_gate_fail_not_retried(self, workflow, pipeline, request_):
+        """Test a page the content gate fails outright is not fetched again"""
+        pipeline.gate = GateVerdict(False, "soft 404: 'Page not found'", "fail")
+
+        result = await workflow.execute(request_)
+
+        assert result.status == TaskStatus.FAILED
+        assert "soft 404" in result.error
+        assert result.retry_count == 0
+        assert pipeline.calls["fetch"] == 1
+        assert pipeline.calls["extract"] == 0
+
+    async def test_failed_evasion_redispatches(self, workflow, pipeline, request_):
+        """Test a block that evasion could not get past is retried from dispatch"""
+        pipeline.blocked = True
+        pipeline.evasions = [
+            EvasionResult(success=False, message="Still blocked"),
+            EvasionResult(success=True, html=EVADED, message="New proxy")
+        ]
+
+        result = await workflow.execute(request_)
+
+        assert result.status == TaskStatus.COMPLETED
+        assert result.html == EVADED
+        assert result.retry_count == 1
+        assert pipeline.calls["dispatch"] == 2 and pipeline.calls["fetch"] == 2
+
+    async def test_deadline_exceeded_not_retried(self, workflow, pipeline, request_):
+        """Test running out of time fails the request instead of retrying"""
+        pipeline.extract_error = DeadlineExceeded("Request deadline exceeded before extraction")
+
+        result = await workflow.execute(request_)
+
+        assert result.status == TaskStatus.FAILED
+        assert "deadline" in result.error
+        assert result.retry_count == 0
+        assert pipeline.calls["extract"] == 1